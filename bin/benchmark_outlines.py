@@ -0,0 +1,97 @@
+"""Compare the render time of the skeleton outline methods.
+
+    blender -b -P bin/benchmark_outlines.py -- [robot.urdf] [--engine CYCLES]
+        [--resolution 640 480] [--repeat 3] [--output-dir outlines/]
+
+Renders the kinematic skeleton of the robot with every outline method of
+formamotus.utils.rendering_utils.OUTLINE_METHOD_ITEMS this Blender supports
+and prints the mean and fastest render time of each, and its overhead over
+rendering without outlines. The first render of every method is a warm-up and not counted.
+"""
+import argparse
+import os
+import sys
+import time
+
+import bpy
+
+# Ensure the addon is enabled
+addon_name = "formamotus"
+if addon_name not in bpy.context.preferences.addons:
+    bpy.ops.preferences.addon_enable(module=addon_name)
+
+from formamotus.utils.rendering_utils import line_art_supported  # NOQA
+from formamotus.utils.rendering_utils import OUTLINE_METHOD_ITEMS  # NOQA
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def parse_args(argv=None):
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(
+        prog="benchmark_outlines", description="Time the skeleton outline methods.")
+    parser.add_argument("urdf", nargs="?",
+                        help="URDF file of the robot (default: the sample robot)")
+    parser.add_argument("--engine", default="CYCLES",
+                        help="Render engine, such as CYCLES or BLENDER_WORKBENCH")
+    parser.add_argument("--samples", type=int, default=16, help="Cycles samples per pixel")
+    parser.add_argument("--resolution", type=int, nargs=2, default=(640, 480),
+                        metavar=("WIDTH", "HEIGHT"), help="Image size")
+    parser.add_argument("--repeat", type=positive_int, default=3,
+                        help="Timed renders per method")
+    parser.add_argument("--output-dir", help="Save the last render of every method here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scene = bpy.context.scene
+    if args.urdf:
+        scene.formamotus_urdf_filepath = os.path.abspath(args.urdf)
+    if 'FINISHED' not in bpy.ops.robot_viz.visualize_robot(clear_scene=True):
+        raise RuntimeError(f"Failed to load {args.urdf or 'the sample robot'}")
+    scene.formamotus_use_mesh = False
+    scene.formamotus_render_preset = 'NONE'
+    scene.render.engine = args.engine
+    scene.render.resolution_x, scene.render.resolution_y = args.resolution
+    scene.render.resolution_percentage = 100
+    scene.cycles.samples = args.samples
+    scene.cycles.use_denoising = False
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    times = {}
+    for method, label, _ in OUTLINE_METHOD_ITEMS:
+        if method == 'LINE_ART' and not line_art_supported():
+            print("Skipping Line Art outlines, they need Blender 4.2 or older")
+            continue
+        scene.formamotus_outline_method = method
+        output = 'FILE' if args.output_dir else 'PIXELS'
+        if args.output_dir:
+            scene.formamotus_render_filepath = os.path.join(
+                args.output_dir, f"{method.lower()}.png")
+        method_times = []
+        for i in range(args.repeat + 1):
+            start_time = time.perf_counter()
+            if 'FINISHED' not in bpy.ops.robot_viz.render_robot(output=output):
+                raise RuntimeError(f"Failed to render with {label} outlines")
+            if i > 0:
+                method_times.append(time.perf_counter() - start_time)
+        times[method] = method_times
+
+    baseline = sum(times['NONE']) / len(times['NONE'])
+    width, height = args.resolution
+    print(f"{args.engine} {width}x{height}, {args.repeat} renders per method")
+    print(f"{'method':<15}{'mean':>9}{'fastest':>9}{'overhead':>10}")
+    for method, method_times in times.items():
+        mean = sum(method_times) / len(method_times)
+        print(f"{method:<15}{mean:>8.2f}s{min(method_times):>8.2f}s{mean - baseline:>+9.2f}s")
+
+
+main()
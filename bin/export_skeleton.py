@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Draw the kinematic skeleton of a robot as SVG or PDF without Blender.
+
+    python bin/export_skeleton.py robot.urdf skeleton.svg
+    python bin/export_skeleton.py robot.urdf skeleton.pdf --joint shoulder=0.5
+    python bin/export_skeleton.py robot.urdf "frames/{index:05d}.svg" \\
+        --trajectory trajectory.csv --every 10
+
+The joint cylinders and connectors are those of a FormaMotus render with
+meshes off, framed like it from the right front, 45 degrees above,
+unless --camera-location is given. The output extension chooses the
+format. With --trajectory, the output path is formatted with the
+``index`` of every drawn sample.
+
+This script only needs Python, NumPy and scikit-robot; see
+formamotus/utils/skeleton_export.py.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from skrobot.model import RobotModel
+from skrobot.utils.urdf import no_mesh_load_mode
+
+# Run from a checkout without installing the package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from formamotus.utils.camera_utils import look_at_matrix
+from formamotus.utils.kinematics import KinematicTree
+from formamotus.utils.skeleton_export import SkeletonSketch
+from formamotus.utils.skeleton_export import write_skeleton
+from formamotus.utils.trajectory import load_trajectory
+from formamotus.utils.trajectory import trajectory_joint_values
+
+
+def parse_joint_values(tree, joints, pose_path):
+    """Return the joint values of the initial pose overridden by --pose and --joint."""
+    values = dict(zip(tree.joint_names, tree.current_joint_values()))
+    overrides = {}
+    if pose_path:
+        with open(pose_path, encoding="utf-8") as f:
+            overrides.update(json.load(f))
+    for joint in joints:
+        name, _, value = joint.partition("=")
+        overrides[name] = float(value)
+    unknown = sorted(set(overrides) - set(values))
+    if unknown:
+        raise ValueError(f"Unknown joints: {', '.join(unknown)}")
+    values.update(overrides)
+    return tree.resolve_joint_values([values[name] for name in tree.joint_names])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="export_skeleton", description="Draw a robot skeleton as SVG or PDF.")
+    parser.add_argument("urdf", help="URDF file of the robot")
+    parser.add_argument("output", help="SVG or PDF file; formatted with {index} for trajectories")
+    parser.add_argument("--joint", action="append", default=[], metavar="NAME=VALUE",
+                        help="Joint value in radians or meters, may be repeated")
+    parser.add_argument("--pose", help="JSON file of joint name to joint value")
+    parser.add_argument("--trajectory", help="CSV or NPZ trajectory to draw every sample of")
+    parser.add_argument("--every", type=int, default=1, help="Draw every this many samples")
+    parser.add_argument("--size", type=int, nargs=2, default=(640, 480),
+                        metavar=("WIDTH", "HEIGHT"), help="Image size in pixels")
+    parser.add_argument("--camera-location", type=float, nargs=3, metavar=("X", "Y", "Z"))
+    parser.add_argument("--camera-target", type=float, nargs=3, metavar=("X", "Y", "Z"),
+                        help="Point the camera looks at (default: the robot center)")
+    parser.add_argument("--lens", type=float, default=35.0, help="Focal length in millimeters")
+    parser.add_argument("--line-width", type=float, default=3.0, help="Outline width in pixels")
+    parser.add_argument("--cylinder-radius", type=float, default=30.0, help="In millimeters")
+    parser.add_argument("--cylinder-height", type=float, default=150.0, help="In millimeters")
+    parser.add_argument("--connector-radius", type=float, default=9.0, help="In millimeters")
+    parser.add_argument("--background", type=float, nargs=3, metavar=("R", "G", "B"),
+                        help="Linear background color (default: transparent)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    robot_model = RobotModel()
+    with no_mesh_load_mode():
+        robot_model.load_urdf_file(args.urdf)
+    robot_model.init_pose()
+    tree = KinematicTree(robot_model)
+    sketch = SkeletonSketch(
+        tree, args.cylinder_radius / 1000.0, args.cylinder_height / 1000.0,
+        args.connector_radius / 1000.0)
+
+    joint_values = parse_joint_values(tree, args.joint, args.pose)
+    if args.trajectory:
+        joint_names, _, positions = load_trajectory(args.trajectory)
+        joint_values, unknown = trajectory_joint_values(
+            tree, joint_names, positions[::args.every], joint_values)
+        if unknown:
+            print(f"Ignored unknown joints: {', '.join(unknown)}", file=sys.stderr)
+        joint_values = tree.resolve_joint_values(joint_values)
+        world_transforms = tree.batch_forward_kinematics(joint_values)
+        outputs = [args.output.format(index=i * args.every) for i in range(len(joint_values))]
+    else:
+        world_transforms = tree.forward_kinematics(joint_values)[None]
+        outputs = [args.output]
+
+    width, height = args.size
+    background = (*args.background, 1.0) if args.background else None
+    start_time = time.perf_counter()
+    for transforms, output in zip(world_transforms, outputs):
+        if args.camera_location:
+            center, _ = sketch.bounds(transforms)
+            target = args.camera_target if args.camera_target else center
+            camera_matrix = look_at_matrix(args.camera_location, target)
+        else:
+            camera_matrix = sketch.default_camera(transforms)
+        shapes = sketch.shapes(
+            transforms, camera_matrix, width, height, lens=args.lens, line_width=args.line_width)
+        if os.path.dirname(output):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+        write_skeleton(output, shapes, width, height, background)
+    elapsed = time.perf_counter() - start_time
+    each = 1000.0 * elapsed / len(outputs)
+    print(f"Wrote {len(outputs)} drawings in {elapsed:.2f}s ({each:.1f} ms each)")
+
+
+if __name__ == "__main__":
+    main()
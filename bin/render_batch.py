@@ -0,0 +1,19 @@
+"""Render the jobs of a manifest in one background Blender session.
+
+    blender -b -P bin/render_batch.py -- manifest.json [--report report.json]
+
+See formamotus/batch.py for the manifest format.
+"""
+import sys
+
+import bpy
+
+# Ensure the addon is enabled
+addon_name = "formamotus"
+if addon_name not in bpy.context.preferences.addons:
+    bpy.ops.preferences.addon_enable(module=addon_name)
+
+from formamotus.batch import main  # NOQA
+
+failed = main()
+sys.exit(1 if failed else 0)
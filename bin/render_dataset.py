@@ -0,0 +1,16 @@
+"""Render randomized samples of a robot with link masks and depth.
+
+    blender -b -P bin/render_dataset.py -- robot.urdf dataset/ [--samples 1000]
+
+See formamotus/dataset.py for the files it writes.
+"""
+import bpy
+
+# Ensure the addon is enabled
+addon_name = "formamotus"
+if addon_name not in bpy.context.preferences.addons:
+    bpy.ops.preferences.addon_enable(module=addon_name)
+
+from formamotus.dataset import main  # NOQA
+
+main()
@@ -0,0 +1,16 @@
+"""Serve FormaMotus renders over HTTP on localhost from a background Blender.
+
+    blender -b -P bin/render_server.py -- [--port 8765]
+
+See formamotus/server.py for the requests it answers.
+"""
+import bpy
+
+# Ensure the addon is enabled
+addon_name = "formamotus"
+if addon_name not in bpy.context.preferences.addons:
+    bpy.ops.preferences.addon_enable(module=addon_name)
+
+from formamotus.server import main  # NOQA
+
+main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Render a FormaMotus manifest with several background Blender processes.
+
+    python bin/render_shards.py manifest.json --workers 8 --report report.json
+
+The jobs of the manifest are split into contiguous shards, one per worker,
+so that consecutive jobs sharing a URDF stay in the same Blender session
+and the robot is loaded once per worker. Every worker runs
+bin/render_batch.py on its shard with a share of the CPU cores as render
+threads. Jobs that failed, or that a crashed worker never finished, are
+split again over new workers up to --retries times. The results of all
+workers are merged into one report.
+
+This script only needs Python; see formamotus/batch.py for the manifest
+format.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+RENDER_BATCH_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "render_batch.py")
+
+
+def manifest_job_count(manifest_path):
+    """Return the number of jobs in a JSON or YAML manifest."""
+    with open(manifest_path, encoding="utf-8") as f:
+        if os.path.splitext(manifest_path)[1].lower() in (".yaml", ".yml"):
+            import yaml
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+    if isinstance(manifest, dict):
+        manifest = manifest.get("jobs")
+    if not isinstance(manifest, list):
+        raise ValueError(f"{manifest_path} has no list of jobs")
+    return len(manifest)
+
+
+def split_shards(indices, n_shards):
+    """Split indices into at most n_shards contiguous shards of nearly equal size."""
+    n_shards = max(1, min(n_shards, len(indices)))
+    size, extra = divmod(len(indices), n_shards)
+    shards = []
+    begin = 0
+    for i in range(n_shards):
+        end = begin + size + (1 if i < extra else 0)
+        shards.append(indices[begin:end])
+        begin = end
+    return shards
+
+
+def format_indices(indices):
+    """Write sorted job indices compactly, like ``"0-3,7,9-10"``."""
+    parts = []
+    begin = previous = None
+    for index in indices:
+        if previous is not None and index == previous + 1:
+            previous = index
+            continue
+        if begin is not None:
+            parts.append(str(begin) if begin == previous else f"{begin}-{previous}")
+        begin = previous = index
+    if begin is not None:
+        parts.append(str(begin) if begin == previous else f"{begin}-{previous}")
+    return ",".join(parts)
+
+
+def read_results(results_path):
+    """Return the job results a worker wrote, keyed by manifest index."""
+    results = {}
+    if not os.path.exists(results_path):
+        return results
+    with open(results_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                # The last line of a worker killed while writing it.
+                continue
+            results[result["index"]] = result
+    return results
+
+
+def run_workers(args, shards, attempt, work_dir, threads):
+    """Render every shard in its own Blender process and wait for all of them.
+
+    Returns
+    -------
+    runs : list of dict
+        Exit code, wall time and log file of every worker.
+    results : dict
+        Results of the finished jobs keyed by manifest index.
+    """
+    processes = []
+    for worker, shard in enumerate(shards):
+        name = f"attempt{attempt}_worker{worker}"
+        results_path = os.path.join(work_dir, f"{name}.jsonl")
+        log_path = os.path.join(work_dir, f"{name}.log")
+        # Results of an earlier run in the same work directory are not ours.
+        if os.path.exists(results_path):
+            os.remove(results_path)
+        command = [
+            args.blender, "--background", "--python", RENDER_BATCH_SCRIPT, "--",
+            os.path.abspath(args.manifest), "--indices", format_indices(shard),
+            "--results", results_path, "--threads", str(threads),
+            "--writers", str(args.writers),
+        ]
+        if args.preset:
+            command.extend(["--preset", args.preset])
+        if args.outline:
+            command.extend(["--outline", args.outline])
+        log_file = open(log_path, "w", encoding="utf-8")
+        process = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT)
+        processes.append((worker, shard, process, log_file, log_path, results_path, time.time()))
+
+    runs = []
+    results = {}
+    for worker, shard, process, log_file, log_path, results_path, start_time in processes:
+        returncode = process.wait()
+        log_file.close()
+        worker_results = read_results(results_path)
+        for result in worker_results.values():
+            result["attempt"] = attempt
+            result["worker"] = worker
+        results.update(worker_results)
+        runs.append({
+            "attempt": attempt, "worker": worker, "indices": format_indices(shard),
+            "returncode": returncode, "wall_time": time.time() - start_time,
+            "finished_jobs": len(worker_results), "log": log_path,
+        })
+        finished = f"{len(worker_results)}/{len(shard)} jobs finished"
+        print(f"attempt {attempt} worker {worker}: exit code {returncode}, {finished}")
+    return runs, results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render a FormaMotus manifest with several background Blender processes.")
+    parser.add_argument("manifest", help="JSON or YAML manifest of render jobs")
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of Blender processes (default: number of CPU cores)")
+    parser.add_argument("--threads", type=int, default=0,
+                        help="Render threads per worker (default: CPU cores / workers)")
+    parser.add_argument("--preset", choices=["NONE", "DRAFT", "PREVIEW", "FINAL"],
+                        help="Render preset of the jobs that do not choose one")
+    parser.add_argument("--outline", choices=["FREESTYLE", "LINE_ART", "INVERTED_HULL", "NONE"],
+                        help="Skeleton outline method of the jobs that do not choose one")
+    parser.add_argument("--writers", type=int, default=0,
+                        help="Image writer threads per worker, see render_batch.py")
+    parser.add_argument("--retries", type=int, default=1,
+                        help="How many times failed jobs are rendered again")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"),
+                        help="Blender executable (default: $BLENDER or blender)")
+    parser.add_argument("--work-dir", help="Directory of the worker logs and results")
+    parser.add_argument("--report", help="Write the merged results and timings to this JSON file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    start_time = time.time()
+    n_jobs = manifest_job_count(args.manifest)
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="formamotus_shards_")
+    os.makedirs(work_dir, exist_ok=True)
+    threads = args.threads or max(1, (os.cpu_count() or 1) // max(1, args.workers))
+
+    runs = []
+    results = {}
+    pending = list(range(n_jobs))
+    for attempt in range(args.retries + 1):
+        if not pending:
+            break
+        shards = split_shards(pending, args.workers)
+        attempt_runs, attempt_results = run_workers(args, shards, attempt, work_dir, threads)
+        runs.extend(attempt_runs)
+        results.update(attempt_results)
+        pending = [i for i in pending
+                   if i not in results or results[i]["status"] != "ok"]
+
+    for index in pending:
+        results.setdefault(index, {
+            "index": index, "status": "failed",
+            "error": "The worker exited before finishing the job"})
+    jobs = [results[i] for i in range(n_jobs)]
+    failed = len(pending)
+    wall_time = time.time() - start_time
+    busy_time = sum(run["wall_time"] for run in runs)
+    timing = f"in {wall_time:.2f}s ({busy_time:.2f}s of worker time)"
+    print(f"Rendered {n_jobs - failed}/{n_jobs} jobs with {args.workers} workers {timing}")
+    if args.report:
+        report = {
+            "manifest": os.path.abspath(args.manifest), "workers": args.workers,
+            "threads": threads, "wall_time": wall_time, "worker_time": busy_time,
+            "failed": failed, "runs": runs, "jobs": jobs,
+        }
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
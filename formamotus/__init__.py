@@ -29,6 +29,8 @@ try:
             box = layout.box()
             box.label(text="Visualization Options")
             box.prop(scene, "formamotus_use_mesh", text="Use Mesh Visualization")
+            box.prop(scene, "formamotus_rig_mode")
+            box.prop(scene, "formamotus_fast_drag")
             box.label(text="Cylinder Size (mm)")
             box.prop(scene, "formamotus_cylinder_radius", slider=True)
             box.prop(scene, "formamotus_cylinder_height", slider=True)
@@ -42,9 +44,36 @@ try:
             box.prop(scene, "formamotus_continuous_color")
             box.prop(scene, "formamotus_default_color")
 
+            # Mesh loading settings
+            box = layout.box()
+            box.label(text="Mesh Loading")
+            box.prop(scene, "formamotus_decode_workers")
+            box.prop(scene, "formamotus_use_mesh_cache")
+            box.prop(scene, "formamotus_mesh_cache_dir")
+            box.prop(scene, "formamotus_mesh_cache_size")
+            box.operator(robot_visualizer.RobotClearMeshCacheOperator.bl_idname, text="Clear Mesh Cache")
+
+            # Trajectory import
+            box = layout.box()
+            box.label(text="Trajectory")
+            box.prop(scene, "formamotus_trajectory_filepath")
+            box.prop(scene, "formamotus_trajectory_use_timestamps")
+            box.prop(scene, "formamotus_playback_frame_skip")
+            box.operator(robot_visualizer.RobotImportTrajectoryOperator.bl_idname,
+                         text="Import Trajectory")
+            if robot_visualizer.playback_active():
+                box.operator(robot_visualizer.RobotStopPlaybackOperator.bl_idname,
+                             text="Stop Playback")
+            else:
+                box.operator(robot_visualizer.RobotStartPlaybackOperator.bl_idname,
+                             text="Play Trajectory")
+
             # Operator buttons
             layout.operator(robot_visualizer.RobotVisualizerOperator.bl_idname, text="Visualize Robot")
+            layout.prop(scene, "formamotus_render_preset")
+            layout.prop(scene, "formamotus_outline_method")
             layout.operator(robot_visualizer.RobotRenderOperator.bl_idname, text="Render Image")
+            layout.operator(robot_visualizer.RobotRenderViewsOperator.bl_idname, text="Render Views")
 
             # Robot model info
             robot_model = robot_visualizer.get_robot_model()
@@ -0,0 +1,415 @@
+"""Render many URDFs and poses in one Blender session.
+
+Run from a background Blender with the add-on enabled::
+
+    blender -b -P bin/render_batch.py -- manifest.json --report report.json
+
+A manifest is a JSON or YAML file holding either a list of jobs or a dict
+with a ``jobs`` list and optional ``defaults`` merged into every job::
+
+    {
+      "defaults": {"urdf": "robot.urdf", "resolution": [640, 480]},
+      "jobs": [
+        {"output": "renders/home.png"},
+        {"output": "renders/reach.png", "pose": {"l_arm0_joint": 0.5}},
+        {"output": "renders/skeleton.png", "use_mesh": false}
+      ]
+    }
+
+A job has the keys
+
+- ``urdf``: path of the URDF file.
+- ``output``: path of the rendered image. A ``.npz`` path stores the
+  uint8 RGBA pixels as the ``pixels`` array and an ``.exr`` path the scene
+  linear float pixels; any other path is written as PNG.
+- ``pose``: joint name to joint angle in radians or joint position in
+  meters. Joints not listed keep the pose the robot is loaded in.
+- ``use_mesh``, ``rig_mode``: the FormaMotus scene options of the same name.
+- ``preset``: render preset, ``"DRAFT"``, ``"PREVIEW"``, ``"FINAL"`` or
+  ``"NONE"`` to keep the render settings of the scene.
+- ``outline``: outline method of the skeleton, ``"FREESTYLE"``,
+  ``"LINE_ART"``, ``"INVERTED_HULL"`` or ``"NONE"``.
+- ``resolution``: ``[width, height]`` of the image.
+- ``camera``: ``{"location": [x, y, z], "target": [x, y, z], "lens": 35}``
+  to render from instead of framing the robot automatically.
+- ``scene``: scene property paths, like ``"render.engine"`` or
+  ``"formamotus_cylinder_radius"``, to values.
+
+Relative paths are resolved against the directory of the manifest. The
+robot is only loaded again when a job changes the URDF or the rig mode of
+the job before it. Scene settings changed by a job stay in effect for the
+jobs after it, so settings shared by all jobs belong in ``defaults``.
+
+With ``--writers N`` the images are encoded and written on N threads while
+the next job renders, instead of by Blender on the main thread.
+"""
+
+import argparse
+import contextlib
+import copy
+import json
+import os
+import sys
+import time
+import traceback
+
+import bpy
+import numpy as np
+
+from formamotus import robot_visualizer
+from formamotus.utils.image_writer import AsyncImageWriter
+from formamotus.utils.image_writer import write_image
+from formamotus.utils.render_presets import RENDER_PRESET_ITEMS
+from formamotus.utils.rendering_utils import OUTLINE_METHOD_ITEMS
+
+PIXEL_OUTPUT_EXTENSIONS = (".npz", ".exr")
+
+
+def load_manifest(filepath):
+    """Return the jobs of a JSON or YAML manifest with defaults applied.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to a ``.json``, ``.yaml`` or ``.yml`` manifest.
+
+    Returns
+    -------
+    list of dict
+        Jobs with absolute ``urdf`` and ``output`` paths.
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    with open(filepath, encoding="utf-8") as f:
+        if extension in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("PyYAML is required to read YAML manifests")
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+
+    if isinstance(manifest, list):
+        manifest = {"jobs": manifest}
+    if not isinstance(manifest, dict) or not isinstance(manifest.get("jobs"), list):
+        raise ValueError(f"{filepath} has no list of jobs")
+    defaults = manifest.get("defaults", {})
+    base_dir = os.path.dirname(os.path.abspath(filepath))
+
+    jobs = []
+    for i, job in enumerate(manifest["jobs"]):
+        merged = copy.deepcopy(defaults)
+        merged.update(job)
+        for key in ("urdf", "output"):
+            if not merged.get(key):
+                raise ValueError(f"Job {i} of {filepath} has no '{key}'")
+            merged[key] = os.path.join(base_dir, os.path.expanduser(merged[key]))
+        jobs.append(merged)
+    return jobs
+
+
+def set_property_path(owner, path, value):
+    """Set a property given as a dotted path like ``render.engine`` below owner."""
+    *parents, name = path.split(".")
+    for parent in parents:
+        owner = getattr(owner, parent)
+    if not hasattr(owner, name):
+        raise AttributeError(f"Unknown property '{path}'")
+    setattr(owner, name, value)
+
+
+def pose_joint_values(pose, default_values):
+    """Return the joint value vector of the loaded robot for a job pose."""
+    tree = robot_visualizer.get_kinematic_tree()
+    joint_values = np.array(default_values, dtype=np.float64)
+    for joint_name, value in (pose or {}).items():
+        if joint_name not in tree.joint_position:
+            raise KeyError(f"Unknown joint '{joint_name}'")
+        joint_values[tree.joint_position[joint_name]] = value
+    return joint_values
+
+
+def parse_indices(text):
+    """Parse job indices written as ``"0-3,7,9-10"`` into a list of ints."""
+    indices = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        indices.extend(range(int(first), int(last or first) + 1))
+    return indices
+
+
+def camera_operator_args(camera):
+    """Return the render_robot operator arguments of a job camera."""
+    if not camera:
+        return {}
+    return {
+        "use_custom_camera": True,
+        "camera_location": camera["location"],
+        "camera_target": camera.get("target", (0.0, 0.0, 0.0)),
+        "camera_lens": camera.get("lens", 35.0),
+    }
+
+
+class RenderSession:
+    """Render jobs in the current Blender session, keeping the robot loaded.
+
+    The robot is only loaded again when a job asks for another URDF or rig
+    mode than the one before it.
+
+    Parameters
+    ----------
+    writer : formamotus.utils.image_writer.AsyncImageWriter, optional
+        Writes the images in the background; the results of such jobs are
+        only final once returned by :meth:`collect_writes`.
+    """
+
+    def __init__(self, writer=None):
+        self.writer = writer
+        self.loaded_key = None
+        self.initial_values = None
+        self.pixels = None
+        self.pending_writes = []
+
+    def load(self, job):
+        """Load the robot of job unless it is already loaded; return whether it was."""
+        scene = bpy.context.scene
+        if "rig_mode" in job:
+            scene.formamotus_rig_mode = job["rig_mode"]
+        key = (job["urdf"], scene.formamotus_rig_mode)
+        if key == self.loaded_key and robot_visualizer.pose_ready():
+            return True
+        self.loaded_key = None
+        scene.formamotus_urdf_filepath = job["urdf"]
+        if 'FINISHED' not in bpy.ops.robot_viz.visualize_robot(clear_scene=True):
+            raise RuntimeError(f"Failed to load {job['urdf']}")
+        self.loaded_key = key
+        self.initial_values = robot_visualizer.get_joint_values()
+        return False
+
+    def pose(self, job):
+        """Apply the scene settings and the pose of job."""
+        scene = bpy.context.scene
+        for path, value in job.get("scene", {}).items():
+            set_property_path(scene, path, value)
+        if "use_mesh" in job:
+            scene.formamotus_use_mesh = bool(job["use_mesh"])
+        if "preset" in job:
+            scene.formamotus_render_preset = job["preset"].upper()
+        if "outline" in job:
+            scene.formamotus_outline_method = job["outline"].upper()
+        if "resolution" in job:
+            scene.render.resolution_x, scene.render.resolution_y = job["resolution"]
+        robot_visualizer.apply_pose(pose_joint_values(job.get("pose"), self.initial_values))
+        bpy.context.view_layer.update()
+
+    def render_image(self, job):
+        """Render the image of a posed job to its output.
+
+        A job without ``output`` keeps the uint8 RGBA pixels in ``pixels``.
+        """
+        output = job.get("output")
+        extension = os.path.splitext(output)[1].lower() if output else None
+        camera_args = camera_operator_args(job.get("camera"))
+        if output:
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        if output and self.writer is None and extension not in PIXEL_OUTPUT_EXTENSIONS:
+            bpy.context.scene.formamotus_render_filepath = output
+            status = bpy.ops.robot_viz.render_robot(**camera_args)
+        else:
+            status = bpy.ops.robot_viz.render_robot(
+                output='PIXELS', linear_pixels=extension == ".exr", **camera_args)
+        if 'FINISHED' not in status:
+            raise RuntimeError(f"Failed to render {output or 'the job'}")
+        if output is None:
+            self.pixels = robot_visualizer.get_render_pixels()
+        elif self.writer is not None:
+            return self.writer.submit(output, robot_visualizer.get_render_pixels())
+        elif extension in PIXEL_OUTPUT_EXTENSIONS:
+            write_image(output, robot_visualizer.get_render_pixels())
+        return None
+
+    def render(self, job, index=0):
+        """Render one job and return its result; errors are reported in the result.
+
+        Returns
+        -------
+        dict
+            ``status`` (``"ok"`` or ``"failed"``), ``error``, whether the
+            loaded robot was reused, the seconds spent loading the robot,
+            posing it and rendering, and the render time its preset expected.
+        """
+        result = {
+            "index": index, "urdf": job["urdf"], "output": job.get("output"), "status": "ok",
+            "error": None, "reused_robot": False,
+            "load_time": 0.0, "pose_time": 0.0, "render_time": 0.0, "expected_render_time": None,
+        }
+        start_time = time.perf_counter()
+        try:
+            result["reused_robot"] = self.load(job)
+            result["load_time"] = time.perf_counter() - start_time
+
+            pose_start = time.perf_counter()
+            self.pose(job)
+            result["pose_time"] = time.perf_counter() - pose_start
+
+            render_start = time.perf_counter()
+            write = self.render_image(job)
+            result["render_time"] = time.perf_counter() - render_start
+            result["expected_render_time"] = robot_visualizer.get_render_timing()["expected"]
+            if write is not None:
+                self.pending_writes.append((result, write))
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+        result["total_time"] = time.perf_counter() - start_time
+        return result
+
+    def collect_writes(self, wait=False):
+        """Return the results whose images were written, in render order.
+
+        A failed write marks its result as failed. With wait, block until
+        all the images are written.
+        """
+        finished = []
+        while self.pending_writes:
+            result, write = self.pending_writes[0]
+            if not wait and not write.done():
+                break
+            self.pending_writes.pop(0)
+            try:
+                result["write_time"] = write.result()
+            except Exception as e:
+                result["status"] = "failed"
+                result["error"] = f"{type(e).__name__}: {e}"
+            finished.append(result)
+        return finished
+
+
+def render_jobs(jobs, indices=None, log=print, on_result=None, writer=None):
+    """Render jobs one after another in the current Blender session.
+
+    A failing job is reported and the remaining jobs still run.
+
+    Parameters
+    ----------
+    jobs : list of dict
+        Jobs as returned by :func:`load_manifest`.
+    indices : list of int, optional
+        Manifest index of every job, reported in the results. Defaults to
+        the position of the job in jobs.
+    log : callable
+        Called with one line of progress per job.
+    on_result : callable, optional
+        Called with the result of every job as soon as it is finished.
+    writer : formamotus.utils.image_writer.AsyncImageWriter, optional
+        Writes the images while the next jobs render.
+
+    Returns
+    -------
+    list of dict
+        One result per job, see :meth:`RenderSession.render`.
+    """
+    session = RenderSession(writer)
+    results = []
+    reported = 0
+
+    def report(result):
+        nonlocal reported
+        reported += 1
+        if on_result is not None:
+            on_result(result)
+        timings = " ".join(
+            f"{name} {result[name + '_time']:.2f}s" for name in ("load", "pose", "render"))
+        message = f"[{reported}/{len(jobs)}] {result['status']} {result['output']} {timings}"
+        if result["expected_render_time"] is not None:
+            message += f" (expected {result['expected_render_time']:.2f}s)"
+        if "write_time" in result:
+            message += f" write {result['write_time']:.2f}s"
+        if result["error"]:
+            message += f" ({result['error']})"
+        log(message)
+
+    if indices is None:
+        indices = range(len(jobs))
+    for index, job in zip(indices, jobs):
+        result = session.render(job, index)
+        results.append(result)
+        if not any(pending is result for pending, _ in session.pending_writes):
+            report(result)
+        for written in session.collect_writes():
+            report(written)
+    for written in session.collect_writes(wait=True):
+        report(written)
+    return results
+
+
+def parse_args(argv=None):
+    if argv is None:
+        # Blender passes the arguments after "--" on to the script.
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(
+        prog="render_batch", description="Render the jobs of a FormaMotus manifest.")
+    parser.add_argument("manifest", help="JSON or YAML manifest of render jobs")
+    parser.add_argument("--report", help="Write per job results and timings to this JSON file")
+    parser.add_argument(
+        "--indices", help="Only render these manifest jobs, like 0-99,120 (default: all)")
+    parser.add_argument(
+        "--results", help="Append the result of every job to this JSON Lines file when it finishes")
+    parser.add_argument(
+        "--threads", type=int, default=0, help="Render threads (default: all CPU cores)")
+    parser.add_argument(
+        "--preset", choices=[name for name, _, _ in RENDER_PRESET_ITEMS],
+        help="Render preset of the jobs that do not choose one (default: the scene settings)")
+    parser.add_argument(
+        "--outline", choices=[name for name, _, _ in OUTLINE_METHOD_ITEMS],
+        help="Skeleton outline method of the jobs that do not choose one (default: FREESTYLE)")
+    parser.add_argument(
+        "--writers", type=int, default=0,
+        help="Write the images on this many threads while the next job renders (default: 0)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Render a manifest and return the number of failed jobs."""
+    args = parse_args(argv)
+    start_time = time.perf_counter()
+    jobs = load_manifest(args.manifest)
+    indices = list(range(len(jobs)))
+    if args.indices:
+        indices = parse_indices(args.indices)
+        jobs = [jobs[i] for i in indices]
+    if args.preset:
+        bpy.context.scene.formamotus_render_preset = args.preset
+    if args.outline:
+        bpy.context.scene.formamotus_outline_method = args.outline
+    if args.threads > 0:
+        bpy.context.scene.render.threads_mode = 'FIXED'
+        bpy.context.scene.render.threads = args.threads
+
+    results_file = (open(args.results, "a", encoding="utf-8") if args.results
+                    else contextlib.nullcontext())
+    with results_file:
+        def write_result(result):
+            if args.results:
+                results_file.write(json.dumps(result) + "\n")
+                results_file.flush()
+
+        writer = AsyncImageWriter(args.writers) if args.writers > 0 else None
+        try:
+            results = render_jobs(jobs, indices, on_result=write_result, writer=writer)
+        finally:
+            if writer is not None:
+                writer.close()
+    failed = sum(result["status"] != "ok" for result in results)
+    elapsed = time.perf_counter() - start_time
+    print(f"Rendered {len(results) - failed}/{len(results)} jobs in {elapsed:.2f}s")
+    if args.report:
+        report = {"manifest": os.path.abspath(args.manifest), "total_time": elapsed,
+                  "failed": failed, "jobs": results}
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    return failed
@@ -0,0 +1,271 @@
+"""Render randomized training samples of a robot with segmentation and depth.
+
+Run from a background Blender with the add-on enabled::
+
+    blender -b -P bin/render_dataset.py -- robot.urdf dataset/ --samples 1000
+
+Every sample draws joint values uniformly within the ranges of the joint
+sliders and a camera on a sphere band around the robot, then renders once
+with Cycles and writes
+
+- ``rgb/000000.png``: the RGBA image.
+- ``segmentation/000000.png``: 16 bit link mask holding the pass index of
+  the link seen by each pixel, 0 for the background. ``dataset.json`` maps
+  link names to pass indices.
+- ``depth/000000.npz``: float32 ``pixels`` array of the distance along the
+  camera view axis in meters, 0 where nothing was hit.
+
+``annotations.jsonl`` gets one line per sample with the joint values and
+the camera: location, target, lens, the 3x3 ``intrinsics``, the Blender
+``camera_to_world`` matrix and the OpenCV ``world_to_camera`` matrix.
+``dataset.json`` also records the settings and the throughput.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import bpy
+import numpy as np
+
+from formamotus import robot_visualizer
+from formamotus.utils.camera_utils import camera_intrinsics
+from formamotus.utils.camera_utils import opencv_world_to_camera
+from formamotus.utils.camera_utils import sample_view_locations
+from formamotus.utils.image_writer import AsyncImageWriter
+from formamotus.utils.render_presets import render_preset_engine
+from formamotus.utils.rendering_utils import disable_pass_outputs
+from formamotus.utils.rendering_utils import enable_pass_outputs
+from formamotus.utils.rendering_utils import fast_temp_dir
+from formamotus.utils.rendering_utils import load_image_pixels
+from formamotus.utils.rendering_utils import pass_output_filepath
+
+DATASET_PASSES = ("Depth", "IndexOB")
+
+
+def scene_camera_annotation(scene, location, target):
+    """Return the camera annotation of the last render of scene."""
+    camera = scene.camera
+    scale = scene.render.resolution_percentage / 100.0
+    width = int(scene.render.resolution_x * scale)
+    height = int(scene.render.resolution_y * scale)
+    intrinsics = camera_intrinsics(
+        camera.data.lens, camera.data.sensor_width, width, height,
+        camera.data.sensor_height, camera.data.sensor_fit)
+    matrix_world = np.array(camera.matrix_world, dtype=np.float64)
+    return {
+        "location": [float(v) for v in location],
+        "target": [float(v) for v in target],
+        "lens": camera.data.lens,
+        "resolution": [width, height],
+        "intrinsics": intrinsics.tolist(),
+        "camera_to_world": matrix_world.tolist(),
+        "world_to_camera": opencv_world_to_camera(matrix_world).tolist(),
+    }
+
+
+def read_dataset_passes(scene):
+    """Return the link mask and depth of the last render of scene.
+
+    Returns
+    -------
+    segmentation : numpy.ndarray
+        (height, width) uint16 pass indices.
+    depth : numpy.ndarray
+        (height, width) float32 depth, 0 where nothing was hit.
+    """
+    passes = {}
+    for pass_name in DATASET_PASSES:
+        filepath = pass_output_filepath(scene, pass_name)
+        try:
+            passes[pass_name] = load_image_pixels(filepath)[:, :, 0]
+        finally:
+            if os.path.exists(filepath):
+                os.remove(filepath)
+    segmentation = np.round(passes["IndexOB"]).astype(np.uint16)
+    depth = passes["Depth"]
+    depth[depth >= scene.camera.data.clip_end] = 0.0
+    return segmentation, depth
+
+
+def render_dataset(output_dir, n_samples, seed=0, distances=(1.5, 3.0),
+                   elevations=(-10.0, 60.0), target_jitter=0.1, lens=35.0,
+                   writer=None, log=print, log_every=50):
+    """Render n_samples randomized samples of the loaded robot to output_dir.
+
+    Parameters
+    ----------
+    output_dir : str
+        Directory of the images and annotations, see the module docstring.
+    n_samples : int
+    seed : int
+        Seed of the joint value and camera sampling.
+    distances : tuple of float
+        Range of the camera distance as multiples of the robot size.
+    elevations : tuple of float
+        Range of the camera elevation in degrees.
+    target_jitter : float
+        Largest offset of the camera target from the robot center as a
+        multiple of the robot size.
+    lens : float
+        Camera focal length in millimeters.
+    writer : formamotus.utils.image_writer.AsyncImageWriter, optional
+        Writes the images while the next sample renders. Defaults to a
+        writer with two threads.
+    log : callable
+        Called with lines of progress.
+    log_every : int
+        Report the progress every this many samples.
+
+    Returns
+    -------
+    dict
+        Settings, link pass indices and timings, as written to
+        ``dataset.json``.
+    """
+    scene = bpy.context.scene
+    tree = robot_visualizer.get_kinematic_tree()
+    if tree is None or not robot_visualizer.pose_ready():
+        raise RuntimeError("Visualize a robot before rendering a dataset")
+    # Object index passes are Cycles only.
+    if render_preset_engine(scene.formamotus_render_preset) not in (None, 'CYCLES'):
+        raise ValueError(f"The {scene.formamotus_render_preset} preset does not render with Cycles")
+    # The instances of one object share its pass index.
+    if robot_visualizer.skeleton_instanced() and not scene.formamotus_use_mesh:
+        raise ValueError("Link masks of the skeleton need a rig mode other than Instanced Skeleton")
+    scene.render.engine = 'CYCLES'
+    pass_indices = robot_visualizer.assign_link_pass_indices()
+    for name in ("rgb", "segmentation", "depth"):
+        os.makedirs(os.path.join(output_dir, name), exist_ok=True)
+    pass_dir = tempfile.mkdtemp(prefix="formamotus_passes_", dir=fast_temp_dir())
+    enable_pass_outputs(scene, pass_dir, DATASET_PASSES)
+
+    rng = np.random.default_rng(seed)
+    joint_samples = tree.sample_joint_values(rng, n_samples)
+    own_writer = writer is None
+    if own_writer:
+        writer = AsyncImageWriter(2)
+    writes = []
+    timings = {"pose": 0.0, "render": 0.0, "passes": 0.0}
+    start_time = time.perf_counter()
+    try:
+        annotations_path = os.path.join(output_dir, "annotations.jsonl")
+        with open(annotations_path, "w", encoding="utf-8") as annotations:
+            for i, joint_values in enumerate(joint_samples):
+                pose_start = time.perf_counter()
+                robot_visualizer.apply_pose(joint_values)
+                bpy.context.view_layer.update()
+                center, size = robot_visualizer.robot_bounds()
+                size = max(size, 1e-3)
+                target = center + rng.uniform(-target_jitter, target_jitter, 3) * size
+                location = sample_view_locations(
+                    rng, 1, target, np.asarray(distances) * size, np.radians(elevations))[0]
+
+                render_start = time.perf_counter()
+                status = bpy.ops.robot_viz.render_robot(
+                    output='PIXELS', use_custom_camera=True, camera_location=location,
+                    camera_target=target, camera_lens=lens)
+                if 'FINISHED' not in status:
+                    raise RuntimeError(f"Failed to render sample {i}")
+                passes_start = time.perf_counter()
+                segmentation, depth = read_dataset_passes(scene)
+                passes_end = time.perf_counter()
+                timings["pose"] += render_start - pose_start
+                timings["render"] += passes_start - render_start
+                timings["passes"] += passes_end - passes_start
+
+                name = f"{i:06d}"
+                files = {
+                    "rgb": os.path.join("rgb", f"{name}.png"),
+                    "segmentation": os.path.join("segmentation", f"{name}.png"),
+                    "depth": os.path.join("depth", f"{name}.npz"),
+                }
+                pixels = {"rgb": robot_visualizer.get_render_pixels(),
+                          "segmentation": segmentation, "depth": depth}
+                for key, filename in files.items():
+                    writes.append(writer.submit(os.path.join(output_dir, filename), pixels[key]))
+                annotation = {
+                    "index": i, **files,
+                    "joint_values": dict(zip(tree.joint_names, joint_values.tolist())),
+                    "camera": scene_camera_annotation(scene, location, target),
+                }
+                annotations.write(json.dumps(annotation) + "\n")
+
+                if log_every and (i + 1) % log_every == 0:
+                    rate = (i + 1) / (time.perf_counter() - start_time)
+                    log(f"[{i + 1}/{n_samples}] {rate:.2f} samples/s")
+                # Report failed writes early instead of after the last sample.
+                while writes and writes[0].done():
+                    writes.pop(0).result()
+        for write in writes:
+            write.result()
+    finally:
+        if own_writer:
+            writer.close()
+        disable_pass_outputs(scene)
+        shutil.rmtree(pass_dir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - start_time
+    summary = {
+        "samples": n_samples, "seed": seed, "distances": list(distances),
+        "elevations": list(elevations), "target_jitter": target_jitter, "lens": lens,
+        "use_mesh": scene.formamotus_use_mesh, "link_pass_indices": pass_indices,
+        "joint_names": tree.joint_names, "total_time": elapsed,
+        "samples_per_second": n_samples / elapsed if elapsed > 0 else 0.0,
+        "pose_time": timings["pose"], "render_time": timings["render"],
+        "passes_time": timings["passes"],
+    }
+    with open(os.path.join(output_dir, "dataset.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    rate = summary["samples_per_second"]
+    log(f"Rendered {n_samples} samples in {elapsed:.2f}s ({rate:.2f} samples/s)")
+    return summary
+
+
+def parse_args(argv=None):
+    if argv is None:
+        # Blender passes the arguments after "--" on to the script.
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(
+        prog="render_dataset", description="Render randomized samples of a robot.")
+    parser.add_argument("urdf", help="URDF file of the robot")
+    parser.add_argument("output_dir", help="Directory of the dataset")
+    parser.add_argument("-n", "--samples", type=int, default=100, help="Number of samples")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--resolution", type=int, nargs=2, default=(640, 480),
+                        metavar=("WIDTH", "HEIGHT"), help="Image size")
+    parser.add_argument("--cycles-samples", type=int, default=16,
+                        help="Cycles samples per pixel without a preset")
+    parser.add_argument("--preset", choices=["NONE", "PREVIEW", "FINAL"], default="NONE",
+                        help="Render preset; it overrides --cycles-samples")
+    parser.add_argument("--distance", type=float, nargs=2, default=(1.5, 3.0),
+                        metavar=("MIN", "MAX"),
+                        help="Camera distance range as multiples of the robot size")
+    parser.add_argument("--elevation", type=float, nargs=2, default=(-10.0, 60.0),
+                        metavar=("MIN", "MAX"), help="Camera elevation range in degrees")
+    parser.add_argument("--lens", type=float, default=35.0, help="Focal length in millimeters")
+    parser.add_argument("--no-mesh", action="store_true",
+                        help="Render the kinematic skeleton instead of the meshes")
+    parser.add_argument("--writers", type=int, default=2, help="Image writer threads")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    scene = bpy.context.scene
+    scene.formamotus_urdf_filepath = os.path.abspath(args.urdf)
+    if 'FINISHED' not in bpy.ops.robot_viz.visualize_robot(clear_scene=True):
+        raise RuntimeError(f"Failed to load {args.urdf}")
+    scene.formamotus_use_mesh = not args.no_mesh
+    scene.render.resolution_x, scene.render.resolution_y = args.resolution
+    scene.render.resolution_percentage = 100
+    scene.cycles.samples = args.cycles_samples
+    scene.formamotus_render_preset = args.preset
+    with AsyncImageWriter(args.writers) as writer:
+        return render_dataset(
+            args.output_dir, args.samples, args.seed, args.distance, args.elevation,
+            lens=args.lens, writer=writer)
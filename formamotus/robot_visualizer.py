@@ -3,26 +3,133 @@ import os
 from pathlib import Path
 import re  # Added for cleaning property names
 import tempfile
+import time
 from typing import ClassVar
 
 import bpy
 from mathutils import Matrix
-from mathutils import Vector
+from mathutils import Quaternion
 import numpy as np
 from skrobot.data import fetch_urdfpath
 from skrobot.model import RobotModel
 from skrobot.utils.urdf import no_mesh_load_mode
 from skrobot.utils.urdf import resolve_filepath
 
+from formamotus.utils.camera_utils import look_at_matrix
+from formamotus.utils.camera_utils import orbit_view_locations
+from formamotus.utils.camera_utils import PRESET_VIEW_DIRECTIONS
+from formamotus.utils.camera_utils import preset_view_locations
 from formamotus.utils.dae import fix_up_axis_and_get_materials
-from formamotus.utils.dae import zero_origin_dae
+from formamotus.utils.instance_utils import create_cylinder_instancer
+from formamotus.utils.instance_utils import create_instance_points
+from formamotus.utils.instance_utils import InstanceTransformWriter
+from formamotus.utils.instance_utils import OUTLINE_WIDTH_INPUT
+from formamotus.utils.instance_utils import quaternion_attributes_supported
+from formamotus.utils.instance_utils import set_instance_sizes
+from formamotus.utils.instance_utils import set_instancer_input
+from formamotus.utils.keyframe_utils import bake_object_transforms
+from formamotus.utils.keyframe_utils import object_action
+from formamotus.utils.keyframe_utils import set_fcurve_keyframes
+from formamotus.utils.kinematics import align_y_matrix
+from formamotus.utils.kinematics import align_z_matrix
+from formamotus.utils.kinematics import connector_transforms
+from formamotus.utils.kinematics import continuous_quaternions
+from formamotus.utils.kinematics import joint_range
+from formamotus.utils.kinematics import KinematicTree
+from formamotus.utils.kinematics import matrices_to_quaternions
+from formamotus.utils.kinematics import PoseLayout
+from formamotus.utils.mesh_cache import default_cache_dir
+from formamotus.utils.mesh_cache import GeometryCache
+from formamotus.utils.mesh_cache import ORIGIN_BAKED_EXTENSIONS
+from formamotus.utils.mesh_decode import decode_mesh
+from formamotus.utils.mesh_decode import decode_meshes
+from formamotus.utils.mesh_utils import build_mesh_from_arrays
+from formamotus.utils.mesh_utils import create_cylinder_mesh
+from formamotus.utils.mesh_utils import get_color_material
+from formamotus.utils.mesh_utils import mesh_arrays_from_object
+from formamotus.utils.mesh_utils import set_cylinder_mesh_size
+from formamotus.utils.render_presets import apply_render_preset
+from formamotus.utils.render_presets import expected_render_time
+from formamotus.utils.render_presets import record_render_time
+from formamotus.utils.render_presets import RENDER_PRESET_ITEMS
+from formamotus.utils.render_presets import render_preset_outline_method
+from formamotus.utils.rendering_utils import disable_inverted_hull
+from formamotus.utils.rendering_utils import disable_line_art
 from formamotus.utils.rendering_utils import enable_freestyle
+from formamotus.utils.rendering_utils import enable_inverted_hull
+from formamotus.utils.rendering_utils import enable_line_art
+from formamotus.utils.rendering_utils import get_hull_material
+from formamotus.utils.rendering_utils import line_art_supported
+from formamotus.utils.rendering_utils import meters_per_pixel
+from formamotus.utils.rendering_utils import OUTLINE_METHOD_ITEMS
+from formamotus.utils.rendering_utils import read_render_result
+from formamotus.utils.rendering_utils import set_inverted_hull_width
+from formamotus.utils.rendering_utils import set_line_art_width
+from formamotus.utils.scene_utils import clear_other_objects
+from formamotus.utils.scene_utils import clear_robot_collection
+from formamotus.utils.scene_utils import exclude_part_collections
+from formamotus.utils.scene_utils import find_layer_collection
+from formamotus.utils.scene_utils import format_scene_report
+from formamotus.utils.scene_utils import get_part_collection
+from formamotus.utils.scene_utils import get_robot_collection
+from formamotus.utils.scene_utils import scene_snapshot
+from formamotus.utils.trajectory import load_trajectory
+from formamotus.utils.trajectory import open_trajectory
+from formamotus.utils.trajectory import trajectory_frames
+from formamotus.utils.trajectory import trajectory_joint_values
+from formamotus.utils.trajectory import trajectory_sample
+from formamotus.utils.transform_utils import ObjectTransformWriter
+from formamotus.utils.transform_utils import set_object_transform
+from formamotus.utils.transform_utils import SplitTransformWriter
 
 _robot_model = None
 _cylinder_objects = {}
 _thin_cylinder_objects = []
 _mesh_objects = defaultdict(list)
-_coordinates_offset = {}
+_mesh_import_cache = {}
+_decoded_mesh_parts = {}
+_geometry_cache = None
+_kinematic_tree = None
+_pose_layout = None
+_pose_writer = None
+_joint_angle_properties = {}
+_joint_values = None
+_link_transforms = None
+_mesh_rows = None
+_pending_joint_values = {}
+_hidden_pose_stale = False
+_link_empties = []
+_rig_connectors = []
+_armature_object = None
+_joint_bones = []
+_rest_joint_values = None
+_playback_times = None
+_playback_positions = None
+_playback_columns = None
+_playback_joints = None
+_playback_update_end = 0.0
+_playback_update_duration = 0.0
+_render_pixels = None
+_render_timing = None
+_skeleton_object = None
+_joint_cylinder_links = []
+
+JOINT_COLOR_PROPERTIES = {
+    'revolute': 'formamotus_revolute_color',
+    'prismatic': 'formamotus_prismatic_color',
+    'continuous': 'formamotus_continuous_color',
+    'default': 'formamotus_default_color',
+}
+CONNECTOR_COLOR = (0, 0, 0, 1)  # Black for connectors
+MESH_COLOR = (0.5, 0.5, 0.5, 1.0)  # Gray
+JOINT_CYLINDER_MESH_NAME = "JointCylinder"
+CONNECTOR_CYLINDER_MESH_NAME = "ConnectorCylinder"
+RENDER_CAMERA_NAME = "RobotCamera"
+RENDER_LIGHT_NAME = "RobotLight"
+SKELETON_OBJECT_NAME = "RobotSkeleton"
+# Width of the skeleton outlines in pixels.
+OUTLINE_THICKNESS = 3.0
+LINE_ART_FALLBACK_WARNING = "Line Art outlines need Blender 4.2 or older, using Inverted Hull outlines"
 
 
 def set_robot_model(model):
@@ -33,103 +140,599 @@ def get_robot_model():
     return _robot_model
 
 
-def update_cylinder_size(self, context):
-    global _cylinder_objects
+def get_kinematic_tree():
+    return _kinematic_tree
+
+
+def get_joint_values():
+    """Return a copy of the current joint values, ordered as the kinematic tree joints."""
+    return None if _joint_values is None else _joint_values.copy()
+
+
+def get_render_timing():
+    """Return the preset, expected and measured seconds of the last render."""
+    return _render_timing
+
+
+def get_render_pixels():
+    """Return the pixels of the last render made with output='PIXELS'.
+
+    The array has shape (height, width, 4), or (views, height, width, 4)
+    after robot_viz.render_views.
+    """
+    return _render_pixels
+
+
+def mesh_cache_key(mesh_filepath, visual_origin=None):
+    """Return the import cache key for a mesh file and its visual origin.
+
+    Like :meth:`GeometryCache.key`, the origin only counts for the formats
+    decoded with it baked in.
+    """
+    origin_key = None
+    ext = os.path.splitext(mesh_filepath)[1].lower()
+    if visual_origin is not None and ext in ORIGIN_BAKED_EXTENSIONS:
+        origin = np.round(np.asarray(visual_origin, dtype=np.float64), 9)
+        origin_key = tuple(origin.ravel().tolist())
+    return (os.path.realpath(mesh_filepath), origin_key)
+
+
+def get_cached_mesh_data(key):
+    """Return the cached (mesh data, scale) pairs for key, or None.
+
+    Entries whose datablocks were removed from the blend file are dropped.
+    """
+    global _mesh_import_cache
+    cached = _mesh_import_cache.get(key)
+    if cached is None:
+        return None
+    try:
+        for mesh_data, _scale in cached:
+            if mesh_data is not None:
+                mesh_data.name  # NOQA
+    except ReferenceError:
+        del _mesh_import_cache[key]
+        return None
+    return cached
+
+
+def get_geometry_cache(scene):
+    """Return the on-disk geometry cache configured in scene, or None if disabled."""
+    global _geometry_cache
+    if not scene.formamotus_use_mesh_cache:
+        return None
+    cache_dir = bpy.path.abspath(scene.formamotus_mesh_cache_dir) or default_cache_dir()
+    if _geometry_cache is None or _geometry_cache.cache_dir != cache_dir:
+        _geometry_cache = GeometryCache(cache_dir)
+    _geometry_cache.max_size_bytes = scene.formamotus_mesh_cache_size * 1024 * 1024
+    return _geometry_cache
+
+
+def joint_material_type(joint_type):
+    """Return the key of JOINT_COLOR_PROPERTIES used for a joint type."""
+    return joint_type if joint_type in JOINT_COLOR_PROPERTIES else 'default'
+
+
+def set_emission_color(material, color):
+    emission = material.node_tree.nodes.get("Emission") if material.node_tree else None
+    if emission:
+        emission.inputs["Color"].default_value = color
+    # Workbench renders and the solid viewport show the viewport color.
+    material.diffuse_color = color
+
+
+def get_emission_material(name, color):
+    """Return the shared emission material called name, creating it on first use."""
+    material = bpy.data.materials.get(name)
+    if material is None:
+        material = bpy.data.materials.new(name=name)
+        material.use_nodes = True
+        nodes = material.node_tree.nodes
+        nodes.clear()  # Clear default nodes
+        emission = nodes.new("ShaderNodeEmission")
+        output = nodes.new("ShaderNodeOutputMaterial")
+        emission.inputs["Strength"].default_value = 1.0
+        material.node_tree.links.new(emission.outputs["Emission"], output.inputs["Surface"])
+    set_emission_color(material, color)
+    return material
+
+
+def get_joint_material(scene, joint_type):
+    material_type = joint_material_type(joint_type)
+    return get_emission_material(
+        f"JointMaterial_{material_type}", getattr(scene, JOINT_COLOR_PROPERTIES[material_type]))
+
+
+def update_joint_colors(self, context):
+    """Push the joint color properties into the shared joint materials."""
     scene = context.scene
+    for material_type, prop_name in JOINT_COLOR_PROPERTIES.items():
+        material = bpy.data.materials.get(f"JointMaterial_{material_type}")
+        if material is not None:
+            set_emission_color(material, getattr(scene, prop_name))
+
+
+def get_joint_cylinder_mesh(scene):
+    """Return the cylinder mesh shared by all joint objects, sized from scene."""
     radius_m = scene.formamotus_cylinder_radius / 1000.0
     height_m = scene.formamotus_cylinder_height / 1000.0
+    mesh = bpy.data.meshes.get(JOINT_CYLINDER_MESH_NAME)
+    if mesh is None:
+        mesh = create_cylinder_mesh(JOINT_CYLINDER_MESH_NAME, radius_m, height_m)
+        # Each joint object links its own joint type material to this slot.
+        mesh.materials.append(None)
+    else:
+        set_cylinder_mesh_size(mesh, radius_m, height_m)
+    return mesh
+
+
+def get_connector_cylinder_mesh(scene):
+    """Return the unit-length cylinder mesh shared by all connector objects."""
+    radius_m = scene.formamotus_connector_cylinder_radius / 1000.0
+    mesh = bpy.data.meshes.get(CONNECTOR_CYLINDER_MESH_NAME)
+    if mesh is None:
+        mesh = create_cylinder_mesh(CONNECTOR_CYLINDER_MESH_NAME, radius_m, 1.0)
+    else:
+        set_cylinder_mesh_size(mesh, radius_m, 1.0)
+    return mesh
+
+
+def skeleton_materials(scene):
+    """Return the materials of the instanced skeleton by kind.
+
+    Kind 0 is the connectors, the following kinds the joint types of
+    JOINT_COLOR_PROPERTIES in order.
+    """
+    return [get_emission_material("ConnectorMaterial", CONNECTOR_COLOR),
+            *(get_joint_material(scene, joint_type) for joint_type in JOINT_COLOR_PROPERTIES)]
+
+
+def skeleton_kind(joint_type=None):
+    """Return the instanced skeleton kind of a joint type, or of connectors for None."""
+    if joint_type is None:
+        return 0
+    return 1 + list(JOINT_COLOR_PROPERTIES).index(joint_material_type(joint_type))
+
+
+def skeleton_instance_sizes(scene, kinds):
+    """Return the (N, 3) radius, radius and height of the cylinders of kinds in meters."""
+    radius = scene.formamotus_cylinder_radius / 1000.0
+    connector_radius = scene.formamotus_connector_cylinder_radius / 1000.0
+    sizes = np.tile([radius, radius, scene.formamotus_cylinder_height / 1000.0], (len(kinds), 1))
+    # Connectors are unit-length and scaled to their length by the pose.
+    sizes[np.asarray(kinds) == 0] = (connector_radius, connector_radius, 1.0)
+    return sizes
 
-    for _link, cylinder in _cylinder_objects.items():
-        cylinder.scale = (radius_m / 0.03, radius_m / 0.03, height_m / 0.15)
+
+def update_skeleton_sizes(scene):
+    """Resize the instanced skeleton to the cylinder size properties of scene."""
+    if _skeleton_object is None:
+        return
+    mesh = _skeleton_object.data
+    kinds = np.zeros(len(mesh.vertices), dtype=np.int32)
+    mesh.attributes["kind"].data.foreach_get("value", kinds)
+    set_instance_sizes(mesh, skeleton_instance_sizes(scene, kinds))
+
+
+def update_cylinder_size(self, context):
+    scene = context.scene
+    mesh = bpy.data.meshes.get(JOINT_CYLINDER_MESH_NAME)
+    if mesh is not None:
+        set_cylinder_mesh_size(
+            mesh, scene.formamotus_cylinder_radius / 1000.0, scene.formamotus_cylinder_height / 1000.0)
+    update_skeleton_sizes(scene)
     bpy.context.view_layer.update()
 
 def update_connector_cylinder_size(self, context):
-    global _thin_cylinder_objects
     scene = context.scene
-    radius_m = scene.formamotus_connector_cylinder_radius / 1000.0
-    radius_scale = radius_m / (0.03 * 0.3)
-    for _org_parent_link, _link, thin_cylinder, _org_length in _thin_cylinder_objects:
-        scale = thin_cylinder.scale
-        thin_cylinder.scale = (radius_scale, radius_scale, scale[2])
+    mesh = bpy.data.meshes.get(CONNECTOR_CYLINDER_MESH_NAME)
+    if mesh is not None:
+        set_cylinder_mesh_size(mesh, scene.formamotus_connector_cylinder_radius / 1000.0, 1.0)
+    update_skeleton_sizes(scene)
     bpy.context.view_layer.update()
 
-def update_joint_position(self, context):
-    global _cylinder_objects
-    global _robot_model
-    global _thin_cylinder_objects
-    global _mesh_objects
-    global _coordinates_offset
-    if not _cylinder_objects or not _robot_model:
+def joint_angle_property_name(joint_name):
+    """Return the scene property name of a joint angle slider."""
+    # Replace spaces, slashes, and other special characters with underscores
+    cleaned_name = re.sub(r'[^a-zA-Z0-9_]', '_', joint_name)
+    return f"formamotus_joint_angle_{cleaned_name}"
+
+
+def bind_joint_angle_properties():
+    """Map the joint angle sliders to positions in the joint value vector."""
+    global _joint_angle_properties
+    _joint_angle_properties = {}
+    for i, joint_name in enumerate(_kinematic_tree.joint_names):
+        if joint_name in _kinematic_tree.mimic_names:
+            continue
+        joint_type = _kinematic_tree.joint_types[i]
+        if joint_type == 'prismatic':
+            unit_scale = 1.0 / 1000.0
+        elif joint_type in ['revolute', 'continuous']:
+            unit_scale = np.pi / 180.0
+        else:
+            unit_scale = 1.0
+        _joint_angle_properties[joint_name] = (i, joint_angle_property_name(joint_name), unit_scale)
+
+
+def read_joint_values(scene):
+    """Return the joint value vector set by the joint angle sliders of scene."""
+    joint_values = _joint_values.copy()
+    for i, prop_name, unit_scale in _joint_angle_properties.values():
+        if hasattr(scene, prop_name):
+            joint_values[i] = getattr(scene, prop_name) * unit_scale
+    return joint_values
+
+
+def visible_row_mask(scene):
+    """Return the PoseLayout rows of the objects shown for formamotus_use_mesh."""
+    return _mesh_rows if scene.formamotus_use_mesh else ~_mesh_rows
+
+
+def write_pose_objects(link_indices=None, row_mask=None):
+    """Write the transforms of the objects following link_indices, or of all objects.
+
+    Objects outside row_mask are skipped and marked stale until
+    sync_hidden_pose_objects writes them.
+    """
+    global _hidden_pose_stale
+    rows, locations, quaternions, scales = _pose_layout.object_transforms(
+        _link_transforms, link_indices, row_mask)
+    _pose_writer.write(locations, quaternions, scales, subset=rows)
+    if row_mask is not None:
+        _hidden_pose_stale = True
+    elif link_indices is None:
+        _hidden_pose_stale = False
+
+
+def sync_hidden_pose_objects():
+    """Bring the objects skipped by fast slider updates to the current pose."""
+    if _hidden_pose_stale and _pose_writer is not None:
+        write_pose_objects()
+
+
+def pose_ready():
+    """Return whether a robot has been built that joint values can be applied to."""
+    return _kinematic_tree is not None and (
+        _pose_writer is not None or _armature_object is not None)
+
+
+def current_link_transforms():
+    """Return the world transforms of the links for the current joint values."""
+    global _link_transforms
+    if _link_transforms is None:
+        _link_transforms = _kinematic_tree.forward_kinematics(_joint_values)
+    return _link_transforms
+
+
+def robot_bounds():
+    """Return the center and the largest extent of the joints of the current pose."""
+    link_indices = [_kinematic_tree.link_index[link] for link in _joint_cylinder_links]
+    if not link_indices:
+        link_indices = list(range(len(_kinematic_tree.links)))
+    positions = current_link_transforms()[link_indices, :3, 3]
+    min_coords = positions.min(axis=0)
+    max_coords = positions.max(axis=0)
+    return (min_coords + max_coords) / 2, np.max(max_coords - min_coords)
+
+
+def skeleton_instanced():
+    """Return whether the joint and connector cylinders are instances of one object."""
+    return _skeleton_object is not None
+
+
+def assign_link_pass_indices():
+    """Give the objects of every link the pass index of the link.
+
+    The pass index is the position of the link in the kinematic tree plus
+    one, so 0 stays free for the background of object index passes. A
+    connector belongs to the link it ends at.
+
+    Returns
+    -------
+    dict
+        Link name to pass index, for every link.
+    """
+    pass_indices = {link.name: i + 1 for i, link in enumerate(_kinematic_tree.links)}
+    link_objects = [(link, [cylinder]) for link, cylinder in _cylinder_objects.items()]
+    link_objects.extend(_mesh_objects.items())
+    link_objects.extend((link, [thin_cylinder]) for _, link, thin_cylinder in _thin_cylinder_objects)
+    for link, objects in link_objects:
+        for obj in objects:
+            obj.pass_index = pass_indices[link.name]
+    return pass_indices
+
+
+def write_link_empties(link_indices=None):
+    """Write the local transforms of the link empties of the hierarchy rig."""
+    if link_indices is None:
+        local_transforms = _kinematic_tree.local_link_transforms(_joint_values)
+        _pose_writer.write(
+            local_transforms[:, :3, 3], matrices_to_quaternions(local_transforms[:, :3, :3]))
         return
-    scene = context.scene
-
-    for joint_name in _robot_model.joint_names:
-        joint = _robot_model.__dict__.get(joint_name)
-        if joint and joint.type != 'fixed':
-            prop_name = f"formamotus_joint_angle_{joint_name.replace(' ', '_').replace('/', '_')}"
-            if hasattr(scene, prop_name):
-                joint_angle_ui = getattr(scene, prop_name)
-                if joint.type == 'prismatic':
-                    joint.joint_angle(joint_angle_ui / 1000.0)
-                elif joint.type in ['revolute', 'continuous']:
-                    joint.joint_angle(np.deg2rad(joint_angle_ui))
-                else:
-                    joint.joint_angle(joint_angle_ui)
-
-    for link, cylinder in _cylinder_objects.items():
-        # Update the position and rotation of the cylinder
-        parent_link = link.copy_worldcoords()
-        axis = link.joint.axis
-        if isinstance(axis, str):
-            axis_dict = {'x': [1, 0, 0], 'y': [0, 1, 0], 'z': [0, 0, 1]}
-            axis_vector = np.array(axis_dict.get(axis.lower(), [0, 0, 1]))
+    local_transforms = _kinematic_tree.local_link_transforms(_joint_values, link_indices)
+    for link, local_transform in zip(link_indices, local_transforms):
+        set_object_transform(_link_empties[link], local_transform)
+
+
+def write_armature_bones(joints=None):
+    """Write joint values to the pose bones of the armature rig.
+
+    Joint bones rotate about or slide along their Y axis, which is aligned
+    with the joint axis, relative to the rest pose.
+    """
+    pose_bones = _armature_object.pose.bones
+    if joints is None:
+        joints = range(len(_joint_bones))
+    for j in joints:
+        pose_bone = pose_bones[_joint_bones[j]]
+        value = _joint_values[j] - _rest_joint_values[j]
+        if _kinematic_tree.prismatic[j]:
+            pose_bone.location = (0.0, value, 0.0)
         else:
-            axis_vector = np.array(axis)
-        default_vector = np.array([0, 0, 1])
-        rotation_axis = np.cross(default_vector, axis_vector)
-        if np.linalg.norm(rotation_axis) > 1e-6:
-            rotation_axis = rotation_axis / np.linalg.norm(rotation_axis)
-            angle = np.arccos(np.dot(default_vector, axis_vector))
-            parent_link.rotate(angle, rotation_axis)
-        cylinder.location = parent_link.worldpos()
-        cylinder.rotation_mode = 'QUATERNION'
-        cylinder.rotation_quaternion = parent_link.quaternion
-
-    # Update the position and rotation of the thin cylinders
-    for org_parent_link, link, thin_cylinder, org_length in _thin_cylinder_objects:
-        start_pos = org_parent_link.worldpos()
-        end_pos = link.worldpos()
-        direction = end_pos - start_pos
-        length = np.linalg.norm(direction)
-
-        if length > 1e-6:
-            mid_pos = start_pos + direction * 0.5
-            thin_cylinder.location = mid_pos
-            thin_cylinder.scale = (thin_cylinder.scale[0], thin_cylinder.scale[1], length / org_length)
-            # Compute the rotation axis and angle
-            z_axis = np.array([0, 0, 1])
-            rot_axis = np.cross(z_axis, direction)
-            if np.linalg.norm(rot_axis) > 1e-6:
-                rot_axis = rot_axis / np.linalg.norm(rot_axis)
-                angle = np.arccos(np.dot(z_axis, direction) / length)
-                thin_cylinder.rotation_mode = 'AXIS_ANGLE'
-                thin_cylinder.rotation_axis_angle = [angle, rot_axis[0], rot_axis[1], rot_axis[2]]
-            else:
-                thin_cylinder.rotation_mode = 'QUATERNION'
-                thin_cylinder.rotation_quaternion = [1, 0, 0, 0]
-
-    for link, mesh_objs in _mesh_objects.items():
-        link_coords = link.copy_worldcoords()
-        if link in _coordinates_offset:
-            link_coords = link_coords.copy_worldcoords().transform(_coordinates_offset[link])
-        for mesh_obj in mesh_objs:
-            mesh_obj.location = link_coords.worldpos()
-            mesh_obj.rotation_mode = 'QUATERNION'
-            mesh_obj.rotation_quaternion = link_coords.quaternion
+            pose_bone.rotation_euler = (0.0, value, 0.0)
+
+
+def write_rig_connectors(joints=None):
+    """Re-span the connectors of a rig whose length depends on joints.
+
+    Connectors are parented to their start link, so only a joint between
+    their two links, like a prismatic one, changes them.
+    """
+    for connector_joints, thin_cylinder, start, end, frame in _rig_connectors:
+        if joints is not None and not connector_joints & joints:
+            continue
+        relative_transform = _kinematic_tree.relative_transform(start, end, _joint_values)
+        locations, quaternions, lengths = connector_transforms(
+            np.zeros((1, 3)), relative_transform[None, :3, 3])
+        if lengths[0] > 1e-6:
+            connector_transform = np.eye(4)
+            connector_transform[:3, :3] = np.array(
+                Quaternion(quaternions[0]).to_matrix(), dtype=np.float64)
+            connector_transform[:3, 3] = locations[0]
+            set_object_transform(thin_cylinder, frame @ connector_transform, (1.0, 1.0, lengths[0]))
+
+
+def apply_pose(joint_values, row_mask=None):
+    """Place every robot object for joint_values with one batched FK pass."""
+    global _joint_values
+    global _link_transforms
+    _joint_values = _kinematic_tree.resolve_joint_values(joint_values)
+    if _armature_object is not None:
+        _link_transforms = None
+        write_armature_bones()
+        write_rig_connectors()
+        return
+    if _link_empties:
+        _link_transforms = None
+        write_link_empties()
+        write_rig_connectors()
+        return
+    _link_transforms = _kinematic_tree.forward_kinematics(_joint_values)
+    write_pose_objects(row_mask=row_mask)
+
+
+def apply_joint_value(joint_name, value, row_mask=None):
+    """Move one joint, updating only the links below it and the objects they carry."""
+    global _joint_values
+    global _link_transforms
+    i = _kinematic_tree.joint_position[joint_name]
+    joint_values = _joint_values.copy()
+    joint_values[i] = value
+    _joint_values = _kinematic_tree.resolve_joint_values(joint_values)
+    if _armature_object is not None or _link_empties:
+        # Blender propagates the change down the bones or the empties.
+        _link_transforms = None
+        joints = _kinematic_tree.driven_joints(i)
+        if _armature_object is not None:
+            write_armature_bones(joints)
+        else:
+            write_link_empties(_kinematic_tree.joint_links[joints])
+        write_rig_connectors(set(joints))
+        return
+    link_indices = _kinematic_tree.update_forward_kinematics(_link_transforms, _joint_values, i)
+    write_pose_objects(link_indices, row_mask)
+
+
+def flush_pose_update():
+    """Apply the joint values queued by the sliders since the last flush.
+
+    This is the bpy.app.timers callback of queue_joint_value and returns
+    None so the timer runs once.
+    """
+    global _pending_joint_values
+    pending = _pending_joint_values
+    _pending_joint_values = {}
+    if not pending or not pose_ready():
+        return None
+
+    scene = bpy.context.scene
+    fast_drag = scene.formamotus_fast_drag
+    row_mask = visible_row_mask(scene) if fast_drag else None
+    if len(pending) == 1:
+        (joint_name, value), = pending.items()
+        apply_joint_value(joint_name, value, row_mask)
+    else:
+        joint_values = _joint_values.copy()
+        for joint_name, value in pending.items():
+            joint_values[_kinematic_tree.joint_position[joint_name]] = value
+        apply_pose(joint_values, row_mask)
+    if not fast_drag:
+        bpy.context.view_layer.update()
+    return None
+
+
+def queue_joint_value(joint_name, value):
+    """Queue a joint value to be applied once before the next redraw.
 
+    Slider drags fire many updates per redraw; only the latest value of each
+    joint is applied. Without an event loop, as in background mode, the
+    value is applied immediately.
+    """
+    _pending_joint_values[joint_name] = value
+    if bpy.app.background:
+        flush_pose_update()
+    elif not bpy.app.timers.is_registered(flush_pose_update):
+        bpy.app.timers.register(flush_pose_update, first_interval=0.0)
+
+
+def update_joint_position(self, context):
+    if not pose_ready():
+        return
+    apply_pose(read_joint_values(context.scene))
     bpy.context.view_layer.update()
 
 
+def joint_angle_update(joint_name):
+    """Return the update callback of the angle slider of one joint."""
+    def update(self, context):
+        binding = _joint_angle_properties.get(joint_name)
+        if not pose_ready() or binding is None:
+            return
+        _, prop_name, unit_scale = binding
+        queue_joint_value(joint_name, getattr(context.scene, prop_name) * unit_scale)
+    return update
+
+
+def update_fast_drag(self, context):
+    if not context.scene.formamotus_fast_drag:
+        flush_pose_update()
+        sync_hidden_pose_objects()
+        bpy.context.view_layer.update()
+
+
+def update_outline_method(self, context):
+    if self.formamotus_outline_method == 'LINE_ART' and not line_art_supported():
+        print(LINE_ART_FALLBACK_WARNING)
+        self.formamotus_outline_method = 'INVERTED_HULL'
+
+
+def bake_joint_trajectory(joint_values, frames, chunk_size=2048):
+    """Keyframe the robot for a sequence of poses.
+
+    Forward kinematics runs on chunk_size poses at a time and every
+    animated channel is written with foreach_set. Objects posed from Python
+    are keyed with their world transforms, the link empties of the hierarchy
+    rig with their local transforms and the armature rig on its joint bones.
+    Rig connectors spanning a movable joint are keyed as well.
+
+    Parameters
+    ----------
+    joint_values : numpy.ndarray
+        (S, J) joint values, one pose per row ordered as ``joint_names``.
+    frames : numpy.ndarray
+        (S,) increasing frames of the poses.
+    chunk_size : int
+        Number of poses passed to forward kinematics at once.
+    """
+    tree = _kinematic_tree
+    joint_values = tree.resolve_joint_values(np.atleast_2d(joint_values))
+    n_samples = len(joint_values)
+
+    if _armature_object is not None:
+        action = object_action(_armature_object)
+        offsets = joint_values - _rest_joint_values
+        for j, bone_name in enumerate(_joint_bones):
+            channel = "location" if tree.prismatic[j] else "rotation_euler"
+            data_path = f'pose.bones["{bpy.utils.escape_identifier(bone_name)}"].{channel}'
+            set_fcurve_keyframes(
+                action, data_path, frames, offsets[:, j], indices=[1], group=bone_name)
+
+    if _armature_object is not None or _link_empties:
+        objects = list(_link_empties) if _armature_object is None else []
+        connectors = [connector for connector in _rig_connectors if connector[0]]
+        objects += [thin_cylinder for _, thin_cylinder, _, _, _ in connectors]
+    else:
+        objects = _pose_writer.objects
+    locations = np.zeros((n_samples, len(objects), 3))
+    quaternions = np.zeros((n_samples, len(objects), 4))
+    scales = np.ones((n_samples, len(objects), 3))
+
+    for begin in range(0, n_samples, chunk_size):
+        chunk = slice(begin, begin + chunk_size)
+        if _armature_object is None and not _link_empties:
+            world_transforms = tree.batch_forward_kinematics(joint_values[chunk])
+            locations[chunk], quaternions[chunk], scales[chunk] = (
+                _pose_layout.batch_object_transforms(world_transforms))
+            continue
+        n_empties = 0
+        if _armature_object is None:
+            local_transforms = tree.batch_local_link_transforms(joint_values[chunk])
+            n_empties = len(_link_empties)
+            locations[chunk, :n_empties] = local_transforms[..., :3, 3]
+            quaternions[chunk, :n_empties] = matrices_to_quaternions(
+                local_transforms[..., :3, :3]).reshape(-1, n_empties, 4)
+        if not connectors:
+            continue
+        world_transforms = tree.batch_forward_kinematics(joint_values[chunk])
+        for i, (_, _, start, end, frame) in enumerate(connectors, start=n_empties):
+            # End link position in the start link frame, then in the parent frame.
+            start_transforms = world_transforms[:, start]
+            ends = np.einsum(
+                'sji,sj->si', start_transforms[:, :3, :3],
+                world_transforms[:, end, :3, 3] - start_transforms[:, :3, 3])
+            ends = ends @ frame[:3, :3].T + frame[:3, 3]
+            starts = np.broadcast_to(frame[:3, 3], ends.shape)
+            locations[chunk, i], quaternions[chunk, i], lengths = connector_transforms(
+                starts, ends)
+            scales[chunk, i, 2] = lengths
+
+    bake_object_transforms(
+        objects, frames, locations, continuous_quaternions(quaternions),
+        scales if len(objects) else None)
+
+
+def playback_active():
+    return _playback_positions is not None
+
+
+def playback_frame_change(scene, depsgraph=None):
+    """frame_change_pre handler posing the robot from the playback trajectory.
+
+    The joint values at the new frame are interpolated from the two nearest
+    trajectory samples and applied with apply_pose, before the depsgraph is
+    evaluated. While the animation plays with frame skipping on, a frame is
+    skipped when the previous pose update took longer than the time since
+    it finished, so pose updates never take more than about half of the
+    playback time.
+    """
+    global _playback_update_end
+    global _playback_update_duration
+    if not playback_active() or not pose_ready():
+        return
+    screen = getattr(bpy.context, "screen", None)
+    playing = screen is not None and screen.is_animation_playing
+    start_time = time.perf_counter()
+    if (playing and scene.formamotus_playback_frame_skip
+            and start_time - _playback_update_end < _playback_update_duration):
+        return
+
+    times = _playback_times if scene.formamotus_trajectory_use_timestamps else None
+    sample = trajectory_sample(
+        _playback_positions, scene.frame_current_final, times,
+        scene.render.fps / scene.render.fps_base, scene.frame_start)
+    joint_values = _joint_values.copy()
+    joint_values[_playback_joints] = sample[_playback_columns]
+    row_mask = visible_row_mask(scene) if scene.formamotus_fast_drag else None
+    apply_pose(joint_values, row_mask)
+    _playback_update_end = time.perf_counter()
+    _playback_update_duration = _playback_update_end - start_time
+
+
+def stop_playback():
+    """Remove the playback handler and release the playback trajectory."""
+    global _playback_times
+    global _playback_positions
+    global _playback_columns
+    global _playback_joints
+    if playback_frame_change in bpy.app.handlers.frame_change_pre:
+        bpy.app.handlers.frame_change_pre.remove(playback_frame_change)
+    _playback_times = None
+    _playback_positions = None
+    _playback_columns = None
+    _playback_joints = None
+
+
 def register_custom_properties():
     """Register custom properties to the scene."""
     bpy.types.Scene.formamotus_urdf_filepath = bpy.props.StringProperty(
@@ -154,7 +757,8 @@ def register_custom_properties():
         default=(1.0, 0.0, 0.0, 1.0),  # red
         min=0.0, max=1.0,
         subtype='COLOR',
-        size=4
+        size=4,
+        update=update_joint_colors
     )
 
     bpy.types.Scene.formamotus_prismatic_color = bpy.props.FloatVectorProperty(
@@ -163,7 +767,8 @@ def register_custom_properties():
         default=(0.0, 1.0, 0.0, 1.0),  # green
         min=0.0, max=1.0,
         subtype='COLOR',
-        size=4
+        size=4,
+        update=update_joint_colors
     )
 
     bpy.types.Scene.formamotus_continuous_color = bpy.props.FloatVectorProperty(
@@ -172,7 +777,8 @@ def register_custom_properties():
         default=(0.0, 0.0, 1.0, 1.0),  # blue
         min=0.0, max=1.0,
         subtype='COLOR',
-        size=4
+        size=4,
+        update=update_joint_colors
     )
 
     bpy.types.Scene.formamotus_default_color = bpy.props.FloatVectorProperty(
@@ -181,7 +787,8 @@ def register_custom_properties():
         default=(0.0, 0.0, 0.0, 1.0),  # black
         min=0.0, max=1.0,
         subtype='COLOR',
-        size=4
+        size=4,
+        update=update_joint_colors
     )
 
     bpy.types.Scene.formamotus_cylinder_radius = bpy.props.FloatProperty(
@@ -215,6 +822,89 @@ def register_custom_properties():
         update=update_visibility
     )
 
+    bpy.types.Scene.formamotus_rig_mode = bpy.props.EnumProperty(
+        name="Rig Mode",
+        description="How the robot objects are posed; applied when the robot is visualized",
+        items=[
+            ('OBJECTS', "Objects", "World level objects posed from Python"),
+            ('HIERARCHY', "Empty Hierarchy",
+             "One empty per link parented along the kinematic tree, carrying its visuals"),
+            ('ARMATURE', "Armature",
+             "One bone per movable joint, with the visuals parented to the bones"),
+            ('INSTANCES', "Instanced Skeleton",
+             "Joint and connector cylinders instanced on the points of one object, for many joints"),
+        ],
+        default='OBJECTS'
+    )
+
+    bpy.types.Scene.formamotus_fast_drag = bpy.props.BoolProperty(
+        name="Fast Slider Updates",
+        description="Only move visible objects and skip the view layer update while posing",
+        default=False,
+        update=update_fast_drag
+    )
+
+    bpy.types.Scene.formamotus_trajectory_filepath = bpy.props.StringProperty(
+        name="Trajectory Filepath",
+        description="CSV or NPZ file of joint values to bake into keyframes",
+        default="",
+        subtype='FILE_PATH'
+    )
+
+    bpy.types.Scene.formamotus_trajectory_use_timestamps = bpy.props.BoolProperty(
+        name="Use Timestamps",
+        description="Key samples at their recorded time instead of one sample per frame",
+        default=True,
+    )
+
+    bpy.types.Scene.formamotus_render_preset = bpy.props.EnumProperty(
+        name="Render Preset",
+        description="Render settings applied before every FormaMotus render",
+        items=RENDER_PRESET_ITEMS,
+        default='NONE',
+    )
+
+    bpy.types.Scene.formamotus_outline_method = bpy.props.EnumProperty(
+        name="Outlines",
+        description="How renders outline the kinematic skeleton",
+        items=OUTLINE_METHOD_ITEMS,
+        default='FREESTYLE',
+        update=update_outline_method,
+    )
+
+    bpy.types.Scene.formamotus_playback_frame_skip = bpy.props.BoolProperty(
+        name="Skip Frames",
+        description="Skip pose updates during trajectory playback when they cannot keep up",
+        default=True,
+    )
+
+    bpy.types.Scene.formamotus_decode_workers = bpy.props.IntProperty(
+        name="Mesh Decode Workers",
+        description="Number of processes decoding mesh files in parallel (0 uses all CPU cores)",
+        default=0,
+        min=0, max=256,
+    )
+
+    bpy.types.Scene.formamotus_use_mesh_cache = bpy.props.BoolProperty(
+        name="Use Mesh Cache",
+        description="Store converted mesh geometry on disk and reuse it on later loads",
+        default=True,
+    )
+
+    bpy.types.Scene.formamotus_mesh_cache_dir = bpy.props.StringProperty(
+        name="Mesh Cache Directory",
+        description="Directory of the on-disk mesh geometry cache",
+        default=default_cache_dir(),
+        subtype='DIR_PATH'
+    )
+
+    bpy.types.Scene.formamotus_mesh_cache_size = bpy.props.IntProperty(
+        name="Mesh Cache Size (MB)",
+        description="Maximum size of the mesh cache; least recently used entries are evicted first",
+        default=1024,
+        min=1, max=1024 * 1024,
+    )
+
 def unregister_custom_properties():
     """Unregister custom properties from the scene."""
     del bpy.types.Scene.formamotus_urdf_filepath
@@ -225,7 +915,19 @@ def unregister_custom_properties():
     del bpy.types.Scene.formamotus_default_color
     del bpy.types.Scene.formamotus_cylinder_radius
     del bpy.types.Scene.formamotus_cylinder_height
+    del bpy.types.Scene.formamotus_connector_cylinder_radius
     del bpy.types.Scene.formamotus_use_mesh
+    del bpy.types.Scene.formamotus_rig_mode
+    del bpy.types.Scene.formamotus_fast_drag
+    del bpy.types.Scene.formamotus_trajectory_filepath
+    del bpy.types.Scene.formamotus_trajectory_use_timestamps
+    del bpy.types.Scene.formamotus_playback_frame_skip
+    del bpy.types.Scene.formamotus_render_preset
+    del bpy.types.Scene.formamotus_outline_method
+    del bpy.types.Scene.formamotus_decode_workers
+    del bpy.types.Scene.formamotus_use_mesh_cache
+    del bpy.types.Scene.formamotus_mesh_cache_dir
+    del bpy.types.Scene.formamotus_mesh_cache_size
 
 
 class RobotVisualizerOperator(bpy.types.Operator):
@@ -233,11 +935,15 @@ class RobotVisualizerOperator(bpy.types.Operator):
     bl_label = "Visualize Robot Model"
     bl_options: ClassVar[set[str]] = {'REGISTER', 'UNDO'}
 
+    clear_scene: bpy.props.BoolProperty(
+        name="Clear Scene",
+        description="Also remove the objects FormaMotus did not create, like the startup cube",
+        default=False,
+    )
+
     def clean_property_name(self, joint_name):
         """Clean joint name to create a valid property name."""
-        # Replace spaces, slashes, and other special characters with underscores
-        cleaned_name = re.sub(r'[^a-zA-Z0-9_]', '_', joint_name)
-        return f"formamotus_joint_angle_{cleaned_name}"
+        return joint_angle_property_name(joint_name)
 
     def add_joint_angle_properties(self, context):
         """Dynamically add joint angle properties based on the robot model."""
@@ -261,25 +967,8 @@ class RobotVisualizerOperator(bpy.types.Operator):
             if mimic is not None:
                 continue
             if joint and joint.type != 'fixed':
-                # Get joint angle limits
-                min_angle = joint.min_angle
-                max_angle = joint.max_angle
-
-                # Ensure min_angle and max_angle are finite and valid
-                if not np.isfinite(min_angle) or min_angle is None:
-                    min_angle = 0.0 if joint.type == 'prismatic' else -np.pi
-                if not np.isfinite(max_angle) or max_angle is None:
-                    max_angle = 0.1 if joint.type == 'prismatic' else np.pi
-
-                # Ensure min_angle < max_angle
-                if min_angle >= max_angle:
-                    if joint.type in ['revolute', 'continuous']:
-                        min_angle, max_angle = -np.pi, np.pi
-                    else:
-                        min_angle, max_angle = 0.0, 0.1
-
-                if joint.type == 'continuous':
-                    min_angle, max_angle = -np.pi, np.pi  # Default range for continuous joints
+                # Get finite joint angle limits
+                min_angle, max_angle = joint_range(joint.type, joint.min_angle, joint.max_angle)
 
                 unit_name = ''
                 if joint.type == 'prismatic':
@@ -316,7 +1005,7 @@ class RobotVisualizerOperator(bpy.types.Operator):
                             default=0.0,
                             min=min_angle,
                             max=max_angle,
-                            update=update_joint_position,
+                            update=joint_angle_update(joint_name),
                         )
                     )
                     print(f"Added property: {prop_name} (min: {min_angle}, max: {max_angle})")
@@ -325,9 +1014,52 @@ class RobotVisualizerOperator(bpy.types.Operator):
                     self.report({'INFO'}, f"Failed to add property {prop_name}: {e}")
                     raise
 
-    def import_mesh(self, mesh_filepath, link_name, color=None, visual_origin=None):
-        global _coordinates_offset
+    def link_cached_mesh(self, cached, link_name):
+        """Create new objects sharing already imported mesh data."""
+        mesh_obj_list = []
+        for i, (mesh_data, scale) in enumerate(cached):
+            mesh_obj = bpy.data.objects.new(f"Mesh_{link_name}_{i}", mesh_data)
+            mesh_obj.scale = scale
+            get_part_collection(bpy.context.scene, 'MESHES').objects.link(mesh_obj)
+            mesh_obj_list.append(mesh_obj)
+        return mesh_obj_list
+
+    def build_mesh_objects(self, parts, link_name):
+        """Create mesh objects from decoded mesh parts."""
+        mesh_obj_list = []
+        for i, part in enumerate(parts):
+            mesh_data = build_mesh_from_arrays(f"Mesh_{link_name}_{i}", part)
+            mesh_obj = bpy.data.objects.new(f"Mesh_{link_name}_{i}", mesh_data)
+            mesh_obj.scale = part["scale"]
+            get_part_collection(bpy.context.scene, 'MESHES').objects.link(mesh_obj)
+            mesh_obj_list.append(mesh_obj)
+        return mesh_obj_list
+
+    def assign_color_material(self, mesh_obj, color):
+        """Show mesh_obj in color without changing the mesh data it shares.
+
+        The shared material of color goes on an object-linked first slot, so
+        the other objects using the same mesh data keep their materials.
+        """
+        if not mesh_obj.material_slots:
+            mesh_obj.data.materials.append(None)
+        mesh_obj.material_slots[0].link = 'OBJECT'
+        mesh_obj.material_slots[0].material = get_color_material(color)
+
+    def import_mesh_with_operator(self, mesh_filepath, link_name, visual_origin=None,
+                                  geometry_cache=None, geometry_key=None):
+        """Import a mesh through Blender's importers.
+
+        This is the fallback for files trimesh cannot decode. The importers
+        link their objects to the active collection, so the mesh collection
+        is made active while they run. Like :func:`decode_mesh`, it bakes
+        visual_origin into the geometry of the ORIGIN_BAKED_EXTENSIONS.
+        """
         ext = os.path.splitext(mesh_filepath)[1].lower()
+        view_layer = bpy.context.view_layer
+        active_layer_collection = view_layer.active_layer_collection
+        view_layer.active_layer_collection = find_layer_collection(
+            view_layer.layer_collection, get_part_collection(bpy.context.scene, 'MESHES'))
         try:
             if ext == '.stl':
                 if "stl_import" in dir(bpy.ops.wm):
@@ -341,12 +1073,9 @@ class RobotVisualizerOperator(bpy.types.Operator):
                     self.report({'WARNING'}, "STL import is not supported")
                     return None
             elif ext == '.dae':
-                if visual_origin is not None:
-                    file_path = zero_origin_dae(mesh_filepath, visual_origin)
-                    bpy.ops.wm.collada_import(filepath=file_path)
-                else:
-                    (file_path, _) = fix_up_axis_and_get_materials(mesh_filepath)
-                    bpy.ops.wm.collada_import(filepath=file_path)
+                (file_path, _) = fix_up_axis_and_get_materials(mesh_filepath)
+                bpy.ops.wm.collada_import(filepath=file_path)
+                if file_path != mesh_filepath:
                     Path(file_path).unlink()
             elif ext == '.obj':
                 if "obj_import" in dir(bpy.ops.wm):
@@ -371,59 +1100,359 @@ class RobotVisualizerOperator(bpy.types.Operator):
                 self.report({'WARNING'}, f"Failed to import mesh: {mesh_filepath}")
                 return None
 
-            mesh_obj_list = []
-            for i, mesh_obj in enumerate(bpy.context.selected_objects):
-                mesh_obj.name = f"Mesh_{link_name}_{i}"
+            if ext in ORIGIN_BAKED_EXTENSIONS and visual_origin is not None:
+                origin = Matrix(np.asarray(visual_origin, dtype=np.float64).tolist())
+                for mesh_obj in imported_objects:
+                    if mesh_obj.type != 'MESH':
+                        continue
+                    if mesh_obj.data.users > 1:
+                        mesh_obj.data = mesh_obj.data.copy()
+                    mesh_obj.data.transform(origin @ mesh_obj.matrix_basis)
+                    mesh_obj.matrix_basis = Matrix.Identity(4)
+
+            # Store the imported geometry before any material is added for the link.
+            if geometry_key is not None and all(obj.type == 'MESH' for obj in imported_objects):
+                try:
+                    geometry_cache.store(
+                        geometry_key, [mesh_arrays_from_object(obj) for obj in imported_objects])
+                except OSError as e:
+                    self.report({'WARNING'}, f"Failed to write mesh cache for {mesh_filepath}: {e}")
 
-                # Apply color only if specified
-                if color is not None:
-                    # Create a new material with the specified color
-                    material = bpy.data.materials.new(name=f"Material_{link_name}_{i}")
-                    material.use_nodes = True
-                    principled_bsdf = material.node_tree.nodes.get("Principled BSDF")
-                    if principled_bsdf:
-                        principled_bsdf.inputs["Base Color"].default_value = color
-
-                    # Assign the material to the mesh
-                    if mesh_obj.data.materials:
-                        mesh_obj.data.materials[0] = material
-                    else:
-                        mesh_obj.data.materials.append(material)
-                mesh_obj_list.append(mesh_obj)
-            return mesh_obj_list
+            for i, mesh_obj in enumerate(imported_objects):
+                mesh_obj.name = f"Mesh_{link_name}_{i}"
+            return imported_objects
         except Exception as e:
             self.report({'WARNING'}, f"Error importing mesh {mesh_filepath}: {e}")
             return None
+        finally:
+            view_layer.active_layer_collection = active_layer_collection
+
+    def store_mesh_parts(self, geometry_cache, geometry_key, parts, mesh_filepath):
+        try:
+            geometry_cache.store(geometry_key, parts)
+        except OSError as e:
+            self.report({'WARNING'}, f"Failed to write mesh cache for {mesh_filepath}: {e}")
+
+    def prefetch_meshes(self, context, urdf_filepath):
+        """Decode every unique mesh visual of the robot ahead of the tree walk.
+
+        Visuals missing from the geometry cache are decoded in worker
+        processes, so the tree walk only has to turn arrays into Blender data.
+        """
+        global _decoded_mesh_parts
+        geometry_cache = get_geometry_cache(context.scene)
+        jobs = {}
+        for urdf_link in _robot_model.urdf_robot_model.link_map.values():
+            for visual in getattr(urdf_link, 'visuals', None) or []:
+                mesh = getattr(visual.geometry, 'mesh', None)
+                if not mesh or not mesh.filename:
+                    continue
+                mesh_filepath = self.resolve_mesh_filepath(urdf_filepath, mesh.filename)
+                if not mesh_filepath or not os.path.exists(mesh_filepath):
+                    continue
+                visual_origin = getattr(visual, 'origin', None)
+                key = mesh_cache_key(mesh_filepath, visual_origin)
+                if key in jobs or key in _decoded_mesh_parts:
+                    continue
+                if geometry_cache is not None:
+                    parts = geometry_cache.load(geometry_cache.key(mesh_filepath, visual_origin))
+                    if parts is not None:
+                        _decoded_mesh_parts[key] = parts
+                        continue
+                jobs[key] = (mesh_filepath, visual_origin)
+        if not jobs:
+            return
+
+        start = time.perf_counter()
+        results = decode_meshes(jobs, context.scene.formamotus_decode_workers)
+        for key, parts in results.items():
+            mesh_filepath, visual_origin = jobs[key]
+            if parts and geometry_cache is not None:
+                self.store_mesh_parts(
+                    geometry_cache, geometry_cache.key(mesh_filepath, visual_origin),
+                    parts, mesh_filepath)
+            _decoded_mesh_parts[key] = parts or []
+        self.report({'INFO'}, f"Decoded {len(jobs)} meshes in {time.perf_counter() - start:.2f} s")
+
+    def import_mesh(self, mesh_filepath, link_name, color=None, visual_origin=None):
+        """Create the objects of a mesh visual.
+
+        Geometry comes from the in-session import cache, the on-disk geometry
+        cache or trimesh, in that order, and is turned into Blender meshes with
+        foreach_set. Blender's importers are only used when trimesh fails.
+        A color is applied to the new objects on either path.
+        """
+        global _mesh_import_cache
+        key = mesh_cache_key(mesh_filepath, visual_origin)
+        cached = get_cached_mesh_data(key)
+        if cached is not None:
+            mesh_obj_list = self.link_cached_mesh(cached, link_name)
+        else:
+            mesh_obj_list = self.create_mesh_objects(mesh_filepath, link_name, visual_origin)
+            if mesh_obj_list is None:
+                return None
+            _mesh_import_cache[key] = [
+                (mesh_obj.data, mesh_obj.scale.copy()) for mesh_obj in mesh_obj_list]
+
+        # Apply color only if specified
+        if color is not None:
+            for mesh_obj in mesh_obj_list:
+                self.assign_color_material(mesh_obj, color)
+        return mesh_obj_list
+
+    def create_mesh_objects(self, mesh_filepath, link_name, visual_origin=None):
+        """Create the objects of a mesh visual missing from the import cache.
+
+        Their mesh data gets the gray mesh material, which every object
+        sharing it through the import cache shows.
+        """
+        global _decoded_mesh_parts
+        key = mesh_cache_key(mesh_filepath, visual_origin)
+        # Parts decoded by prefetch_meshes; an empty list means trimesh failed.
+        parts = _decoded_mesh_parts.pop(key, None)
+        geometry_cache = get_geometry_cache(bpy.context.scene)
+        geometry_key = None
+        if geometry_cache is not None:
+            geometry_key = geometry_cache.key(mesh_filepath, visual_origin)
+            if parts is None:
+                parts = geometry_cache.load(geometry_key)
+        if parts is None:
+            try:
+                parts = decode_mesh(mesh_filepath, visual_origin)
+            except Exception as e:
+                self.report({'INFO'}, f"Using Blender importer for {mesh_filepath}: {e}")
+            if parts and geometry_key is not None:
+                self.store_mesh_parts(geometry_cache, geometry_key, parts, mesh_filepath)
+
+        if parts:
+            mesh_obj_list = self.build_mesh_objects(parts, link_name)
+        else:
+            mesh_obj_list = self.import_mesh_with_operator(
+                mesh_filepath, link_name, visual_origin, geometry_cache, geometry_key)
+            if mesh_obj_list is None:
+                return None
+
+        mesh_mat = get_emission_material("MeshMaterial", MESH_COLOR)
+        for mesh_obj in mesh_obj_list:
+            if mesh_obj.data and mesh_mat.name not in mesh_obj.data.materials:
+                mesh_obj.data.materials.append(mesh_mat)
+        return mesh_obj_list
 
     def resolve_mesh_filepath(self, urdf_filepath, mesh_filename):
         urdf_dir = os.path.dirname(urdf_filepath)
         mesh_filepath = resolve_filepath(urdf_dir, mesh_filename)
         return mesh_filepath
 
+    def build_link_hierarchy(self, context, pose_objects):
+        """Parent the robot objects to one empty per link mirroring the kinematic tree.
+
+        A joint change then only writes the local transform of its link
+        empty and Blender's depsgraph moves everything below it.
+        """
+        global _link_empties
+        global _rig_connectors
+        global _pose_writer
+        tree = _kinematic_tree
+        _link_empties = []
+        for i, link in enumerate(tree.links):
+            empty = bpy.data.objects.new(f"Link_{link.name}", None)
+            empty.empty_display_type = 'PLAIN_AXES'
+            empty.empty_display_size = 0.05
+            get_robot_collection(context.scene).objects.link(empty)
+            # Links are in depth first order, so the parent empty already exists.
+            if tree.parents[i] >= 0:
+                empty.parent = _link_empties[tree.parents[i]]
+            _link_empties.append(empty)
+        _pose_writer = ObjectTransformWriter(_link_empties)
+
+        layout = _pose_layout
+        for row, link, offset, scale in zip(
+                layout.attached_rows, layout.attached_links,
+                layout.attached_offsets, layout.attached_scales):
+            obj = pose_objects[row]
+            obj.parent = _link_empties[link]
+            set_object_transform(obj, offset, scale)
+
+        _rig_connectors = []
+        for row, start, end in zip(
+                layout.connector_rows, layout.connector_starts, layout.connector_ends):
+            thin_cylinder = pose_objects[row]
+            thin_cylinder.parent = _link_empties[start]
+            connector_joints = {
+                tree.link_joints[link] for link in tree.chain_links(start, end)
+                if tree.link_joints[link] >= 0}
+            _rig_connectors.append((connector_joints, thin_cylinder, start, end, np.eye(4)))
+        apply_pose(_joint_values)
+
+    def build_armature(self, context, pose_objects):
+        """Create an armature with one bone per movable joint and parent the objects to it.
+
+        Every bone has its head at the joint and its Y axis along the joint
+        axis, so a joint value is a single rotation or location channel of
+        its pose bone and can be keyframed like any other bone.
+        """
+        global _armature_object
+        global _joint_bones
+        global _rest_joint_values
+        global _rig_connectors
+        scene = context.scene
+        tree = _kinematic_tree
+        _rest_joint_values = tree.resolve_joint_values(np.zeros(len(tree.joint_names)))
+        rest_transforms = tree.forward_kinematics(_rest_joint_values)
+        bone_length = scene.formamotus_cylinder_height / 1000.0
+
+        armature_data = bpy.data.armatures.new("RobotArmature")
+        armature_data.display_type = 'STICK'
+        _armature_object = bpy.data.objects.new("RobotArmature", armature_data)
+        _armature_object.show_in_front = True
+        get_robot_collection(scene).objects.link(_armature_object)
+
+        # Links with a fixed joint belong to the bone of their closest movable ancestor.
+        link_bones = []
+        bone_rests = {}
+        context.view_layer.objects.active = _armature_object
+        bpy.ops.object.mode_set(mode='EDIT')
+        edit_bones = armature_data.edit_bones
+        for i, link in enumerate(tree.links):
+            j = tree.link_joints[i]
+            if i > 0 and j < 0:
+                link_bones.append(link_bones[tree.parents[i]])
+                continue
+            bone_name = link.name if j < 0 else tree.joint_names[j]
+            align = np.eye(4) if j < 0 else align_y_matrix(tree.joint_axes[j])
+            edit_bone = edit_bones.new(bone_name)
+            edit_bone.head = (0.0, 0.0, 0.0)
+            edit_bone.tail = (0.0, bone_length, 0.0)
+            edit_bone.matrix = Matrix(rest_transforms[i] @ align)
+            edit_bone.use_deform = False
+            if i > 0:
+                edit_bone.parent = edit_bones[link_bones[tree.parents[i]]]
+            # Bone names may have been made unique by Blender.
+            link_bones.append(edit_bone.name)
+            bone_rests[edit_bone.name] = rest_transforms[i] @ align
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        _joint_bones = [link_bones[link] for link in tree.joint_links]
+        for j, bone_name in enumerate(_joint_bones):
+            pose_bone = _armature_object.pose.bones[bone_name]
+            pose_bone.rotation_mode = 'XYZ'
+            prismatic = bool(tree.prismatic[j])
+            pose_bone.lock_location = (True, not prismatic, True)
+            pose_bone.lock_rotation = (True, prismatic, True)
+            pose_bone.lock_scale = (True, True, True)
+
+        # Bone children are placed relative to the bone tail.
+        to_bone_head = np.eye(4)
+        to_bone_head[1, 3] = -bone_length
+
+        def parent_to_bone(obj, bone_name):
+            obj.parent = _armature_object
+            obj.parent_type = 'BONE'
+            obj.parent_bone = bone_name
+            obj.matrix_parent_inverse = Matrix.Identity(4)
+            return to_bone_head @ np.linalg.inv(bone_rests[bone_name])
+
+        layout = _pose_layout
+        for row, link, offset, scale in zip(
+                layout.attached_rows, layout.attached_links,
+                layout.attached_offsets, layout.attached_scales):
+            obj = pose_objects[row]
+            frame = parent_to_bone(obj, link_bones[link])
+            set_object_transform(obj, frame @ rest_transforms[link] @ offset, scale)
+
+        _rig_connectors = []
+        for row, start, end in zip(
+                layout.connector_rows, layout.connector_starts, layout.connector_ends):
+            thin_cylinder = pose_objects[row]
+            frame = parent_to_bone(thin_cylinder, link_bones[start]) @ rest_transforms[start]
+            connector_joints = {
+                tree.link_joints[link] for link in tree.chain_links(start, end)
+                if tree.link_joints[link] >= 0}
+            _rig_connectors.append((connector_joints, thin_cylinder, start, end, frame))
+        apply_pose(_joint_values)
+
+    def build_instanced_skeleton(self, context, pose_objects, kinds):
+        """Draw the joint and connector cylinders as instances on the points of one object.
+
+        The rows of pose_objects without an object are the cylinders, in the
+        order of kinds. Their transforms, sizes and kinds are attributes of
+        the points, so a pose update is one foreach_set per attribute. The
+        meshes stay objects posed like with the Objects rig.
+        """
+        global _skeleton_object
+        global _pose_writer
+        scene = context.scene
+        kinds = np.asarray(kinds, dtype=np.int32)
+        mesh = create_instance_points(
+            SKELETON_OBJECT_NAME, kinds, skeleton_instance_sizes(scene, kinds))
+        _skeleton_object = bpy.data.objects.new(SKELETON_OBJECT_NAME, mesh)
+        modifier = _skeleton_object.modifiers.new("Skeleton", 'NODES')
+        modifier.node_group = create_cylinder_instancer(
+            SKELETON_OBJECT_NAME, skeleton_materials(scene), get_hull_material())
+        get_part_collection(scene, 'JOINTS').objects.link(_skeleton_object)
+
+        rows = np.arange(len(pose_objects))
+        is_skeleton = np.array([obj is None for obj in pose_objects], dtype=bool)
+        _pose_writer = SplitTransformWriter(len(pose_objects), [
+            (rows[~is_skeleton], ObjectTransformWriter([obj for obj in pose_objects if obj is not None])),
+            (rows[is_skeleton], InstanceTransformWriter(mesh)),
+        ])
+        apply_pose(_joint_values)
+
     def execute(self, context):
         global _cylinder_objects
         global _robot_model
         global _thin_cylinder_objects
         global _mesh_objects
-        global _coordinates_offset
+        global _mesh_import_cache
+        global _decoded_mesh_parts
+        global _kinematic_tree
+        global _pose_layout
+        global _pose_writer
+        global _joint_values
+        global _mesh_rows
+        global _pending_joint_values
+        global _link_empties
+        global _rig_connectors
+        global _armature_object
+        global _joint_bones
+        global _skeleton_object
+        global _joint_cylinder_links
         scene = context.scene
-        revolute_color = scene.formamotus_revolute_color
-        prismatic_color = scene.formamotus_prismatic_color
-        continuous_color = scene.formamotus_continuous_color
-        default_color = scene.formamotus_default_color
         urdf_filepath = scene.formamotus_urdf_filepath
-        use_mesh = scene.formamotus_use_mesh
+        instanced = scene.formamotus_rig_mode == 'INSTANCES'
+        # Checked before anything of the previous load is removed.
+        if instanced and not quaternion_attributes_supported():
+            self.report({'ERROR'}, "The instanced skeleton needs Blender 4.0 or newer")
+            return {'CANCELLED'}
 
+        stop_playback()
         _cylinder_objects = {}
         _thin_cylinder_objects = []
         _mesh_objects = defaultdict(list)
-        _coordinates_offset = {}
+        _mesh_import_cache = {}
+        _decoded_mesh_parts = {}
         _robot_model = None
-
-        # Clear the scene
-        bpy.ops.object.select_all(action='DESELECT')
-        bpy.ops.object.select_all(action='SELECT')
-        bpy.ops.object.delete()
+        _kinematic_tree = None
+        _pose_layout = None
+        _pose_writer = None
+        _pending_joint_values = {}
+        _link_empties = []
+        _rig_connectors = []
+        _armature_object = None
+        _joint_bones = []
+        _skeleton_object = None
+        _joint_cylinder_links = []
+
+        # Only the objects of the previous load are removed, with their orphaned data.
+        before = scene_snapshot()
+        n_objects, n_datablocks = clear_robot_collection(scene)
+        if self.clear_scene:
+            n_other_objects, n_other_datablocks = clear_other_objects(scene)
+            n_objects += n_other_objects
+            n_datablocks += n_other_datablocks
+        joint_collection = get_part_collection(scene, 'JOINTS')
+        connector_collection = get_part_collection(scene, 'CONNECTORS')
 
         bpy.context.scene.world.use_nodes = True
         bg_node = bpy.context.scene.world.node_tree.nodes["Background"]
@@ -439,112 +1468,70 @@ class RobotVisualizerOperator(bpy.types.Operator):
         # Add joint angle properties
         self.add_joint_angle_properties(context)
 
+        _kinematic_tree = KinematicTree(_robot_model)
+        _joint_values = _kinematic_tree.current_joint_values()
+        bind_joint_angle_properties()
+        _pose_layout = PoseLayout(_kinematic_tree)
+        pose_objects = []
+        mesh_rows = []
+        # Kinds of the cylinders of the instanced skeleton, which have no object.
+        skeleton_kinds = []
+
+        self.prefetch_meshes(context, urdf_filepath)
+
         links = [(_robot_model.root_link, _robot_model.root_link, _robot_model.root_link.copy_worldcoords())]
-        radius = 0.03
-        height = 0.15
+        joint_cylinder_mesh = get_joint_cylinder_mesh(scene)
+        connector_cylinder_mesh = get_connector_cylinder_mesh(scene)
+        if not connector_cylinder_mesh.materials:
+            # Use Emission shader for connectors
+            connector_cylinder_mesh.materials.append(
+                get_emission_material("ConnectorMaterial", CONNECTOR_COLOR))
 
         while links:
             link, org_parent_link, parent_coords = links.pop()
             if link.joint is not None and link.joint.type != 'fixed':
                 org_parent_coords = parent_coords.copy_worldcoords()
-                parent_link = link.copy_worldcoords()
-                parent_coords = parent_link.copy_worldcoords()
+                parent_coords = link.copy_worldcoords()
 
-                axis = link.joint.axis
-                if isinstance(axis, str):
-                    axis_dict = {'x': [1, 0, 0], 'y': [0, 1, 0], 'z': [0, 0, 1]}
-                    axis_vector = np.array(axis_dict.get(axis.lower(), [0, 0, 1]))
-                else:
-                    axis_vector = np.array(axis)
-                default_vector = np.array([0, 0, 1])
-                rotation_axis = np.cross(default_vector, axis_vector)
-
-                if np.linalg.norm(rotation_axis) > 1e-6:
-                    rotation_axis = rotation_axis / np.linalg.norm(rotation_axis)
-                    angle = np.arccos(np.dot(default_vector, axis_vector))
-                    parent_link.rotate(angle, rotation_axis)
-
-                bpy.ops.mesh.primitive_cylinder_add(radius=radius, depth=height, location=parent_link.worldpos())
-                cylinder = bpy.context.object
-                cylinder.name = f"CylinderLink_{link.joint.name}"
-                cylinder.rotation_mode = 'QUATERNION'
-                cylinder.rotation_quaternion = parent_link.copy_worldcoords().quaternion
-
-                if link.joint.type == 'revolute':
-                    random_color = revolute_color
-                elif link.joint.type == 'prismatic':
-                    random_color = prismatic_color
-                elif link.joint.type == 'continuous':
-                    random_color = continuous_color
+                if instanced:
+                    cylinder = None
+                    skeleton_kinds.append(skeleton_kind(link.joint.type))
                 else:
-                    random_color = default_color
-
-                mat = bpy.data.materials.new(name=f"Material_{link.name}")
-                mat.use_nodes = True
-                nodes = mat.node_tree.nodes
-                nodes.clear()  # Clear default nodes
-                emission = nodes.new("ShaderNodeEmission")
-                output = nodes.new("ShaderNodeOutputMaterial")
-                emission.inputs["Color"].default_value = random_color
-                emission.inputs["Strength"].default_value = 1.0
-                mat.node_tree.links.new(emission.outputs["Emission"], output.inputs["Surface"])
-                cylinder.data.materials.append(mat)
-
-                if use_mesh is True:
-                    cylinder.hide_viewport = True
-                    cylinder.hide_render = True
-                # Map the cylinder to the link
-                _cylinder_objects[link] = cylinder
-
-                start_pos = org_parent_coords.worldpos()
-                end_pos = parent_coords.worldpos()
-                direction = end_pos - start_pos
-                length = np.linalg.norm(direction)
-                thin_radius = radius * 0.3
-
+                    cylinder = bpy.data.objects.new(
+                        f"CylinderLink_{link.joint.name}", joint_cylinder_mesh)
+                    joint_collection.objects.link(cylinder)
+                    cylinder.material_slots[0].link = 'OBJECT'
+                    cylinder.material_slots[0].material = get_joint_material(scene, link.joint.type)
+                    # Map the cylinder to the link
+                    _cylinder_objects[link] = cylinder
+                _joint_cylinder_links.append(link)
+                # The cylinder is drawn along the joint axis of the link.
+                _pose_layout.add_attached(link, align_z_matrix(link.joint.axis))
+                pose_objects.append(cylinder)
+
+                length = np.linalg.norm(parent_coords.worldpos() - org_parent_coords.worldpos())
                 if length > 1e-6:
-                    mid_pos = start_pos + direction * 0.5
-                    bpy.ops.mesh.primitive_cylinder_add(radius=thin_radius, depth=length, location=mid_pos)
-                    thin_cylinder = bpy.context.object
-                    thin_cylinder.name = f"Connector_{org_parent_link.name}_to_{link.name}"
-
-                    z_axis = np.array([0, 0, 1])
-                    rot_axis = np.cross(z_axis, direction)
-                    if np.linalg.norm(rot_axis) > 1e-6:
-                        rot_axis = rot_axis / np.linalg.norm(rot_axis)
-                        angle = np.arccos(np.dot(z_axis, direction) / length)
-                        thin_cylinder.rotation_mode = 'AXIS_ANGLE'
-                        thin_cylinder.rotation_axis_angle = [angle, rot_axis[0], rot_axis[1], rot_axis[2]]
+                    if instanced:
+                        thin_cylinder = None
+                        skeleton_kinds.append(skeleton_kind())
                     else:
-                        thin_cylinder.rotation_mode = 'QUATERNION'
-                        thin_cylinder.rotation_quaternion = [1, 0, 0, 0]
-
-                    if use_mesh is True:
-                        thin_cylinder.hide_viewport = True
-                        thin_cylinder.hide_render = True
-                    # Use Emission shader for connectors
-                    thin_mat = bpy.data.materials.new(name=f"ConnectorMaterial_{org_parent_link.name}_to_{link.name}")
-                    thin_mat.use_nodes = True
-                    thin_nodes = thin_mat.node_tree.nodes
-                    thin_nodes.clear()
-                    thin_emission = thin_nodes.new("ShaderNodeEmission")
-                    thin_output = thin_nodes.new("ShaderNodeOutputMaterial")
-                    thin_emission.inputs["Color"].default_value = (0, 0, 0, 1)  # Black for connectors
-                    thin_emission.inputs["Strength"].default_value = 1.0
-                    thin_mat.node_tree.links.new(thin_emission.outputs["Emission"], thin_output.inputs["Surface"])
-                    thin_cylinder.data.materials.append(thin_mat)
-                    _thin_cylinder_objects.append((
-                        org_parent_link,
-                        link,
-                        thin_cylinder,
-                        length,
-                    ))
+                        thin_cylinder = bpy.data.objects.new(
+                            f"Connector_{org_parent_link.name}_to_{link.name}",
+                            connector_cylinder_mesh)
+                        connector_collection.objects.link(thin_cylinder)
+                        _thin_cylinder_objects.append((
+                            org_parent_link,
+                            link,
+                            thin_cylinder,
+                        ))
+                    _pose_layout.add_connector(org_parent_link, link)
+                    pose_objects.append(thin_cylinder)
                 org_parent_link = link
 
             # Load mesh if enabled
             urdf_link = _robot_model.urdf_robot_model.link_map[link.name]
             if hasattr(urdf_link, 'visuals') and urdf_link.visuals:
-                for i_visual, visual in enumerate(urdf_link.visuals):
+                for visual in urdf_link.visuals:
                     if hasattr(visual, 'origin'):
                         visual_origin = visual.origin
                     else:
@@ -556,128 +1543,270 @@ class RobotVisualizerOperator(bpy.types.Operator):
                             color = None
                             mesh_obj_list = self.import_mesh(mesh_filepath, link.name, color=color,
                                                              visual_origin=visual_origin)
-                            for i_mesh, mesh_obj in enumerate(mesh_obj_list):
-                                # Set position and rotation
-                                link_coords = link.copy_worldcoords()
-                                mesh_obj.location = link_coords.worldpos()
-                                mesh_obj.rotation_mode = 'QUATERNION'
-                                mesh_obj.rotation_quaternion = link_coords.quaternion
-
-                                # Assign material (simple gray emission for now)
-                                name = f"MeshMaterial_{link.name}_{i_visual!s}_{i_mesh!s}"
-                                mesh_mat = bpy.data.materials.new(name=name)
-                                mesh_mat.use_nodes = True
-                                mesh_nodes = mesh_mat.node_tree.nodes
-                                mesh_nodes.clear()
-                                mesh_emission = mesh_nodes.new("ShaderNodeEmission")
-                                mesh_output = mesh_nodes.new("ShaderNodeOutputMaterial")
-                                mesh_emission.inputs["Color"].default_value = (0.5, 0.5, 0.5, 1.0)  # Gray
-                                mesh_emission.inputs["Strength"].default_value = 1.0
-                                mesh_mat.node_tree.links.new(mesh_emission.outputs["Emission"], mesh_output.inputs["Surface"])
-                                if mesh_obj.data:
-                                    mesh_obj.data.materials.append(mesh_mat)
-                                if use_mesh is False:
-                                    mesh_obj.hide_viewport = True
-                                    mesh_obj.hide_render = True
+                            for mesh_obj in mesh_obj_list:
                                 _mesh_objects[link].append(mesh_obj)
+                                mesh_rows.append(_pose_layout.add_attached(link, scale=mesh_obj.scale))
+                                pose_objects.append(mesh_obj)
                         else:
                             self.report({'WARNING'}, f"Mesh file not found: {mesh_filepath}")
             for child_link in link.child_links:
                 links.append((child_link, org_parent_link, parent_coords.copy_worldcoords()))
 
-        self.report({'INFO'}, "Robot visualization completed!")
+        # Every object is placed by the same batched pass that updates the pose.
+        _pose_layout.finalize()
+        _mesh_rows = np.zeros(len(_pose_layout), dtype=bool)
+        _mesh_rows[mesh_rows] = True
+        if scene.formamotus_rig_mode == 'HIERARCHY':
+            self.build_link_hierarchy(context, pose_objects)
+        elif scene.formamotus_rig_mode == 'ARMATURE':
+            self.build_armature(context, pose_objects)
+        elif instanced:
+            self.build_instanced_skeleton(context, pose_objects, skeleton_kinds)
+        else:
+            _pose_writer = ObjectTransformWriter(pose_objects)
+            apply_pose(_joint_values)
+        # Every part collection is included while building, so the importers can select.
+        show_robot_parts(scene)
+
+        report = format_scene_report(before, scene_snapshot())
+        removed = f"Removed {n_objects} objects and {n_datablocks} datablocks of the last load"
+        print(f"{removed}; {report}")
+        self.report({'INFO'}, f"Robot visualization completed! {report}")
         return {'FINISHED'}
 
 
+def skeleton_objects():
+    """Return the joint and connector cylinders drawn without meshes."""
+    return [*_cylinder_objects.values(), *(cylinder for _, _, cylinder in _thin_cylinder_objects)]
+
+
+def render_outline_method(scene):
+    """Return the outline method of the next render, 'NONE' when rendering meshes.
+
+    Line Art falls back to the inverted hull where it is not supported, for
+    scenes saved with it by an older Blender.
+    """
+    if scene.formamotus_use_mesh:
+        return 'NONE'
+    method = render_preset_outline_method(
+        scene.formamotus_render_preset, scene.formamotus_outline_method)
+    if method == 'LINE_ART' and not line_art_supported():
+        return 'INVERTED_HULL'
+    return method
+
+
+def outline_fallback_warning(scene):
+    """Return a warning when the next render cannot draw the chosen outlines, else None."""
+    if scene.formamotus_use_mesh or line_art_supported():
+        return None
+    method = render_preset_outline_method(
+        scene.formamotus_render_preset, scene.formamotus_outline_method)
+    return LINE_ART_FALLBACK_WARNING if method == 'LINE_ART' else None
+
+
+def prepare_render(context):
+    """Apply the render preset, the skeleton outlines and a transparent background."""
+    scene = context.scene
+    apply_render_preset(scene, scene.formamotus_render_preset)
+    method = render_outline_method(scene)
+    if method == 'FREESTYLE':
+        enable_freestyle(line_thickness=OUTLINE_THICKNESS, line_color=(0, 0, 0))
+    else:
+        scene.render.use_freestyle = False
+    if method == 'LINE_ART':
+        enable_line_art(scene, line_color=(0, 0, 0), collection=get_robot_collection(scene))
+    else:
+        disable_line_art()
+    if method == 'INVERTED_HULL':
+        enable_inverted_hull(scene, skeleton_objects(), line_color=(0, 0, 0))
+    else:
+        disable_inverted_hull(scene, skeleton_objects())
+        # The instanced skeleton grows its hulls in its node tree, see fit_outlines.
+        if _skeleton_object is not None and set_instancer_input(
+                _skeleton_object, OUTLINE_WIDTH_INPUT, 0.0) > 0.0:
+            scene.display.shading.show_backface_culling = False
+    scene.render.film_transparent = True
+
+
+def fit_outlines(scene, center):
+    """Make the outlines drawn with a width in meters OUTLINE_THICKNESS pixels wide at center."""
+    method = render_outline_method(scene)
+    if method not in ('LINE_ART', 'INVERTED_HULL'):
+        return
+    width = OUTLINE_THICKNESS * meters_per_pixel(scene, center)
+    if method == 'LINE_ART':
+        set_line_art_width(width)
+    else:
+        set_inverted_hull_width(skeleton_objects(), width)
+        if _skeleton_object is not None:
+            set_instancer_input(_skeleton_object, OUTLINE_WIDTH_INPUT, width)
+
+
+def setup_camera_and_light(context, center, size):
+    """Set up camera and light to view the robot from right-front, 45 degrees above.
+
+    The camera and the light are created by the first render and reused by
+    the following ones, which only move them. They belong to the robot
+    collection, so the next load removes them.
+    """
+    scene = context.scene
+    collection = get_robot_collection(scene)
+    camera = bpy.data.objects.get(RENDER_CAMERA_NAME)
+    if camera is None or camera.type != 'CAMERA':
+        camera = bpy.data.objects.new(RENDER_CAMERA_NAME, bpy.data.cameras.new(RENDER_CAMERA_NAME))
+    if collection.objects.get(camera.name) is None:
+        collection.objects.link(camera)
+
+    # Look from the camera position at the center
+    camera_pos = np.asarray(center) + size * 2
+    camera.matrix_world = Matrix(look_at_matrix(camera_pos, center))
+    camera.data.lens = 35
+    camera.data.clip_end = size * 4
+    scene.camera = camera
+
+    light = bpy.data.objects.get(RENDER_LIGHT_NAME)
+    if light is None or light.type != 'LIGHT':
+        light = bpy.data.objects.new(
+            RENDER_LIGHT_NAME, bpy.data.lights.new(RENDER_LIGHT_NAME, type='POINT'))
+    if collection.objects.get(light.name) is None:
+        collection.objects.link(light)
+    light.location = camera_pos + (0.0, 0.0, 2.0)
+    light.data.energy = 1000
+    light.data.shadow_soft_size = 0
+    light.data.use_shadow = False
+
+
+def timed_render(scene, write_still=False):
+    """Render scene and compare the time taken with the estimate of its preset.
+
+    Returns
+    -------
+    dict
+        ``preset``, ``expected`` (None without a preset) and ``measured``
+        render time in seconds, also returned by get_render_timing.
+    """
+    global _render_timing
+    preset = scene.formamotus_render_preset
+    expected = expected_render_time(scene, preset)
+    start_time = time.perf_counter()
+    bpy.ops.render.render(write_still=write_still)
+    measured = time.perf_counter() - start_time
+    record_render_time(scene, preset, measured)
+    _render_timing = {"preset": preset, "expected": expected, "measured": measured}
+    return _render_timing
+
+
+def place_render_camera(scene, location, target, lens, center, size):
+    """Move the render camera to location, looking at target."""
+    camera = scene.camera
+    camera.matrix_world = Matrix(look_at_matrix(location, target))
+    camera.data.lens = lens
+    distance = np.linalg.norm(np.asarray(location) - center)
+    camera.data.clip_end = max(camera.data.clip_end, distance + size * 2)
+
+
+def render_views(context, views, filepaths=None, linear=False):
+    """Render the current pose from several cameras back to back.
+
+    Only the camera moves between the views and the render data of Cycles
+    is kept, so the scene is synchronized and its BVH built once for all
+    views rather than once per view. The persistent data setting of the
+    scene is restored afterwards.
+
+    Parameters
+    ----------
+    context : bpy.types.Context
+    views : list of tuple
+        ``(location, target)`` or ``(location, target, lens)`` of every view.
+    filepaths : list of str, optional
+        PNG file of every view. Without them the views are returned.
+    linear : bool
+        Return scene linear float pixels, see read_render_result.
+
+    Returns
+    -------
+    numpy.ndarray or None
+        (views, height, width, 4) pixels when no filepaths are given.
+    """
+    scene = context.scene
+    prepare_render(context)
+    center, size = robot_bounds()
+    setup_camera_and_light(context, center, size)
+    use_persistent_data = scene.render.use_persistent_data
+    scene.render.use_persistent_data = True
+    images = []
+    try:
+        for i, (location, target, *lens) in enumerate(views):
+            place_render_camera(scene, location, target, lens[0] if lens else 35.0, center, size)
+            fit_outlines(scene, center)
+            if filepaths is None:
+                timed_render(scene)
+                images.append(read_render_result(scene, linear=linear))
+            else:
+                scene.render.image_settings.file_format = 'PNG'
+                scene.render.filepath = filepaths[i]
+                timed_render(scene, write_still=True)
+    finally:
+        scene.render.use_persistent_data = use_persistent_data
+    return None if filepaths is not None else np.stack(images)
+
+
 class RobotRenderOperator(bpy.types.Operator):
     bl_idname = "robot_viz.render_robot"
     bl_label = "Render Robot Image"
     bl_options: ClassVar[set[str]] = {'REGISTER', 'UNDO'}
 
-    def setup_camera_and_light(self, context, center, size):
-        """Set up camera and light to view the robot from right-front, 45 degrees above."""
-
-        # Remove existing camera if it exists
-        if context.scene.camera:
-            bpy.data.objects.remove(context.scene.camera, do_unlink=True)
-
-        # Camera settings
-        distance = size * 2.0  # Distance to fit the robot comfortably
-        angle_rad = np.deg2rad(45)
-        camera_x = center[0] + distance * np.cos(angle_rad)  # Right-front in XY plane
-        camera_y = center[1] + distance * np.cos(angle_rad)
-        camera_z = center[2] + distance * np.sin(angle_rad)  # 45 degrees up
-
-        # Create camera manually instead of using bpy.ops
-        camera_data = bpy.data.cameras.new(name="RobotCamera")
-        camera = bpy.data.objects.new("RobotCamera", camera_data)
-        camera.location = (camera_x, camera_y, camera_z)
-        camera.data.lens = 35
-        camera.data.clip_end = distance * 2
-        context.scene.collection.objects.link(camera)  # Link to scene
-        context.scene.camera = camera  # Set as active camera
-
-        # Camera position and target center
-        camera_x, camera_y, camera_z = center[0] + size * 2, center[1] + size * 2, center[2] + size * 2
-        camera_pos = Vector((camera_x, camera_y, camera_z))
-        center = Vector(center)
-
-        # Direction from camera to center
-        direction = center - camera_pos
-        if direction.length > 1e-6:
-            direction.normalize()
-            up = Vector((0, 0, 1))
-
-            z_axis = -direction
-            x_axis = up.cross(z_axis).normalized()
-            y_axis = z_axis.cross(x_axis).normalized()
-
-            mat_rot = Matrix((
-                (x_axis.x, y_axis.x, z_axis.x, 0),
-                (x_axis.y, y_axis.y, z_axis.y, 0),
-                (x_axis.z, y_axis.z, z_axis.z, 0),
-                (0,        0,        0,        1)
-            ))
-
-            camera = context.scene.camera
-            camera.matrix_world = mat_rot
-            camera.location = camera_pos
-
-        # Light settings
-        bpy.ops.object.light_add(type='POINT', location=(camera_x, camera_y, camera_z + 2))
-        light = bpy.context.object
-        light.data.energy = 1000
-        light.data.shadow_soft_size = 0
-        light.data.use_shadow = False
-
-        # Set the camera as the active camera
-        context.scene.camera = camera
+    use_custom_camera: bpy.props.BoolProperty(
+        name="Custom Camera",
+        description="Render from camera_location instead of framing the robot automatically",
+        default=False,
+    )
+    camera_location: bpy.props.FloatVectorProperty(
+        name="Camera Location", size=3, default=(2.0, 2.0, 2.0))
+    camera_target: bpy.props.FloatVectorProperty(
+        name="Camera Target", size=3, default=(0.0, 0.0, 0.0))
+    camera_lens: bpy.props.FloatProperty(
+        name="Camera Lens (mm)", default=35.0, min=1.0)
+    output: bpy.props.EnumProperty(
+        name="Output",
+        items=[
+            ('FILE', "File", "Save the image to the render file path"),
+            ('PIXELS', "Pixels", "Keep the image as a NumPy array, see get_render_pixels"),
+        ],
+        default='FILE',
+    )
+    linear_pixels: bpy.props.BoolProperty(
+        name="Linear Pixels",
+        description="Keep scene linear float pixels instead of 8 bit display pixels",
+        default=False,
+    )
 
     def render_scene(self, context, render_filepath):
         """Render the scene and save the output to the specified filepath."""
-        global _cylinder_objects
-        global _mesh_objects
-        # Set up Freestyle and background
-        use_mesh = context.scene.formamotus_use_mesh
-        if use_mesh is False:
-            enable_freestyle(line_thickness=3.0, line_color=(0, 0, 0))
+        global _render_pixels
+        warning = outline_fallback_warning(context.scene)
+        if warning is not None:
+            self.report({'WARNING'}, warning)
+        prepare_render(context)
+        center, size = robot_bounds()
+        setup_camera_and_light(context, center, size)
+        if self.use_custom_camera:
+            place_render_camera(
+                context.scene, self.camera_location, self.camera_target, self.camera_lens,
+                center, size)
+        fit_outlines(context.scene, center)
+        if self.output == 'PIXELS':
+            timing = timed_render(context.scene)
+            _render_pixels = read_render_result(context.scene, linear=self.linear_pixels)
         else:
-            bpy.context.scene.render.use_freestyle = False
-        # Calculate the bounding box of the robot
-        min_coords = np.array([float('inf')] * 3)
-        max_coords = np.array([-float('inf')] * 3)
-        for link in _cylinder_objects.keys():
-            pos = link.worldpos()
-            min_coords = np.minimum(min_coords, pos)
-            max_coords = np.maximum(max_coords, pos)
-        center = (min_coords + max_coords) / 2
-        size = np.max(max_coords - min_coords)
-        self.setup_camera_and_light(context, center, size)
-        bpy.context.scene.render.film_transparent = True
-        bpy.context.scene.render.image_settings.file_format = 'PNG'
-        bpy.context.scene.render.filepath = render_filepath
-        bpy.ops.render.render(write_still=True)
-        self.report({'INFO'}, "Rendering completed!")
+            bpy.context.scene.render.image_settings.file_format = 'PNG'
+            bpy.context.scene.render.filepath = render_filepath
+            timing = timed_render(context.scene, write_still=True)
+        message = f"Rendering completed in {timing['measured']:.2f}s"
+        if timing["expected"] is not None:
+            preset = timing["preset"].lower()
+            message += f" (expected {timing['expected']:.2f}s with the {preset} preset)"
+        self.report({'INFO'}, message)
 
     def execute(self, context):
         scene = context.scene
@@ -686,42 +1815,244 @@ class RobotRenderOperator(bpy.types.Operator):
         self.render_scene(context, render_filepath)
         return {'FINISHED'}
 
+
+class RobotRenderViewsOperator(bpy.types.Operator):
+    bl_idname = "robot_viz.render_views"
+    bl_label = "Render Robot Views"
+    bl_description = "Render the robot from a ring of cameras or from preset views"
+    bl_options: ClassVar[set[str]] = {'REGISTER', 'UNDO'}
+
+    view_mode: bpy.props.EnumProperty(
+        name="Views",
+        items=[
+            ('ORBIT', "Orbit", "Cameras evenly spaced on a ring around the robot"),
+            ('PRESETS', "Presets", "Front, side, top and isometric views"),
+        ],
+        default='ORBIT',
+    )
+    orbit_count: bpy.props.IntProperty(name="Orbit Views", default=8, min=1, max=360)
+    orbit_elevation: bpy.props.FloatProperty(
+        name="Orbit Elevation (deg)", default=30.0, min=-90.0, max=90.0)
+    presets: bpy.props.EnumProperty(
+        name="Preset Views",
+        items=[(name, name.title(), f"View from the {name.lower()}")
+               for name in PRESET_VIEW_DIRECTIONS],
+        default={'FRONT', 'LEFT', 'TOP', 'ISO'},
+        options={'ENUM_FLAG'},
+    )
+    view_distance: bpy.props.FloatProperty(
+        name="Distance",
+        description="Camera distance to the robot center as a multiple of the robot size",
+        default=3.5, min=0.1,
+    )
+    output: bpy.props.EnumProperty(
+        name="Output",
+        items=[
+            ('FILE', "Files", "Save every view next to the render file path"),
+            ('PIXELS', "Pixels", "Keep the views as one NumPy array, see get_render_pixels"),
+        ],
+        default='FILE',
+    )
+    linear_pixels: bpy.props.BoolProperty(
+        name="Linear Pixels",
+        description="Keep scene linear float pixels instead of 8 bit display pixels",
+        default=False,
+    )
+
+    def view_locations(self, center, size):
+        """Return the labels and the camera locations of the views."""
+        distance = self.view_distance * size
+        if self.view_mode == 'PRESETS':
+            names = [name for name in PRESET_VIEW_DIRECTIONS if name in self.presets]
+            return [name.lower() for name in names], preset_view_locations(center, distance, names)
+        labels = [f"view{i:03d}" for i in range(self.orbit_count)]
+        return labels, orbit_view_locations(
+            center, distance, self.orbit_count, np.radians(self.orbit_elevation))
+
+    def execute(self, context):
+        global _render_pixels
+        if not pose_ready():
+            self.report({'ERROR'}, "Visualize a robot before rendering it")
+            return {'CANCELLED'}
+        center, size = robot_bounds()
+        labels, locations = self.view_locations(center, size)
+        if not labels:
+            self.report({'ERROR'}, "Select at least one view")
+            return {'CANCELLED'}
+        views = [(location, center) for location in locations]
+        warning = outline_fallback_warning(context.scene)
+        if warning is not None:
+            self.report({'WARNING'}, warning)
+        start_time = time.time()
+        if self.output == 'PIXELS':
+            _render_pixels = render_views(context, views, linear=self.linear_pixels)
+        else:
+            root, extension = os.path.splitext(
+                bpy.path.abspath(context.scene.formamotus_render_filepath))
+            filepaths = [f"{root}_{label}{extension or '.png'}" for label in labels]
+            render_views(context, views, filepaths)
+        elapsed = time.time() - start_time
+        self.report({'INFO'}, f"Rendered {len(views)} views in {elapsed:.2f}s")
+        return {'FINISHED'}
+
+class RobotImportTrajectoryOperator(bpy.types.Operator):
+    bl_idname = "robot_viz.import_trajectory"
+    bl_label = "Import Joint Trajectory"
+    bl_description = "Bake a recorded joint trajectory into keyframes of the visualized robot"
+    bl_options: ClassVar[set[str]] = {'REGISTER', 'UNDO'}
+
+    def execute(self, context):
+        scene = context.scene
+        if not pose_ready():
+            self.report({'ERROR'}, "Visualize a robot before importing a trajectory")
+            return {'CANCELLED'}
+        if skeleton_instanced():
+            self.report({'ERROR'}, "The instanced skeleton cannot be keyframed; play the trajectory instead")
+            return {'CANCELLED'}
+        filepath = bpy.path.abspath(scene.formamotus_trajectory_filepath)
+        start_time = time.time()
+        try:
+            joint_names, times, positions = load_trajectory(filepath)
+            fps = scene.render.fps / scene.render.fps_base
+            frames = trajectory_frames(
+                len(positions), times if scene.formamotus_trajectory_use_timestamps else None,
+                fps, scene.frame_start)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Failed to load trajectory: {e}")
+            return {'CANCELLED'}
+        if len(positions) == 0:
+            self.report({'ERROR'}, "The trajectory has no samples")
+            return {'CANCELLED'}
+        joint_values, unknown_names = trajectory_joint_values(
+            _kinematic_tree, joint_names, positions, _joint_values)
+        if unknown_names:
+            self.report({'WARNING'}, f"Ignored unknown joints: {', '.join(unknown_names)}")
+
+        bake_joint_trajectory(joint_values, frames)
+        scene.frame_end = int(np.ceil(frames[-1]))
+        scene.frame_set(scene.frame_start)
+        self.report(
+            {'INFO'},
+            f"Baked {len(frames)} trajectory samples in {time.time() - start_time:.2f} s")
+        return {'FINISHED'}
+
+
+class RobotStartPlaybackOperator(bpy.types.Operator):
+    bl_idname = "robot_viz.start_playback"
+    bl_label = "Play Joint Trajectory"
+    bl_description = "Pose the robot from a memory-mapped joint trajectory on every frame change"
+
+    def execute(self, context):
+        global _playback_times
+        global _playback_positions
+        global _playback_columns
+        global _playback_joints
+        global _playback_update_duration
+        scene = context.scene
+        if not pose_ready():
+            self.report({'ERROR'}, "Visualize a robot before playing a trajectory")
+            return {'CANCELLED'}
+        stop_playback()
+        filepath = bpy.path.abspath(scene.formamotus_trajectory_filepath)
+        try:
+            joint_names, times, positions = open_trajectory(filepath)
+        except (OSError, ValueError) as e:
+            self.report({'ERROR'}, f"Failed to load trajectory: {e}")
+            return {'CANCELLED'}
+        if len(positions) == 0:
+            self.report({'ERROR'}, "The trajectory has no samples")
+            return {'CANCELLED'}
+
+        columns = []
+        joints = []
+        unknown_names = []
+        for column, name in enumerate(joint_names):
+            if name in _kinematic_tree.joint_position:
+                columns.append(column)
+                joints.append(_kinematic_tree.joint_position[name])
+            else:
+                unknown_names.append(name)
+        if unknown_names:
+            self.report({'WARNING'}, f"Ignored unknown joints: {', '.join(unknown_names)}")
+        _playback_times = times
+        _playback_positions = positions
+        _playback_columns = np.array(columns, dtype=np.int64)
+        _playback_joints = np.array(joints, dtype=np.int64)
+        _playback_update_duration = 0.0
+
+        fps = scene.render.fps / scene.render.fps_base
+        if times is not None and scene.formamotus_trajectory_use_timestamps:
+            last_frame = scene.frame_start + (times[-1] - times[0]) * fps
+        else:
+            last_frame = scene.frame_start + len(positions) - 1
+        scene.frame_end = int(np.ceil(last_frame))
+        if scene.formamotus_playback_frame_skip:
+            scene.sync_mode = 'FRAME_DROP'
+        bpy.app.handlers.frame_change_pre.append(playback_frame_change)
+        playback_frame_change(scene)
+        bpy.context.view_layer.update()
+        self.report({'INFO'}, f"Playing {len(positions)} trajectory samples")
+        return {'FINISHED'}
+
+
+class RobotStopPlaybackOperator(bpy.types.Operator):
+    bl_idname = "robot_viz.stop_playback"
+    bl_label = "Stop Joint Trajectory"
+    bl_description = "Stop posing the robot from the playback trajectory"
+
+    def execute(self, context):
+        stop_playback()
+        return {'FINISHED'}
+
+
+class RobotClearMeshCacheOperator(bpy.types.Operator):
+    bl_idname = "robot_viz.clear_mesh_cache"
+    bl_label = "Clear Mesh Cache"
+    bl_description = "Remove all converted mesh geometry from the on-disk cache"
+
+    def execute(self, context):
+        scene = context.scene
+        cache_dir = bpy.path.abspath(scene.formamotus_mesh_cache_dir) or default_cache_dir()
+        freed = GeometryCache(cache_dir).clear()
+        self.report({'INFO'}, f"Cleared mesh cache ({freed / (1024 * 1024):.1f} MB)")
+        return {'FINISHED'}
+
+def show_robot_parts(scene):
+    """Show the meshes or the joint and connector cylinders by formamotus_use_mesh.
+
+    Every part has its own child collection of the robot collection, so
+    this only excludes or includes three layer collections.
+    """
+    use_mesh = scene.formamotus_use_mesh
+    exclude_part_collections(
+        scene, {'JOINTS': use_mesh, 'CONNECTORS': use_mesh, 'MESHES': not use_mesh})
+
+
 def update_visibility(self, context):
-    global _cylinder_objects
-    global _mesh_objects
-    global _thin_cylinder_objects
     scene = context.scene
-    use_mesh = scene.formamotus_use_mesh
-    if use_mesh:
-        for cylinder in _cylinder_objects.values():
-            cylinder.hide_viewport = True
-            cylinder.hide_render = True
-        for _, _, cylinder, _ in _thin_cylinder_objects:
-            cylinder.hide_viewport = True
-            cylinder.hide_render = True
-        for _, mesh_objs in _mesh_objects.items():
-            for mesh_obj in mesh_objs:
-                mesh_obj.hide_viewport = False
-                mesh_obj.hide_render = False
-    else:
-        for cylinder in _cylinder_objects.values():
-            cylinder.hide_viewport = False
-            cylinder.hide_render = False
-        for _, _, cylinder, _ in _thin_cylinder_objects:
-            cylinder.hide_viewport = False
-            cylinder.hide_render = False
-        for _, mesh_objs in _mesh_objects.items():
-            for mesh_obj in mesh_objs:
-                mesh_obj.hide_viewport = True
-                mesh_obj.hide_render = True
+    sync_hidden_pose_objects()
+    show_robot_parts(scene)
     bpy.context.view_layer.update()
 
 def register():
     register_custom_properties()
     bpy.utils.register_class(RobotVisualizerOperator)
     bpy.utils.register_class(RobotRenderOperator)
+    bpy.utils.register_class(RobotRenderViewsOperator)
+    bpy.utils.register_class(RobotImportTrajectoryOperator)
+    bpy.utils.register_class(RobotStartPlaybackOperator)
+    bpy.utils.register_class(RobotStopPlaybackOperator)
+    bpy.utils.register_class(RobotClearMeshCacheOperator)
 
 def unregister():
+    if bpy.app.timers.is_registered(flush_pose_update):
+        bpy.app.timers.unregister(flush_pose_update)
+    stop_playback()
     unregister_custom_properties()
     bpy.utils.unregister_class(RobotVisualizerOperator)
     bpy.utils.unregister_class(RobotRenderOperator)
+    bpy.utils.unregister_class(RobotRenderViewsOperator)
+    bpy.utils.unregister_class(RobotImportTrajectoryOperator)
+    bpy.utils.unregister_class(RobotStartPlaybackOperator)
+    bpy.utils.unregister_class(RobotStopPlaybackOperator)
+    bpy.utils.unregister_class(RobotClearMeshCacheOperator)
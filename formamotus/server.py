@@ -0,0 +1,260 @@
+"""Local render server keeping the robot loaded between requests.
+
+Run it in a background Blender with the add-on enabled::
+
+    blender -b -P bin/render_server.py -- --port 8765
+
+and ask for images over HTTP on localhost::
+
+    curl -X POST localhost:8765/render -o robot.png \\
+        -d '{"urdf": "/path/robot.urdf", "pose": {"l_arm0_joint": 0.5}}'
+
+``POST /render`` takes one job as described in :mod:`formamotus.batch`.
+Without an ``output`` path the PNG bytes are returned; the image never
+touches the disk and is encoded on the HTTP thread while the next request
+renders. With an ``output`` path the image is written there and the job
+result is returned as JSON. ``GET /status``
+returns the loaded robot and the number of queued requests, and
+``POST /shutdown`` stops the server.
+
+HTTP requests are accepted on worker threads, but bpy is only used from the
+main thread: requests are queued and rendered one at a time by
+:meth:`RenderServer.process_pending`. The robot of the previous request
+stays loaded, so a request for the same URDF only pays for posing and
+rendering. The server only listens on localhost and reads and writes any
+path it is given; do not expose it to other machines.
+"""
+
+import argparse
+import http.server
+import json
+import os
+import queue
+import sys
+import threading
+
+import bpy
+
+from formamotus import robot_visualizer
+from formamotus.batch import RenderSession
+from formamotus.utils.image_writer import encode_png
+
+_render_server = None
+
+
+class RenderRequest:
+    """A job waiting in the queue of a RenderServer for the main thread."""
+
+    def __init__(self, job):
+        self.job = job
+        self.result = None
+        self.pixels = None
+        self.done = threading.Event()
+
+
+class RenderRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/status":
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        self.send_json(200, self.server.render_server.status())
+
+    def do_POST(self):
+        render_server = self.server.render_server
+        if self.path == "/shutdown":
+            self.send_json(200, {"status": "stopping"})
+            render_server.stop()
+            return
+        if self.path != "/render":
+            self.send_json(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(job, dict) or not job.get("urdf"):
+                raise ValueError("The job has no 'urdf'")
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+            return
+
+        request = render_server.submit(job)
+        if not request.done.wait(render_server.timeout):
+            self.send_json(504, {"error": "Timed out waiting for the render"})
+            return
+        result = request.result
+        if result["status"] != "ok":
+            self.send_json(500, result)
+        elif request.pixels is not None:
+            png = encode_png(request.pixels)
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(png)))
+            self.send_header("X-Render-Time", f"{result['total_time']:.4f}")
+            self.end_headers()
+            self.wfile.write(png)
+        else:
+            self.send_json(200, result)
+
+    def log_message(self, format, *args):
+        if self.server.render_server.verbose:
+            super().log_message(format, *args)
+
+
+class RenderServer:
+    """HTTP render server whose requests are rendered on the main thread.
+
+    Parameters
+    ----------
+    host : str
+        Address to listen on.
+    port : int
+        Port to listen on; 0 picks a free one, see ``port``.
+    timeout : float
+        Seconds an HTTP request waits for its render before giving up.
+    verbose : bool
+        Log every HTTP request.
+    """
+
+    def __init__(self, host="127.0.0.1", port=8765, timeout=600.0, verbose=False):
+        self.timeout = timeout
+        self.verbose = verbose
+        self.requests = queue.Queue()
+        self.session = RenderSession()
+        self.httpd = http.server.ThreadingHTTPServer((host, port), RenderRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.render_server = self
+        self.port = self.httpd.server_address[1]
+        self.running = False
+        self._thread = None
+
+    def start(self):
+        """Accept HTTP requests on a background thread."""
+        self.running = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop accepting requests; queued requests are still rendered."""
+        if not self.running:
+            return
+        self.running = False
+        # shutdown() waits for serve_forever, which may be running this call.
+        threading.Thread(target=self.httpd.shutdown, daemon=True).start()
+        self.requests.put(None)
+
+    def submit(self, job):
+        """Queue a job for the main thread and return its RenderRequest."""
+        request = RenderRequest(job)
+        self.requests.put(request)
+        return request
+
+    def status(self):
+        robot_model = robot_visualizer.get_robot_model()
+        loaded_key = self.session.loaded_key
+        return {
+            "running": self.running,
+            "robot": str(robot_model) if robot_model is not None else None,
+            "urdf": loaded_key[0] if loaded_key else None,
+            "queued": self.requests.qsize(),
+        }
+
+    def render(self, request):
+        """Render a request on the main thread and wake up its HTTP thread."""
+        job = dict(request.job)
+        job["urdf"] = os.path.abspath(os.path.expanduser(job["urdf"]))
+        if job.get("output"):
+            job["output"] = os.path.abspath(os.path.expanduser(job["output"]))
+        else:
+            job.pop("output", None)
+        self.session.pixels = None
+        try:
+            request.result = self.session.render(job)
+            request.pixels = self.session.pixels
+        finally:
+            request.done.set()
+
+    def process_pending(self, block=False, timeout=None):
+        """Render the queued requests and return how many were rendered.
+
+        Must be called from the main thread. With block, wait up to timeout
+        seconds for a first request.
+        """
+        count = 0
+        while True:
+            try:
+                request = self.requests.get(block=block and count == 0, timeout=timeout)
+            except queue.Empty:
+                return count
+            if request is None:
+                return count
+            self.render(request)
+            count += 1
+
+    def serve_forever(self):
+        """Accept and render requests until stop is called, like from /shutdown."""
+        self.start()
+        print(f"FormaMotus render server listening on port {self.port}")
+        while self.running:
+            self.process_pending(block=True, timeout=0.5)
+        self.process_pending()
+        self.httpd.server_close()
+
+
+def process_render_server_requests():
+    """bpy.app.timers callback rendering the requests of the interactive server."""
+    if _render_server is None or not _render_server.running:
+        return None
+    _render_server.process_pending()
+    return 0.05
+
+
+def start_render_server(port=8765):
+    """Serve render requests from an interactive Blender session.
+
+    Requests are rendered by a timer between redraws, so the UI stays
+    usable while the server runs.
+    """
+    global _render_server
+    stop_render_server()
+    _render_server = RenderServer(port=port)
+    _render_server.start()
+    bpy.app.timers.register(process_render_server_requests, persistent=True)
+    return _render_server
+
+
+def stop_render_server():
+    global _render_server
+    if bpy.app.timers.is_registered(process_render_server_requests):
+        bpy.app.timers.unregister(process_render_server_requests)
+    if _render_server is not None:
+        _render_server.stop()
+        _render_server.httpd.server_close()
+        _render_server = None
+
+
+def main(argv=None):
+    if argv is None:
+        # Blender passes the arguments after "--" on to the script.
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser(
+        prog="render_server", description="Serve FormaMotus renders over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--timeout", type=float, default=600.0,
+                        help="Seconds a request waits for its render")
+    parser.add_argument("--verbose", action="store_true", help="Log every HTTP request")
+    args = parser.parse_args(argv)
+    server = RenderServer(args.host, args.port, args.timeout, args.verbose)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
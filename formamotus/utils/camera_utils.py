@@ -0,0 +1,124 @@
+import numpy as np
+
+
+def look_at_matrix(location, target, up=(0.0, 0.0, 1.0)):
+    """Return the 4x4 world matrix of a camera at location looking at target.
+
+    Blender cameras look along their -Z axis with +Y up. When the view
+    direction is parallel to up, the Y axis is used as up instead.
+    """
+    location = np.asarray(location, dtype=np.float64)
+    z_axis = location - np.asarray(target, dtype=np.float64)
+    matrix = np.eye(4)
+    matrix[:3, 3] = location
+    if np.linalg.norm(z_axis) < 1e-6:
+        return matrix
+    z_axis = z_axis / np.linalg.norm(z_axis)
+    x_axis = np.cross(up, z_axis)
+    if np.linalg.norm(x_axis) < 1e-6:
+        x_axis = np.cross((0.0, 1.0, 0.0), z_axis)
+    x_axis = x_axis / np.linalg.norm(x_axis)
+    y_axis = np.cross(z_axis, x_axis)
+    matrix[:3, 0] = x_axis
+    matrix[:3, 1] = y_axis
+    matrix[:3, 2] = z_axis
+    return matrix
+
+
+def camera_intrinsics(lens, sensor_width, width, height, sensor_height=None,
+                      sensor_fit='AUTO'):
+    """Return the 3x3 pinhole intrinsic matrix of a Blender camera.
+
+    Parameters
+    ----------
+    lens, sensor_width, sensor_height : float
+        Focal length and sensor size in millimeters, as on the camera data.
+    width, height : int
+        Rendered image size in pixels.
+    sensor_fit : str
+        ``'AUTO'``, ``'HORIZONTAL'`` or ``'VERTICAL'``, as on the camera data.
+    """
+    if sensor_fit == 'VERTICAL':
+        focal = lens / sensor_height * height
+    elif sensor_fit == 'HORIZONTAL':
+        focal = lens / sensor_width * width
+    else:
+        focal = lens / sensor_width * max(width, height)
+    return np.array([
+        [focal, 0.0, width / 2.0],
+        [0.0, focal, height / 2.0],
+        [0.0, 0.0, 1.0],
+    ])
+
+
+def opencv_world_to_camera(matrix_world):
+    """Return the world to camera matrix of a Blender camera in OpenCV axes.
+
+    OpenCV cameras look along +Z with +Y pointing down the image, Blender
+    cameras along -Z with +Y up.
+    """
+    return np.diag([1.0, -1.0, -1.0, 1.0]) @ np.linalg.inv(np.asarray(matrix_world))
+
+
+def sample_view_locations(rng, n_samples, center, distances, elevations):
+    """Return camera locations around center at random azimuths.
+
+    Parameters
+    ----------
+    rng : numpy.random.Generator
+    n_samples : int
+    center : array_like
+        Point the cameras are placed around.
+    distances : tuple of float
+        Range of the distance to center.
+    elevations : tuple of float
+        Range of the elevation above the XY plane of center, in radians.
+
+    Returns
+    -------
+    numpy.ndarray
+        (n_samples, 3) locations.
+    """
+    azimuth = rng.uniform(0.0, 2.0 * np.pi, n_samples)
+    # Uniform on the sphere band rather than uniform in elevation.
+    elevation = np.arcsin(rng.uniform(np.sin(elevations[0]), np.sin(elevations[1]), n_samples))
+    distance = rng.uniform(distances[0], distances[1], n_samples)
+    directions = np.stack([
+        np.cos(elevation) * np.cos(azimuth),
+        np.cos(elevation) * np.sin(azimuth),
+        np.sin(elevation),
+    ], axis=-1)
+    return np.asarray(center, dtype=np.float64) + distance[:, None] * directions
+
+
+# Direction from the robot to the camera of the preset views; robots face +X.
+PRESET_VIEW_DIRECTIONS = {
+    'FRONT': (1.0, 0.0, 0.0),
+    'BACK': (-1.0, 0.0, 0.0),
+    'LEFT': (0.0, 1.0, 0.0),
+    'RIGHT': (0.0, -1.0, 0.0),
+    'TOP': (0.0, 0.0, 1.0),
+    'ISO': (1.0, 1.0, 1.0),
+}
+
+
+def orbit_view_locations(center, distance, count, elevation, start_azimuth=0.0):
+    """Return count camera locations evenly spaced on a ring around center.
+
+    elevation and start_azimuth are in radians; the first camera is at
+    start_azimuth measured from +X.
+    """
+    azimuth = start_azimuth + np.arange(count) * (2.0 * np.pi / count)
+    directions = np.stack([
+        np.cos(elevation) * np.cos(azimuth),
+        np.cos(elevation) * np.sin(azimuth),
+        np.full(count, np.sin(elevation)),
+    ], axis=-1)
+    return np.asarray(center, dtype=np.float64) + distance * directions
+
+
+def preset_view_locations(center, distance, names):
+    """Return the camera locations of preset views, see PRESET_VIEW_DIRECTIONS."""
+    directions = np.array([PRESET_VIEW_DIRECTIONS[name] for name in names], dtype=np.float64)
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    return np.asarray(center, dtype=np.float64) + distance * directions.reshape(-1, 3)
@@ -42,6 +42,10 @@ def merge_overlapping_cylinders():
                     obj2.scale = (obj2.scale[0] * 0.8, obj2.scale[1] * 0.8, obj2.scale[2] * 0.8)
                     bpy.context.view_layer.update()
 
+                    # Modifiers cannot be applied to mesh data shared with other objects.
+                    if obj1.data.users > 1:
+                        obj1.data = obj1.data.copy()
+
                     bool_mod = obj1.modifiers.new(name="BoolUnion", type='BOOLEAN')
                     bool_mod.operation = 'UNION'
                     bool_mod.object = obj2
@@ -33,9 +33,6 @@ from typing import Dict
 from typing import List
 from xml.etree import ElementTree
 
-from skrobot.utils.urdf import _load_meshes
-from trimesh.exchange import dae
-
 
 def fix_up_axis_and_get_materials(file_path: str, preserve_original_texture_name: bool = False):
     """
@@ -181,18 +178,3 @@ def fix_up_axis_and_get_materials(file_path: str, preserve_original_texture_name
         tmp_file_path = file_path
 
     return tmp_file_path, mat_sampler2D_dict
-
-
-def zero_origin_dae(input_path, transform):
-    mesh_or_scene = _load_meshes(input_path)
-    transformed_meshes = []
-    for m in mesh_or_scene:
-        m.apply_transform(transform)
-        transformed_meshes.append(m)
-    dae_bytes = dae.export_collada(transformed_meshes)
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".dae", mode="w", encoding="utf-8") as tmp_file:
-        with open(tmp_file.name, 'wb') as f:
-            f.write(dae_bytes)
-        tmp_file_path = tmp_file.name
-    return tmp_file_path
@@ -0,0 +1,157 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import struct
+import threading
+import time
+import zlib
+
+import numpy as np
+
+_PNG_COLOR_TYPES = {1: 0, 2: 4, 3: 2, 4: 6}
+
+
+def _png_chunk(chunk_type, data):
+    chunk = chunk_type + data
+    return struct.pack(">I", len(data)) + chunk + struct.pack(">I", zlib.crc32(chunk))
+
+
+def encode_png(pixels, compression=6):
+    """Encode an image array as PNG bytes.
+
+    Parameters
+    ----------
+    pixels : numpy.ndarray
+        uint8 or uint16 array of shape (height, width) or (height, width,
+        channels) with 1 to 4 channels (gray, gray alpha, RGB, RGBA), top
+        row first.
+    compression : int
+        zlib compression level from 0 to 9.
+
+    Returns
+    -------
+    bytes
+    """
+    pixels = np.asarray(pixels)
+    if pixels.ndim == 2:
+        pixels = pixels[:, :, None]
+    if pixels.ndim != 3 or pixels.shape[2] not in _PNG_COLOR_TYPES:
+        raise ValueError(f"Cannot write an image of shape {pixels.shape} as PNG")
+    if pixels.dtype == np.uint8:
+        bit_depth = 8
+    elif pixels.dtype == np.uint16:
+        bit_depth = 16
+        pixels = pixels.astype(">u2")
+    else:
+        raise ValueError(f"PNG images must be uint8 or uint16, not {pixels.dtype}")
+    height, width, channels = pixels.shape
+    rows = pixels.reshape(height, -1).view(np.uint8)
+    # Every row uses the "Up" filter: rendered images are mostly flat, so
+    # the difference to the row above compresses far better than raw bytes.
+    filtered = np.zeros((height, rows.shape[1] + 1), dtype=np.uint8)
+    filtered[:, 0] = 2
+    filtered[:, 1:] = rows
+    filtered[1:, 1:] -= rows[:-1]
+    header = struct.pack(
+        ">IIBBBBB", width, height, bit_depth, _PNG_COLOR_TYPES[channels], 0, 0, 0)
+    return b"".join((
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", header),
+        _png_chunk(b"IDAT", zlib.compress(filtered.tobytes(), compression)),
+        _png_chunk(b"IEND", b""),
+    ))
+
+
+def write_png(filepath, pixels, compression=6):
+    with open(filepath, "wb") as f:
+        f.write(encode_png(pixels, compression))
+
+
+def write_npz(filepath, pixels):
+    """Write pixels as the ``pixels`` array of a compressed ``.npz`` file."""
+    np.savez_compressed(filepath, pixels=pixels)
+
+
+def write_exr(filepath, pixels):
+    """Write pixels as OpenEXR; uint8 values are scaled to [0, 1].
+
+    Needs imageio with an OpenEXR capable plugin.
+    """
+    try:
+        import imageio.v3 as iio
+    except ImportError:
+        raise ImportError("imageio is required to write OpenEXR images")
+    pixels = np.asarray(pixels)
+    if pixels.dtype == np.uint8:
+        pixels = pixels / np.float32(255.0)
+    iio.imwrite(filepath, pixels.astype(np.float32), extension=".exr")
+
+
+def write_image(filepath, pixels, compression=6):
+    """Write pixels as ``.npz`` or ``.exr`` by the extension of filepath, else as PNG."""
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension == ".npz":
+        write_npz(filepath, pixels)
+    elif extension == ".exr":
+        write_exr(filepath, pixels)
+    else:
+        write_png(filepath, pixels, compression)
+
+
+class AsyncImageWriter:
+    """Encode and write images on a thread pool.
+
+    zlib releases the GIL while compressing, so the encoding overlaps with
+    whatever the calling thread does next, typically rendering the next
+    image. At most max_pending images are queued; submit blocks beyond
+    that so a fast renderer cannot fill the memory with pixel arrays.
+
+    Parameters
+    ----------
+    max_workers : int
+        Number of writer threads.
+    max_pending : int, optional
+        Number of images queued or being written before submit blocks.
+        Defaults to twice max_workers.
+    compression : int
+        zlib compression level of PNG images.
+    """
+
+    def __init__(self, max_workers=2, max_pending=None, compression=6):
+        self.compression = compression
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="formamotus_writer")
+        self._slots = threading.BoundedSemaphore(max_pending or 2 * max_workers)
+
+    def _write(self, filepath, pixels):
+        start_time = time.perf_counter()
+        try:
+            directory = os.path.dirname(filepath)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            write_image(filepath, pixels, self.compression)
+        finally:
+            self._slots.release()
+        return time.perf_counter() - start_time
+
+    def submit(self, filepath, pixels):
+        """Queue pixels to be written to filepath.
+
+        Returns a Future of the seconds spent encoding and writing. pixels
+        must not be modified afterwards.
+        """
+        self._slots.acquire()
+        try:
+            return self._executor.submit(self._write, filepath, pixels)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def close(self, wait=True):
+        """Stop accepting images; with wait, return once all are written."""
+        self._executor.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,229 @@
+import bpy
+import numpy as np
+
+# Input of the trees of create_cylinder_instancer growing the inverted hulls.
+OUTLINE_WIDTH_INPUT = "Outline Width"
+
+
+def quaternion_attributes_supported():
+    """Return whether meshes can store quaternion attributes, new in Blender 4.0."""
+    data_types = bpy.types.Attribute.bl_rna.properties["data_type"].enum_items
+    return "QUATERNION" in data_types.keys()
+
+
+def create_instance_points(name, kinds, sizes):
+    """Create a mesh of loose points carrying the attributes of instanced cylinders.
+
+    Every point is one cylinder of :func:`create_cylinder_instancer` and has
+    the point attributes
+
+    - ``position``: location of the cylinder center.
+    - ``rotation``: wxyz quaternion rotating the cylinder axis from Z.
+    - ``scale``: scale of the cylinder, like the scale of an object.
+    - ``size``: radius, radius and height of the cylinder in meters.
+    - ``kind``: index of the material of the cylinder.
+
+    Parameters
+    ----------
+    name : str
+    kinds : numpy.ndarray
+        (N,) material index of every point.
+    sizes : numpy.ndarray
+        (N, 3) size of every point.
+
+    Returns
+    -------
+    bpy.types.Mesh
+    """
+    if not quaternion_attributes_supported():
+        raise RuntimeError("The instanced skeleton needs Blender 4.0 or newer")
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(kinds))
+    mesh.attributes.new("rotation", 'QUATERNION', 'POINT')
+    mesh.attributes.new("scale", 'FLOAT_VECTOR', 'POINT')
+    mesh.attributes.new("size", 'FLOAT_VECTOR', 'POINT')
+    mesh.attributes.new("kind", 'INT', 'POINT')
+    mesh.attributes["kind"].data.foreach_set("value", np.asarray(kinds, dtype=np.int32))
+    set_instance_sizes(mesh, sizes)
+    return mesh
+
+
+def set_instance_sizes(mesh, sizes):
+    """Set the ``size`` attribute of the points of mesh."""
+    mesh.attributes["size"].data.foreach_set(
+        "vector", np.asarray(sizes, dtype=np.float32).ravel())
+    mesh.update_tag()
+
+
+def create_cylinder_instancer(name, materials, outline_material=None, vertices=32):
+    """Create a Geometry Nodes tree drawing a cylinder on every point of its input.
+
+    The cylinders have the radius 1 and the height 1 and are scaled by the
+    product of the ``scale`` and ``size`` attributes of their point, rotated
+    by its ``rotation`` and get the material ``materials[kind]``. They stay
+    instances, so a pose update only changes the attributes of the points.
+
+    With outline_material, every cylinder also gets an inverted hull like
+    the one of :func:`formamotus.utils.rendering_utils.enable_inverted_hull`,
+    as thick as the OUTLINE_WIDTH_INPUT input in meters. A width of 0
+    draws no hulls.
+
+    Parameters
+    ----------
+    name : str
+    materials : list of bpy.types.Material
+        Material of every kind of cylinder.
+    outline_material : bpy.types.Material, optional
+        Material of the inverted hulls.
+    vertices : int
+        Number of vertices of the cylinder circles.
+
+    Returns
+    -------
+    bpy.types.GeometryNodeTree
+    """
+    tree = bpy.data.node_groups.new(name, 'GeometryNodeTree')
+    tree.interface.new_socket("Geometry", in_out='INPUT', socket_type='NodeSocketGeometry')
+    tree.interface.new_socket("Geometry", in_out='OUTPUT', socket_type='NodeSocketGeometry')
+    nodes = tree.nodes
+    links = tree.links
+    group_input = nodes.new("NodeGroupInput")
+    group_output = nodes.new("NodeGroupOutput")
+
+    cylinder = nodes.new("GeometryNodeMeshCylinder")
+    cylinder.fill_type = 'NGON'
+    cylinder.inputs["Vertices"].default_value = vertices
+    cylinder.inputs["Radius"].default_value = 1.0
+    cylinder.inputs["Depth"].default_value = 1.0
+    # Geometry to Instance numbers its inputs from the last linked one.
+    to_instance = nodes.new("GeometryNodeGeometryToInstance")
+    for material in reversed(materials):
+        set_material = nodes.new("GeometryNodeSetMaterial")
+        set_material.inputs["Material"].default_value = material
+        links.new(cylinder.outputs["Mesh"], set_material.inputs["Geometry"])
+        links.new(set_material.outputs["Geometry"], to_instance.inputs["Geometry"])
+
+    def named_attribute(attribute_name, data_type):
+        node = nodes.new("GeometryNodeInputNamedAttribute")
+        node.data_type = data_type
+        node.inputs["Name"].default_value = attribute_name
+        return node.outputs["Attribute"]
+
+    scale = nodes.new("ShaderNodeVectorMath")
+    scale.operation = 'MULTIPLY'
+    links.new(named_attribute("scale", 'FLOAT_VECTOR'), scale.inputs[0])
+    links.new(named_attribute("size", 'FLOAT_VECTOR'), scale.inputs[1])
+
+    instance = nodes.new("GeometryNodeInstanceOnPoints")
+    instance.inputs["Pick Instance"].default_value = True
+    links.new(group_input.outputs["Geometry"], instance.inputs["Points"])
+    links.new(to_instance.outputs["Instances"], instance.inputs["Instance"])
+    links.new(named_attribute("kind", 'INT'), instance.inputs["Instance Index"])
+    links.new(named_attribute("rotation", 'QUATERNION'), instance.inputs["Rotation"])
+    links.new(scale.outputs["Vector"], instance.inputs["Scale"])
+    if outline_material is None:
+        links.new(instance.outputs["Instances"], group_output.inputs["Geometry"])
+        return tree
+
+    width = tree.interface.new_socket(
+        OUTLINE_WIDTH_INPUT, in_out='INPUT', socket_type='NodeSocketFloat')
+    width.default_value = 0.0
+    width.min_value = 0.0
+    width = group_input.outputs[OUTLINE_WIDTH_INPUT]
+    # The hull is the cylinder grown by width with flipped normals.
+    flip = nodes.new("GeometryNodeFlipFaces")
+    links.new(cylinder.outputs["Mesh"], flip.inputs["Mesh"])
+    set_material = nodes.new("GeometryNodeSetMaterial")
+    set_material.inputs["Material"].default_value = outline_material
+    links.new(flip.outputs["Mesh"], set_material.inputs["Geometry"])
+    double_width = nodes.new("ShaderNodeMath")
+    double_width.operation = 'MULTIPLY'
+    double_width.inputs[1].default_value = 2.0
+    links.new(width, double_width.inputs[0])
+    growth = nodes.new("ShaderNodeCombineXYZ")
+    links.new(width, growth.inputs["X"])
+    links.new(width, growth.inputs["Y"])
+    links.new(double_width.outputs["Value"], growth.inputs["Z"])
+    hull_scale = nodes.new("ShaderNodeVectorMath")
+    hull_scale.operation = 'ADD'
+    links.new(scale.outputs["Vector"], hull_scale.inputs[0])
+    links.new(growth.outputs["Vector"], hull_scale.inputs[1])
+    use_hull = nodes.new("ShaderNodeMath")
+    use_hull.operation = 'GREATER_THAN'
+    use_hull.inputs[1].default_value = 0.0
+    links.new(width, use_hull.inputs[0])
+
+    hull = nodes.new("GeometryNodeInstanceOnPoints")
+    links.new(group_input.outputs["Geometry"], hull.inputs["Points"])
+    links.new(use_hull.outputs["Value"], hull.inputs["Selection"])
+    links.new(set_material.outputs["Geometry"], hull.inputs["Instance"])
+    links.new(named_attribute("rotation", 'QUATERNION'), hull.inputs["Rotation"])
+    links.new(hull_scale.outputs["Vector"], hull.inputs["Scale"])
+    join = nodes.new("GeometryNodeJoinGeometry")
+    links.new(hull.outputs["Instances"], join.inputs["Geometry"])
+    links.new(instance.outputs["Instances"], join.inputs["Geometry"])
+    links.new(join.outputs["Geometry"], group_output.inputs["Geometry"])
+    return tree
+
+
+def set_instancer_input(obj, input_name, value):
+    """Set an input of the Geometry Nodes modifier of obj and return its previous value."""
+    modifier = next(m for m in obj.modifiers if m.type == 'NODES')
+    identifier = modifier.node_group.interface.items_tree[input_name].identifier
+    previous = modifier[identifier]
+    if previous != value:
+        modifier[identifier] = value
+        obj.update_tag()
+    return previous
+
+
+class InstanceTransformWriter:
+    """Write the transforms of the points of a mesh made by create_instance_points.
+
+    It has the interface of
+    :class:`formamotus.utils.transform_utils.ObjectTransformWriter`, with
+    points in place of objects. The transforms are kept in arrays, so every
+    write is one foreach_set per attribute whatever the number of points.
+
+    Parameters
+    ----------
+    mesh : bpy.types.Mesh
+    """
+
+    def __init__(self, mesh):
+        self.mesh = mesh
+        n_points = len(mesh.vertices)
+        self.locations = np.zeros((n_points, 3), dtype=np.float32)
+        self.quaternions = np.zeros((n_points, 4), dtype=np.float32)
+        self.quaternions[:, 0] = 1.0
+        self.scales = np.ones((n_points, 3), dtype=np.float32)
+
+    def __len__(self):
+        return len(self.locations)
+
+    def write(self, locations, quaternions, scales=None, subset=None):
+        """Set the location, rotation and optionally the scale of the points.
+
+        Parameters
+        ----------
+        locations : numpy.ndarray
+            (N, 3) locations.
+        quaternions : numpy.ndarray
+            (N, 4) wxyz rotations.
+        scales : numpy.ndarray, optional
+            (N, 3) scales. The scale is left untouched if not given.
+        subset : numpy.ndarray, optional
+            Points the rows of the arrays belong to. Defaults to all points.
+        """
+        if subset is None:
+            subset = np.arange(len(self))
+        if len(subset) == 0:
+            return
+        self.locations[subset] = locations
+        self.quaternions[subset] = quaternions
+        self.mesh.vertices.foreach_set("co", self.locations.ravel())
+        self.mesh.attributes["rotation"].data.foreach_set("value", self.quaternions.ravel())
+        if scales is not None:
+            self.scales[subset] = scales
+            self.mesh.attributes["scale"].data.foreach_set("vector", self.scales.ravel())
+        self.mesh.update_tag()
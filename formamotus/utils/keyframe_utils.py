@@ -0,0 +1,83 @@
+import bpy
+import numpy as np
+
+INTERPOLATION_LINEAR = (
+    bpy.types.Keyframe.bl_rna.properties["interpolation"].enum_items.keys().index("LINEAR"))
+
+
+def set_fcurve_keyframes(action, data_path, frames, values, indices=None, group=""):
+    """Replace the keyframes of the F-curves of one property with sampled values.
+
+    Keyframes are added with ``keyframe_points.add`` and filled with
+    ``foreach_set``, which takes a fraction of the time of inserting them
+    one by one.
+
+    Parameters
+    ----------
+    action : bpy.types.Action
+        Action holding the F-curves.
+    data_path : str
+        Animated property, like ``"location"``.
+    frames : numpy.ndarray
+        (S,) increasing frames of the samples.
+    values : numpy.ndarray
+        (S, C) values of C components of the property, one F-curve each.
+    indices : list of int, optional
+        Array index of each component. Defaults to the first C components.
+    group : str
+        Action group of new F-curves.
+    """
+    frames = np.asarray(frames, dtype=np.float32)
+    values = np.asarray(values, dtype=np.float32).reshape(len(frames), -1)
+    coordinates = np.zeros((len(frames), 2), dtype=np.float32)
+    coordinates[:, 0] = frames
+    interpolations = np.full(len(frames), INTERPOLATION_LINEAR, dtype=np.int32)
+    if indices is None:
+        indices = range(values.shape[1])
+    for column, index in enumerate(indices):
+        fcurve = action.fcurves.find(data_path, index=index)
+        if fcurve is not None:
+            action.fcurves.remove(fcurve)
+        fcurve = action.fcurves.new(data_path, index=index, action_group=group)
+        coordinates[:, 1] = values[:, column]
+        keyframe_points = fcurve.keyframe_points
+        keyframe_points.add(len(frames))
+        keyframe_points.foreach_set("co", coordinates.ravel())
+        keyframe_points.foreach_set("interpolation", interpolations)
+        fcurve.update()
+
+
+def object_action(obj, name=None):
+    """Return the action animating obj, creating one if it has none."""
+    if obj.animation_data is None:
+        obj.animation_data_create()
+    if obj.animation_data.action is None:
+        obj.animation_data.action = bpy.data.actions.new(name or f"{obj.name}Action")
+    return obj.animation_data.action
+
+
+def bake_object_transforms(objects, frames, locations, quaternions, scales=None):
+    """Keyframe the location, quaternion rotation and scale of many objects.
+
+    Parameters
+    ----------
+    objects : list of bpy.types.Object
+        Objects to animate. Their rotation mode is switched to quaternions.
+    frames : numpy.ndarray
+        (S,) increasing frames of the samples.
+    locations : numpy.ndarray
+        (S, N, 3) locations of the N objects.
+    quaternions : numpy.ndarray
+        (S, N, 4) wxyz rotations, with consecutive samples on the same side
+        of the quaternion double cover.
+    scales : numpy.ndarray, optional
+        (S, N, 3) scales. The scale is not animated if not given.
+    """
+    for i, obj in enumerate(objects):
+        obj.rotation_mode = 'QUATERNION'
+        action = object_action(obj)
+        set_fcurve_keyframes(action, "location", frames, locations[:, i], group="Object Transforms")
+        set_fcurve_keyframes(
+            action, "rotation_quaternion", frames, quaternions[:, i], group="Object Transforms")
+        if scales is not None:
+            set_fcurve_keyframes(action, "scale", frames, scales[:, i], group="Object Transforms")
@@ -0,0 +1,671 @@
+import numpy as np
+
+MOVABLE_JOINT_TYPES = ('revolute', 'continuous', 'prismatic')
+
+
+def axis_vector(axis):
+    """Return a joint axis given as 'x', 'y', 'z' or a 3-sequence as a unit vector."""
+    if isinstance(axis, str):
+        axis_dict = {'x': [1, 0, 0], 'y': [0, 1, 0], 'z': [0, 0, 1]}
+        return np.array(axis_dict.get(axis.lower(), [0, 0, 1]), dtype=np.float64)
+    axis = np.asarray(axis, dtype=np.float64)
+    return axis / np.linalg.norm(axis)
+
+
+def coords_to_matrix(coords):
+    """Return the local 4x4 homogeneous transform of a skrobot Coordinates."""
+    matrix = np.eye(4)
+    matrix[:3, :3] = coords.rotation
+    matrix[:3, 3] = coords.translation
+    return matrix
+
+
+def joint_range(joint_type, min_angle, max_angle):
+    """Return the finite (lower, upper) range the joint sliders offer.
+
+    Missing or infinite limits fall back to [-pi, pi] for rotating joints
+    and [0, 0.1] m for prismatic ones; continuous joints always use
+    [-pi, pi].
+    """
+    if joint_type == 'continuous':
+        return -np.pi, np.pi
+    if min_angle is None or not np.isfinite(min_angle):
+        min_angle = 0.0 if joint_type == 'prismatic' else -np.pi
+    if max_angle is None or not np.isfinite(max_angle):
+        max_angle = 0.1 if joint_type == 'prismatic' else np.pi
+    if min_angle >= max_angle:
+        if joint_type == 'revolute':
+            return -np.pi, np.pi
+        return 0.0, 0.1
+    return float(min_angle), float(max_angle)
+
+
+def axis_angle_matrices(axes, angles):
+    """Return (N, 3, 3) rotation matrices about unit axes by angles (Rodrigues)."""
+    axes = np.asarray(axes, dtype=np.float64).reshape(-1, 3)
+    angles = np.asarray(angles, dtype=np.float64).reshape(-1)
+    x, y, z = axes[:, 0], axes[:, 1], axes[:, 2]
+    zeros = np.zeros_like(x)
+    skew = np.stack([
+        np.stack([zeros, -z, y], axis=-1),
+        np.stack([z, zeros, -x], axis=-1),
+        np.stack([-y, x, zeros], axis=-1),
+    ], axis=-2)
+    sin = np.sin(angles)[:, None, None]
+    cos = np.cos(angles)[:, None, None]
+    return np.eye(3) + sin * skew + (1.0 - cos) * (skew @ skew)
+
+
+def rotation_between(from_vector, to_vector):
+    """Return the 4x4 rotation turning the unit vector from_vector onto to_vector."""
+    from_vector = np.asarray(from_vector, dtype=np.float64)
+    to_vector = axis_vector(to_vector)
+    matrix = np.eye(4)
+    rotation_axis = np.cross(from_vector, to_vector)
+    if np.linalg.norm(rotation_axis) > 1e-6:
+        rotation_axis = rotation_axis / np.linalg.norm(rotation_axis)
+        angle = np.arccos(np.clip(np.dot(from_vector, to_vector), -1.0, 1.0))
+        matrix[:3, :3] = axis_angle_matrices(rotation_axis, angle)[0]
+    elif np.dot(from_vector, to_vector) < 0:
+        # Opposite vectors; turn half way around any perpendicular axis.
+        perpendicular = np.cross(from_vector, [1.0, 0.0, 0.0])
+        if np.linalg.norm(perpendicular) < 1e-6:
+            perpendicular = np.cross(from_vector, [0.0, 1.0, 0.0])
+        perpendicular = perpendicular / np.linalg.norm(perpendicular)
+        matrix[:3, :3] = axis_angle_matrices(perpendicular, np.pi)[0]
+    return matrix
+
+
+def align_z_matrix(axis):
+    """Return the 4x4 rotation turning the Z axis onto a joint axis.
+
+    This is the rotation the joint cylinders are drawn with relative to
+    their link.
+    """
+    return rotation_between([0.0, 0.0, 1.0], axis)
+
+
+def align_y_matrix(axis):
+    """Return the 4x4 rotation turning the Y axis onto a joint axis.
+
+    Bones rotate about and extend along their Y axis, so this is the rest
+    orientation of a joint bone relative to its link.
+    """
+    return rotation_between([0.0, 1.0, 0.0], axis)
+
+
+def matrices_to_quaternions(rotations):
+    """Convert (N, 3, 3) rotation matrices to (N, 4) wxyz quaternions."""
+    rotations = np.asarray(rotations, dtype=np.float64).reshape(-1, 3, 3)
+    m00, m11, m22 = rotations[:, 0, 0], rotations[:, 1, 1], rotations[:, 2, 2]
+    # Magnitudes of the four components; the largest one is computed
+    # directly and the others derived from it for numerical stability.
+    magnitudes = np.stack([
+        1.0 + m00 + m11 + m22,
+        1.0 + m00 - m11 - m22,
+        1.0 - m00 + m11 - m22,
+        1.0 - m00 - m11 + m22,
+    ], axis=1)
+    largest = np.argmax(magnitudes, axis=1)
+    s = 2.0 * np.sqrt(np.maximum(magnitudes[np.arange(len(rotations)), largest], 1e-12))
+
+    r = rotations
+    quaternions = np.zeros((len(rotations), 4))
+    candidates = (
+        (0.25 * s, (r[:, 2, 1] - r[:, 1, 2]) / s,
+         (r[:, 0, 2] - r[:, 2, 0]) / s, (r[:, 1, 0] - r[:, 0, 1]) / s),
+        ((r[:, 2, 1] - r[:, 1, 2]) / s, 0.25 * s,
+         (r[:, 0, 1] + r[:, 1, 0]) / s, (r[:, 0, 2] + r[:, 2, 0]) / s),
+        ((r[:, 0, 2] - r[:, 2, 0]) / s, (r[:, 0, 1] + r[:, 1, 0]) / s,
+         0.25 * s, (r[:, 1, 2] + r[:, 2, 1]) / s),
+        ((r[:, 1, 0] - r[:, 0, 1]) / s, (r[:, 0, 2] + r[:, 2, 0]) / s,
+         (r[:, 1, 2] + r[:, 2, 1]) / s, 0.25 * s),
+    )
+    for i, candidate in enumerate(candidates):
+        mask = largest == i
+        quaternions[mask] = np.stack(candidate, axis=1)[mask]
+    quaternions[quaternions[:, 0] < 0] *= -1.0
+    return quaternions
+
+
+def continuous_quaternions(quaternions):
+    """Flip the signs of a quaternion sequence so that consecutive samples agree.
+
+    ``q`` and ``-q`` are the same rotation, but keyframes interpolated
+    between them take the long way around.
+
+    Parameters
+    ----------
+    quaternions : numpy.ndarray
+        (S, ..., 4) wxyz quaternions, sampled along the first axis.
+
+    Returns
+    -------
+    numpy.ndarray
+        Copy of quaternions with the sign of some samples flipped.
+    """
+    quaternions = np.array(quaternions, dtype=np.float64)
+    dots = np.sum(quaternions[1:] * quaternions[:-1], axis=-1)
+    signs = np.cumprod(np.where(dots < 0, -1.0, 1.0), axis=0)
+    quaternions[1:] *= signs[..., None]
+    return quaternions
+
+
+def connector_transforms(start_positions, end_positions):
+    """Return the placement of cylinders spanning pairs of points.
+
+    Parameters
+    ----------
+    start_positions, end_positions : numpy.ndarray
+        (N, 3) end points of each cylinder.
+
+    Returns
+    -------
+    locations : numpy.ndarray
+        (N, 3) midpoints.
+    quaternions : numpy.ndarray
+        (N, 4) wxyz rotations turning the Z axis onto each segment.
+    lengths : numpy.ndarray
+        (N,) segment lengths.
+    """
+    direction = end_positions - start_positions
+    lengths = np.linalg.norm(direction, axis=1)
+    locations = start_positions + direction * 0.5
+    # The half-way quaternion between Z and the direction; segments
+    # parallel to Z keep the identity, which looks the same for a cylinder.
+    unit = direction / np.maximum(lengths, 1e-12)[:, None]
+    z_axis = np.array([0.0, 0.0, 1.0])
+    quaternions = np.zeros((len(direction), 4))
+    quaternions[:, 0] = 1.0 + unit @ z_axis
+    quaternions[:, 1:] = np.cross(z_axis, unit)
+    norms = np.linalg.norm(quaternions, axis=1)
+    parallel = np.linalg.norm(quaternions[:, 1:], axis=1) <= 1e-6
+    quaternions[parallel] = (1.0, 0.0, 0.0, 0.0)
+    norms[parallel] = 1.0
+    return locations, quaternions / norms[:, None], lengths
+
+
+class KinematicTree:
+    """Flattened kinematic tree of a skrobot RobotModel for batched FK.
+
+    Links are stored in depth first preorder, so the links below any link
+    form one contiguous range, and are grouped by depth, so the world
+    transforms of a whole depth level are computed with one batched matrix
+    product. Joint values are given for ``joint_names``, the movable joints
+    in link order; values of mimic joints are derived from their leader
+    joint.
+
+    Parameters
+    ----------
+    robot_model : skrobot.model.RobotModel
+        Robot model loaded from a URDF. Its current pose is used to find the
+        constant part of each link transform.
+    """
+
+    def __init__(self, robot_model):
+        root_link = robot_model.root_link
+        links = []
+        parents = []
+        depths = []
+        stack = [(root_link, -1, 0)]
+        while stack:
+            link, parent, depth = stack.pop()
+            links.append(link)
+            parents.append(parent)
+            depths.append(depth)
+            for child_link in reversed(link.child_links):
+                stack.append((child_link, len(links) - 1, depth + 1))
+        self.links = links
+        self.link_index = {link: i for i, link in enumerate(links)}
+        self.parents = np.array(parents, dtype=np.int64)
+        self.depths = np.array(depths, dtype=np.int64)
+        self.levels = self._group_by_depth(np.arange(1, len(links)))
+
+        # Link i and its descendants are links[i:subtree_ends[i]].
+        subtree_ends = np.arange(1, len(links) + 1)
+        for i in range(len(links) - 1, 0, -1):
+            subtree_ends[parents[i]] = max(subtree_ends[parents[i]], subtree_ends[i])
+        self.subtree_ends = subtree_ends
+        self.root_transform = root_link.copy_worldcoords().T()
+
+        joint_links = []
+        axes = []
+        joint_types = []
+        local_transforms = np.tile(np.eye(4), (len(links), 1, 1))
+        local_transforms[0] = self.root_transform
+        for i, link in enumerate(links[1:], start=1):
+            local_transform = coords_to_matrix(link)
+            joint = link.joint
+            if joint is not None and joint.type in MOVABLE_JOINT_TYPES:
+                axis = axis_vector(joint.axis)
+                # Remove the current joint motion to get the zero pose transform.
+                motion = self._joint_motions(
+                    np.array([joint.type == 'prismatic']), axis[None], [joint.joint_angle()])[0]
+                local_transform = local_transform @ np.linalg.inv(motion)
+                joint_links.append(i)
+                axes.append(axis)
+                joint_types.append(joint.type)
+            local_transforms[i] = local_transform
+        self.local_transforms = local_transforms
+
+        self.joint_links = np.array(joint_links, dtype=np.int64)
+        self.link_joints = np.full(len(links), -1, dtype=np.int64)
+        self.link_joints[self.joint_links] = np.arange(len(joint_links))
+        self.joint_names = [links[i].joint.name for i in joint_links]
+        self.joint_axes = np.array(axes, dtype=np.float64).reshape(-1, 3)
+        self.joint_types = joint_types
+        self.prismatic = np.array([t == 'prismatic' for t in joint_types], dtype=bool)
+        self.min_angles = np.array([links[i].joint.min_angle for i in joint_links], dtype=np.float64)
+        self.max_angles = np.array([links[i].joint.max_angle for i in joint_links], dtype=np.float64)
+
+        self.joint_position = {name: j for j, name in enumerate(self.joint_names)}
+
+        # Mimic joints in an order where every leader comes before its followers.
+        joint_position = self.joint_position
+        mimics = {}
+        joint_map = robot_model.urdf_robot_model.joint_map
+        for name in self.joint_names:
+            mimic = joint_map[name].mimic if name in joint_map else None
+            if mimic is not None and mimic.joint in joint_position:
+                mimics[name] = mimic
+        self.mimic_joints = []
+        resolved = set(joint_position) - set(mimics)
+        while mimics:
+            ready = [name for name, mimic in mimics.items() if mimic.joint in resolved]
+            if not ready:
+                break
+            for name in ready:
+                mimic = mimics.pop(name)
+                self.mimic_joints.append((
+                    joint_position[name], joint_position[mimic.joint],
+                    mimic.multiplier, mimic.offset))
+                resolved.add(name)
+        self.mimic_names = {self.joint_names[j] for j, _, _, _ in self.mimic_joints}
+        self.mimic_followers = {}
+        for follower, leader, _, _ in self.mimic_joints:
+            self.mimic_followers.setdefault(leader, []).append(follower)
+        self._affected = {}
+        self._scratch = np.zeros_like(local_transforms)
+
+    def _group_by_depth(self, link_indices):
+        depths = self.depths[link_indices]
+        return [link_indices[depths == depth] for depth in np.unique(depths)]
+
+    def driven_joints(self, joint):
+        """Return a joint and all mimic joints following it, directly or not."""
+        joints = [joint]
+        for j in joints:
+            joints.extend(self.mimic_followers.get(j, []))
+        return joints
+
+    def affected_links(self, joint):
+        """Return the links moved by a joint and by the mimic joints following it.
+
+        Parameters
+        ----------
+        joint : int
+            Position of the joint in ``joint_names``.
+
+        Returns
+        -------
+        numpy.ndarray
+            Sorted link indices.
+        """
+        affected = self._affected.get(joint)
+        if affected is None:
+            mask = np.zeros(len(self.links), dtype=bool)
+            for j in self.driven_joints(joint):
+                link = self.joint_links[j]
+                mask[link:self.subtree_ends[link]] = True
+            link_indices = np.nonzero(mask)[0]
+            affected = (link_indices, self._group_by_depth(link_indices))
+            self._affected[joint] = affected
+        return affected[0]
+
+    @staticmethod
+    def _joint_motions(prismatic, axes, values):
+        """Return the (K, 4, 4) joint motions of revolute and prismatic joints."""
+        values = np.asarray(values, dtype=np.float64)
+        motions = np.tile(np.eye(4), (len(values), 1, 1))
+        revolute = ~prismatic
+        if revolute.any():
+            motions[revolute, :3, :3] = axis_angle_matrices(axes[revolute], values[revolute])
+        motions[prismatic, :3, 3] = axes[prismatic] * values[prismatic, None]
+        return motions
+
+    def current_joint_values(self):
+        """Return the joint values the skrobot model currently has, in ``joint_names`` order."""
+        return np.array([self.links[i].joint.joint_angle() for i in self.joint_links],
+                        dtype=np.float64)
+
+    def clip_joint_values(self, joint_values):
+        valid = self.min_angles <= self.max_angles
+        joint_values[..., valid] = np.clip(
+            joint_values[..., valid], self.min_angles[valid], self.max_angles[valid])
+        return joint_values
+
+    def resolve_joint_values(self, joint_values):
+        """Return joint values with mimic joints derived and limits applied.
+
+        joint_values is either one pose ordered as ``joint_names`` or an
+        (S, J) array of S poses.
+        """
+        joint_values = self.clip_joint_values(np.array(joint_values, dtype=np.float64))
+        if self.mimic_joints:
+            for follower, leader, multiplier, offset in self.mimic_joints:
+                joint_values[..., follower] = joint_values[..., leader] * multiplier + offset
+            joint_values = self.clip_joint_values(joint_values)
+        return joint_values
+
+    def sample_joint_values(self, rng, n_samples):
+        """Return (n_samples, J) joint values drawn uniformly within the slider ranges.
+
+        Mimic joints follow their leaders, see :func:`joint_range` for the
+        ranges.
+        """
+        ranges = np.array([
+            joint_range(joint_type, min_angle, max_angle)
+            for joint_type, min_angle, max_angle
+            in zip(self.joint_types, self.min_angles, self.max_angles)
+        ], dtype=np.float64).reshape(-1, 2)
+        joint_values = rng.uniform(ranges[:, 0], ranges[:, 1], size=(n_samples, len(ranges)))
+        return self.resolve_joint_values(joint_values)
+
+    def local_link_transforms(self, joint_values, link_indices=None):
+        """Return the transforms of links relative to their parent link.
+
+        Parameters
+        ----------
+        joint_values : numpy.ndarray
+            Joint values ordered as ``joint_names``; mimic joints and limits
+            are resolved here.
+        link_indices : numpy.ndarray, optional
+            Links to return. Defaults to all links.
+
+        Returns
+        -------
+        numpy.ndarray
+            (K, 4, 4) local transforms. The root link gets its world transform.
+        """
+        joint_values = self.resolve_joint_values(joint_values)
+        if link_indices is None:
+            link_indices = np.arange(len(self.links))
+        link_indices = np.asarray(link_indices, dtype=np.int64)
+        local_transforms = self.local_transforms[link_indices]
+        joints = self.link_joints[link_indices]
+        moved = joints >= 0
+        if moved.any():
+            joints = joints[moved]
+            local_transforms[moved] = local_transforms[moved] @ self._joint_motions(
+                self.prismatic[joints], self.joint_axes[joints], joint_values[joints])
+        return local_transforms
+
+    def chain_links(self, ancestor, link):
+        """Return the links from below ancestor down to link, both as link indices."""
+        chain = []
+        while link != ancestor:
+            if link < 0:
+                raise ValueError("ancestor is not an ancestor of link")
+            chain.append(link)
+            link = self.parents[link]
+        return chain[::-1]
+
+    def relative_transform(self, ancestor, link, joint_values):
+        """Return the transform of link relative to one of its ancestor links."""
+        transform = np.eye(4)
+        chain = self.chain_links(ancestor, link)
+        for local_transform in self.local_link_transforms(joint_values, chain):
+            transform = transform @ local_transform
+        return transform
+
+    def forward_kinematics(self, joint_values):
+        """Return the (N, 4, 4) world transforms of all links.
+
+        Parameters
+        ----------
+        joint_values : numpy.ndarray
+            Joint angles in radians and joint positions in meters, ordered as
+            ``joint_names``.
+
+        Returns
+        -------
+        numpy.ndarray
+            World transform of every link, ordered as ``links``.
+        """
+        local_transforms = self.local_link_transforms(joint_values)
+        # Transforms are turned from local to world in place, parents first.
+        world_transforms = local_transforms
+        for level in self.levels:
+            world_transforms[level] = world_transforms[self.parents[level]] @ local_transforms[level]
+        return world_transforms
+
+    def batch_local_link_transforms(self, joint_values):
+        """Return the transforms of all links relative to their parent for many poses.
+
+        Parameters
+        ----------
+        joint_values : numpy.ndarray
+            (S, J) joint values, one pose per row ordered as ``joint_names``.
+
+        Returns
+        -------
+        numpy.ndarray
+            (S, N, 4, 4) local transforms. The root link gets its world
+            transform.
+        """
+        joint_values = self.resolve_joint_values(np.atleast_2d(joint_values))
+        n_samples, n_joints = joint_values.shape
+        local_transforms = np.tile(self.local_transforms, (n_samples, 1, 1, 1))
+        if n_joints:
+            motions = self._joint_motions(
+                np.tile(self.prismatic, n_samples), np.tile(self.joint_axes, (n_samples, 1)),
+                joint_values.ravel()).reshape(n_samples, n_joints, 4, 4)
+            local_transforms[:, self.joint_links] = (
+                local_transforms[:, self.joint_links] @ motions)
+        return local_transforms
+
+    def batch_forward_kinematics(self, joint_values):
+        """Return the world transforms of all links for many poses at once.
+
+        Parameters
+        ----------
+        joint_values : numpy.ndarray
+            (S, J) joint values, one pose per row ordered as ``joint_names``.
+
+        Returns
+        -------
+        numpy.ndarray
+            (S, N, 4, 4) world transforms, ordered as ``links``.
+        """
+        world_transforms = self.batch_local_link_transforms(joint_values)
+        for level in self.levels:
+            world_transforms[:, level] = (
+                world_transforms[:, self.parents[level]] @ world_transforms[:, level])
+        return world_transforms
+
+    def update_forward_kinematics(self, world_transforms, joint_values, joint):
+        """Recompute in place the world transforms of the links moved by one joint.
+
+        Parameters
+        ----------
+        world_transforms : numpy.ndarray
+            (N, 4, 4) world transforms of the previous pose, updated in place.
+        joint_values : numpy.ndarray
+            Joint values already passed through :meth:`resolve_joint_values`.
+        joint : int
+            Position of the changed joint in ``joint_names``.
+
+        Returns
+        -------
+        numpy.ndarray
+            Indices of the links whose transform was recomputed.
+        """
+        link_indices = self.affected_links(joint)
+        _, levels = self._affected[joint]
+        local_transforms = self._scratch
+        local_transforms[link_indices] = self.local_transforms[link_indices]
+        joints = self.link_joints[link_indices]
+        moved = link_indices[joints >= 0]
+        joints = joints[joints >= 0]
+        if len(joints):
+            local_transforms[moved] = local_transforms[moved] @ self._joint_motions(
+                self.prismatic[joints], self.joint_axes[joints], joint_values[joints])
+        for level in levels:
+            world_transforms[level] = world_transforms[self.parents[level]] @ local_transforms[level]
+        return link_indices
+
+
+class PoseLayout:
+    """Placement of visual objects relative to the links of a KinematicTree.
+
+    Every row is either attached to a link with a constant offset, like the
+    joint cylinders and link meshes, or a connector spanning two links.
+    The offsets are fixed when the scene is built, so placing all objects
+    for a pose is a handful of batched array operations.
+
+    Parameters
+    ----------
+    tree : KinematicTree
+        Tree whose link transforms the rows are placed from.
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self._attached = []
+        self._connectors = []
+        self._n_rows = 0
+        self.attached_rows = np.zeros(0, dtype=np.int64)
+        self.attached_links = np.zeros(0, dtype=np.int64)
+        self.attached_offsets = np.zeros((0, 4, 4))
+        self.attached_scales = np.zeros((0, 3))
+        self.connector_rows = np.zeros(0, dtype=np.int64)
+        self.connector_starts = np.zeros(0, dtype=np.int64)
+        self.connector_ends = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return self._n_rows
+
+    def add_attached(self, link, offset=None, scale=(1.0, 1.0, 1.0)):
+        """Add a row following link with a constant offset and return its index."""
+        row = self._n_rows
+        self._attached.append((
+            row, self.tree.link_index[link],
+            np.eye(4) if offset is None else np.asarray(offset, dtype=np.float64),
+            tuple(scale)))
+        self._n_rows += 1
+        return row
+
+    def add_connector(self, start_link, end_link):
+        """Add a unit-length Z cylinder row spanning two links and return its index."""
+        row = self._n_rows
+        self._connectors.append((
+            row, self.tree.link_index[start_link], self.tree.link_index[end_link]))
+        self._n_rows += 1
+        return row
+
+    def finalize(self):
+        """Pack the rows added so far into arrays."""
+        if self._attached:
+            rows, links, offsets, scales = zip(*self._attached)
+            self.attached_rows = np.array(rows, dtype=np.int64)
+            self.attached_links = np.array(links, dtype=np.int64)
+            self.attached_offsets = np.array(offsets, dtype=np.float64)
+            self.attached_scales = np.array(scales, dtype=np.float64)
+        if self._connectors:
+            rows, starts, ends = zip(*self._connectors)
+            self.connector_rows = np.array(rows, dtype=np.int64)
+            self.connector_starts = np.array(starts, dtype=np.int64)
+            self.connector_ends = np.array(ends, dtype=np.int64)
+        return self
+
+    def object_transforms(self, world_transforms, link_indices=None, row_mask=None):
+        """Return the transforms of the rows placed from the given link transforms.
+
+        Parameters
+        ----------
+        world_transforms : numpy.ndarray
+            (N, 4, 4) world transforms of the tree links.
+        link_indices : numpy.ndarray, optional
+            Only return rows following or spanning these links. Defaults to
+            all rows.
+        row_mask : numpy.ndarray, optional
+            (N,) bool mask of the rows that may be returned.
+
+        Returns
+        -------
+        rows : numpy.ndarray
+            (K,) row indices. Connectors whose links coincide are left out;
+            they keep their previous transform.
+        locations : numpy.ndarray
+            (K, 3) locations.
+        quaternions : numpy.ndarray
+            (K, 4) wxyz rotations.
+        scales : numpy.ndarray
+            (K, 3) scales.
+        """
+        attached = np.ones(len(self.attached_rows), dtype=bool)
+        connectors = np.ones(len(self.connector_rows), dtype=bool)
+        if link_indices is not None:
+            mask = np.zeros(len(self.tree.links), dtype=bool)
+            mask[link_indices] = True
+            attached = mask[self.attached_links]
+            connectors = mask[self.connector_starts] | mask[self.connector_ends]
+        if row_mask is not None:
+            attached &= row_mask[self.attached_rows]
+            connectors &= row_mask[self.connector_rows]
+
+        transforms = world_transforms[self.attached_links[attached]] @ self.attached_offsets[attached]
+        connector_locations, connector_quaternions, lengths = connector_transforms(
+            world_transforms[self.connector_starts[connectors], :3, 3],
+            world_transforms[self.connector_ends[connectors], :3, 3])
+        connector_scales = np.ones((len(lengths), 3))
+        connector_scales[:, 2] = lengths
+        valid = lengths > 1e-6
+
+        rows = np.concatenate([self.attached_rows[attached], self.connector_rows[connectors][valid]])
+        locations = np.concatenate([transforms[:, :3, 3], connector_locations[valid]])
+        quaternions = np.concatenate([
+            matrices_to_quaternions(transforms[:, :3, :3]), connector_quaternions[valid]])
+        scales = np.concatenate([self.attached_scales[attached], connector_scales[valid]])
+        return rows, locations, quaternions, scales
+
+    def batch_object_transforms(self, world_transforms):
+        """Return the transforms of every row for many poses at once.
+
+        Parameters
+        ----------
+        world_transforms : numpy.ndarray
+            (S, N, 4, 4) world transforms of the tree links, as returned by
+            :meth:`KinematicTree.batch_forward_kinematics`.
+
+        Returns
+        -------
+        locations : numpy.ndarray
+            (S, R, 3) locations of the R rows.
+        quaternions : numpy.ndarray
+            (S, R, 4) wxyz rotations.
+        scales : numpy.ndarray
+            (S, R, 3) scales. Connectors whose links coincide get a zero
+            length.
+        """
+        n_samples = len(world_transforms)
+        locations = np.zeros((n_samples, self._n_rows, 3))
+        quaternions = np.zeros((n_samples, self._n_rows, 4))
+        scales = np.zeros((n_samples, self._n_rows, 3))
+
+        transforms = world_transforms[:, self.attached_links] @ self.attached_offsets
+        locations[:, self.attached_rows] = transforms[..., :3, 3]
+        quaternions[:, self.attached_rows] = matrices_to_quaternions(
+            transforms[..., :3, :3]).reshape(n_samples, -1, 4)
+        scales[:, self.attached_rows] = self.attached_scales
+
+        n_connectors = len(self.connector_rows)
+        connector_locations, connector_quaternions, lengths = connector_transforms(
+            world_transforms[:, self.connector_starts][..., :3, 3].reshape(-1, 3),
+            world_transforms[:, self.connector_ends][..., :3, 3].reshape(-1, 3))
+        locations[:, self.connector_rows] = connector_locations.reshape(n_samples, n_connectors, 3)
+        quaternions[:, self.connector_rows] = connector_quaternions.reshape(
+            n_samples, n_connectors, 4)
+        scales[:, self.connector_rows, :2] = 1.0
+        scales[:, self.connector_rows, 2] = lengths.reshape(n_samples, n_connectors)
+        return locations, quaternions, scales
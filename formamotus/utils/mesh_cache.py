@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# Bump when the layout or the meaning of the stored arrays changes.
+CACHE_VERSION = 1
+
+PART_ARRAYS = ("vertices", "faces", "normals", "uvs", "material_indices", "smooth")
+
+# Mesh formats decoded with the URDF visual origin baked into their vertices.
+# The other formats decode to the same arrays whatever the origin.
+ORIGIN_BAKED_EXTENSIONS = (".dae",)
+
+
+def default_cache_dir():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "formamotus", "meshes")
+
+
+def file_digest(file_path, chunk_size=1 << 20):
+    """Return the SHA-1 hex digest of the contents of file_path."""
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class GeometryCache:
+    """Content-addressed on-disk cache of decoded mesh geometry.
+
+    Every cache entry is a directory holding one ``.npy`` file per array of
+    every mesh part and a ``meta.json`` describing the parts. Arrays are
+    loaded with ``mmap_mode='r'`` so warm loads only touch the pages that are
+    actually copied into Blender. Entries are evicted least recently used
+    first once the total size exceeds ``max_size_bytes``.
+
+    A mesh part is a dict with the keys
+
+    - ``vertices``: (N, 3) float32 vertex coordinates.
+    - ``faces``: (M, 3) int32 triangle vertex indices.
+    - ``normals``: (N, 3) float32 vertex normals.
+    - ``uvs``: (M, 3, 2) float32 per-corner texture coordinates, optional.
+    - ``material_indices``: (M,) int32 material slot of each triangle, optional.
+    - ``smooth``: (M,) bool smooth shading flag of each triangle, optional.
+    - ``materials``: list of RGBA colors, one per material slot.
+    - ``scale``: object scale as a 3-sequence.
+    """
+
+    def __init__(self, cache_dir=None, max_size_bytes=1 << 30):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_size_bytes = max_size_bytes
+        self._digests = {}
+
+    def key(self, mesh_filepath, visual_origin=None):
+        """Return the cache key of a mesh file decoded with visual_origin.
+
+        visual_origin is only part of the key for ORIGIN_BAKED_EXTENSIONS,
+        so a file used with several origins is stored once otherwise.
+        """
+        ext = os.path.splitext(mesh_filepath)[1].lower()
+        stat = os.stat(mesh_filepath)
+        stat_key = (os.path.realpath(mesh_filepath), stat.st_size, stat.st_mtime_ns)
+        content_digest = self._digests.get(stat_key)
+        if content_digest is None:
+            content_digest = file_digest(mesh_filepath)
+            self._digests[stat_key] = content_digest
+
+        digest = hashlib.sha1()
+        digest.update(f"v{CACHE_VERSION}".encode())
+        digest.update(ext.encode())
+        digest.update(content_digest.encode())
+        if visual_origin is not None and ext in ORIGIN_BAKED_EXTENSIONS:
+            origin = np.round(np.asarray(visual_origin, dtype=np.float64), 9)
+            digest.update(origin.tobytes())
+        return digest.hexdigest()
+
+    def entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key):
+        """Return the memory-mapped parts stored under key, or None on a miss."""
+        entry_dir = self.entry_dir(key)
+        meta_path = os.path.join(entry_dir, "meta.json")
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("version") != CACHE_VERSION:
+            return None
+
+        parts = []
+        try:
+            for i_part, part_meta in enumerate(meta["parts"]):
+                part = {
+                    "materials": [tuple(color) for color in part_meta["materials"]],
+                    "scale": tuple(part_meta["scale"]),
+                }
+                for name in part_meta["arrays"]:
+                    array_path = os.path.join(entry_dir, f"part{i_part}_{name}.npy")
+                    part[name] = np.load(array_path, mmap_mode="r")
+                parts.append(part)
+        except (OSError, KeyError, ValueError):
+            return None
+
+        # Mark the entry as recently used for LRU eviction.
+        try:
+            os.utime(meta_path)
+        except OSError:
+            pass
+        return parts
+
+    def store(self, key, parts):
+        """Write parts under key and evict old entries if over the size cap."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp_", dir=self.cache_dir)
+        try:
+            meta = {"version": CACHE_VERSION, "parts": []}
+            for i_part, part in enumerate(parts):
+                arrays = []
+                for name in PART_ARRAYS:
+                    if part.get(name) is None:
+                        continue
+                    np.save(os.path.join(tmp_dir, f"part{i_part}_{name}.npy"),
+                            np.ascontiguousarray(part[name]))
+                    arrays.append(name)
+                meta["parts"].append({
+                    "arrays": arrays,
+                    "materials": [list(map(float, color)) for color in part.get("materials", [])],
+                    "scale": list(map(float, part.get("scale", (1.0, 1.0, 1.0)))),
+                })
+            # meta.json is written last; an entry without it is never loaded.
+            with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            entry_dir = self.entry_dir(key)
+            if os.path.exists(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        self.evict(keep=key)
+
+    def entries(self):
+        """Return (last access time, size in bytes, key) of every cache entry."""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for key in os.listdir(self.cache_dir):
+            entry_dir = self.entry_dir(key)
+            meta_path = os.path.join(entry_dir, "meta.json")
+            if key.startswith(".") or not os.path.isfile(meta_path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(entry_dir) if entry.is_file())
+            entries.append((os.stat(meta_path).st_mtime, size, key))
+        return entries
+
+    def size_bytes(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        """Remove least recently used entries until the cache fits its size cap."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_size_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+            total -= size
+        return total
+
+    def clear(self):
+        """Remove every entry and return the number of bytes freed.
+
+        Only the entries and the leftovers of interrupted stores are removed,
+        so a cache_dir shared with other files keeps them.
+        """
+        entries = self.entries()
+        for _, _, key in entries:
+            shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                tmp_dir = os.path.join(self.cache_dir, name)
+                if name.startswith(".tmp_") and os.path.isdir(tmp_dir):
+                    shutil.rmtree(tmp_dir, ignore_errors=True)
+        self._digests = {}
+        return sum(size for _, size, _ in entries)
@@ -0,0 +1,132 @@
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+from skrobot.utils.urdf import _load_meshes
+
+from formamotus.utils.mesh_cache import ORIGIN_BAKED_EXTENSIONS
+
+
+def _visual_materials(mesh):
+    """Return the RGBA material colors of a trimesh and the slot of each face."""
+    visual = mesh.visual
+    kind = getattr(visual, "kind", None)
+    if kind in ("face", "vertex"):
+        colors, material_indices = np.unique(
+            np.asarray(visual.face_colors), axis=0, return_inverse=True)
+        return ([tuple(color / 255.0) for color in colors],
+                material_indices.astype(np.int32).ravel())
+    if kind == "texture":
+        color = getattr(getattr(visual, "material", None), "main_color", None)
+        if color is not None:
+            return ([tuple(np.asarray(color, dtype=np.float64) / 255.0)],
+                    np.zeros(len(mesh.faces), dtype=np.int32))
+    return [], None
+
+
+def _visual_uvs(mesh):
+    """Return per-corner texture coordinates of a trimesh, or None."""
+    uv = getattr(mesh.visual, "uv", None)
+    if uv is None or len(uv) != len(mesh.vertices):
+        return None
+    return np.asarray(uv, dtype=np.float32)[mesh.faces]
+
+
+def decode_mesh(mesh_filepath, visual_origin=None):
+    """Load a mesh file with trimesh and return its geometry as numpy arrays.
+
+    Meshes of the ORIGIN_BAKED_EXTENSIONS (COLLADA) get visual_origin baked
+    into their vertices, the same transform the importer-based path applied
+    before importing them. The returned parts use the layout of
+    :class:`formamotus.utils.mesh_cache.GeometryCache`.
+
+    Parameters
+    ----------
+    mesh_filepath : str
+        Path to an STL, OBJ or DAE mesh file.
+    visual_origin : numpy.ndarray, optional
+        4x4 homogeneous transform of the URDF visual.
+
+    Returns
+    -------
+    list of dict
+        One mesh part per trimesh geometry in the file.
+    """
+    ext = os.path.splitext(mesh_filepath)[1].lower()
+    parts = []
+    for mesh in _load_meshes(mesh_filepath):
+        if ext in ORIGIN_BAKED_EXTENSIONS and visual_origin is not None:
+            mesh.apply_transform(visual_origin)
+        materials, material_indices = _visual_materials(mesh)
+        parts.append({
+            "vertices": np.asarray(mesh.vertices, dtype=np.float32),
+            "faces": np.asarray(mesh.faces, dtype=np.int32),
+            "normals": np.asarray(mesh.vertex_normals, dtype=np.float32),
+            "uvs": _visual_uvs(mesh),
+            "material_indices": material_indices,
+            "smooth": None,
+            "materials": materials,
+            "scale": (1.0, 1.0, 1.0),
+        })
+    return parts
+
+
+def _decode_mesh_or_none(mesh_filepath, visual_origin):
+    try:
+        return decode_mesh(mesh_filepath, visual_origin)
+    except Exception:
+        return None
+
+
+def _fork_context():
+    # Workers are forked so they neither re-import Blender's __main__ nor
+    # need this package to be importable outside of Blender.
+    if sys.platform.startswith("linux") and "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return None
+
+
+def decode_meshes(jobs, max_workers=None):
+    """Decode many mesh files, in parallel worker processes when possible.
+
+    Parameters
+    ----------
+    jobs : dict
+        Maps an arbitrary hashable key to a ``(mesh_filepath, visual_origin)``
+        pair accepted by :func:`decode_mesh`.
+    max_workers : int, optional
+        Number of worker processes. Defaults to the number of CPU cores.
+        Decoding runs serially when this is 1 or when worker processes cannot
+        be forked on this platform.
+
+    Returns
+    -------
+    dict
+        Maps every key of jobs to its decoded parts, or to None when the file
+        could not be decoded.
+    """
+    if max_workers is None or max_workers <= 0:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(jobs))
+    mp_context = _fork_context()
+
+    results = {}
+    if max_workers > 1 and mp_context is not None:
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+                futures = {
+                    executor.submit(_decode_mesh_or_none, mesh_filepath, visual_origin): key
+                    for key, (mesh_filepath, visual_origin) in jobs.items()}
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        except (BrokenProcessPool, OSError):
+            pass
+    # Serial decoding, also for whatever a broken pool left behind.
+    for key, (mesh_filepath, visual_origin) in jobs.items():
+        if key not in results:
+            results[key] = _decode_mesh_or_none(mesh_filepath, visual_origin)
+    return results
@@ -0,0 +1,148 @@
+import bpy
+import numpy as np
+
+
+def material_color(material):
+    """Return the RGBA color a material shows, preferring its Principled BSDF."""
+    if material.use_nodes and material.node_tree:
+        principled_bsdf = material.node_tree.nodes.get("Principled BSDF")
+        if principled_bsdf:
+            return tuple(principled_bsdf.inputs["Base Color"].default_value)
+    return tuple(material.diffuse_color)
+
+
+def get_color_material(color):
+    """Return a shared material for an RGBA color, creating it on first use."""
+    rgba = tuple(float(c) for c in color)
+    name = "MeshColor_" + "".join(f"{round(min(max(c, 0.0), 1.0) * 255):02x}" for c in rgba)
+    material = bpy.data.materials.get(name)
+    if material is None:
+        material = bpy.data.materials.new(name=name)
+        material.use_nodes = True
+        principled_bsdf = material.node_tree.nodes.get("Principled BSDF")
+        if principled_bsdf:
+            principled_bsdf.inputs["Base Color"].default_value = rgba
+        material.diffuse_color = rgba
+    return material
+
+
+def mesh_arrays_from_object(obj):
+    """Extract the triangulated geometry of a mesh object as numpy arrays.
+
+    The returned dict uses the mesh part layout of
+    :class:`formamotus.utils.mesh_cache.GeometryCache`.
+    """
+    mesh = obj.data
+    mesh.calc_loop_triangles()
+    n_vertices = len(mesh.vertices)
+    n_triangles = len(mesh.loop_triangles)
+
+    vertices = np.zeros(n_vertices * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", vertices)
+    normals = np.zeros(n_vertices * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("normal", normals)
+    faces = np.zeros(n_triangles * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", faces)
+    material_indices = np.zeros(n_triangles, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("material_index", material_indices)
+    smooth = np.zeros(n_triangles, dtype=bool)
+    mesh.loop_triangles.foreach_get("use_smooth", smooth)
+
+    uvs = None
+    if mesh.uv_layers.active is not None:
+        loops = np.zeros(n_triangles * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get("loops", loops)
+        loop_uvs = np.zeros(len(mesh.loops) * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get("uv", loop_uvs)
+        uvs = loop_uvs.reshape(-1, 2)[loops].reshape(n_triangles, 3, 2)
+
+    return {
+        "vertices": vertices.reshape(n_vertices, 3),
+        "faces": faces.reshape(n_triangles, 3),
+        "normals": normals.reshape(n_vertices, 3),
+        "uvs": uvs,
+        "material_indices": material_indices,
+        "smooth": smooth,
+        "materials": [material_color(m) for m in mesh.materials if m is not None],
+        "scale": tuple(obj.scale),
+    }
+
+
+def build_mesh_from_arrays(name, part):
+    """Create a bpy.types.Mesh from a mesh part without going through bpy.ops.
+
+    Vertex normals are recomputed by Blender from the same geometry, so the
+    stored ``normals`` array is not written back.
+    """
+    vertices = np.asarray(part["vertices"], dtype=np.float32)
+    faces = np.asarray(part["faces"], dtype=np.int32)
+    n_triangles = len(faces)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(len(vertices))
+    mesh.vertices.foreach_set("co", vertices.ravel())
+    mesh.loops.add(n_triangles * 3)
+    mesh.loops.foreach_set("vertex_index", faces.ravel())
+    mesh.polygons.add(n_triangles)
+    mesh.polygons.foreach_set("loop_start", np.arange(0, n_triangles * 3, 3, dtype=np.int32))
+    if not bpy.types.MeshPolygon.bl_rna.properties["loop_total"].is_readonly:
+        mesh.polygons.foreach_set("loop_total", np.full(n_triangles, 3, dtype=np.int32))
+
+    if part.get("material_indices") is not None:
+        mesh.polygons.foreach_set(
+            "material_index", np.asarray(part["material_indices"], dtype=np.int32))
+    if part.get("smooth") is not None:
+        mesh.polygons.foreach_set("use_smooth", np.asarray(part["smooth"], dtype=bool))
+
+    uv_layer = mesh.uv_layers.new(name="UVMap")
+    if part.get("uvs") is not None:
+        uv_layer.data.foreach_set("uv", np.asarray(part["uvs"], dtype=np.float32).ravel())
+
+    for color in part.get("materials", []):
+        mesh.materials.append(get_color_material(color))
+
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+def cylinder_coordinates(radius, depth, vertices=32):
+    """Return the vertex coordinates of a cylinder centered at the origin along Z."""
+    angles = 2.0 * np.pi * np.arange(vertices) / vertices
+    ring = np.stack([np.cos(angles), np.sin(angles)], axis=1) * radius
+    bottom = np.column_stack([ring, np.full(vertices, -0.5 * depth)])
+    top = np.column_stack([ring, np.full(vertices, 0.5 * depth)])
+    return np.concatenate([bottom, top]).astype(np.float32)
+
+
+def create_cylinder_mesh(name, radius, depth, vertices=32):
+    """Create a cylinder mesh with the topology of bpy.ops.mesh.primitive_cylinder_add.
+
+    The sides are quads and both caps are n-gons.
+    """
+    i = np.arange(vertices, dtype=np.int32)
+    j = (i + 1) % vertices
+    sides = np.stack([i, j, j + vertices, i + vertices], axis=1).ravel()
+    top_cap = i + vertices
+    bottom_cap = i[::-1]
+    loop_vertices = np.concatenate([sides, top_cap, bottom_cap])
+    loop_start = np.concatenate([4 * i, [4 * vertices, 5 * vertices]]).astype(np.int32)
+    loop_total = np.concatenate([np.full(vertices, 4), [vertices, vertices]]).astype(np.int32)
+
+    mesh = bpy.data.meshes.new(name)
+    mesh.vertices.add(2 * vertices)
+    mesh.vertices.foreach_set("co", cylinder_coordinates(radius, depth, vertices).ravel())
+    mesh.loops.add(len(loop_vertices))
+    mesh.loops.foreach_set("vertex_index", loop_vertices)
+    mesh.polygons.add(len(loop_start))
+    mesh.polygons.foreach_set("loop_start", loop_start)
+    if not bpy.types.MeshPolygon.bl_rna.properties["loop_total"].is_readonly:
+        mesh.polygons.foreach_set("loop_total", loop_total)
+    mesh.update(calc_edges=True)
+    return mesh
+
+
+def set_cylinder_mesh_size(mesh, radius, depth):
+    """Resize a mesh made by create_cylinder_mesh in place."""
+    mesh.vertices.foreach_set(
+        "co", cylinder_coordinates(radius, depth, len(mesh.vertices) // 2).ravel())
+    mesh.update()
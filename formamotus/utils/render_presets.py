@@ -0,0 +1,122 @@
+# Every preset sets the render settings below, given as property paths from
+# the scene, and estimates its render time as overhead plus a cost per
+# megapixel of output, measured with the FormaMotus sample robot on one
+# CPU node. Freestyle outlines of the skeleton take about as long as the
+# render itself, see OUTLINE_TIME_FACTOR, so the draft preset draws
+# inverted hull outlines instead. The estimate is scaled by the measured
+# render times of this session, see record_render_time.
+RENDER_PRESETS = {
+    'DRAFT': {
+        "label": "Draft",
+        "description": "Workbench with flat colors at half resolution, for quick checks",
+        "overhead": 0.2,
+        "seconds_per_megapixel": 1.0,
+        "outline_method": 'INVERTED_HULL',
+        "settings": {
+            "render.engine": 'BLENDER_WORKBENCH',
+            "render.resolution_percentage": 50,
+            "display.render_aa": 'FXAA',
+            "display.shading.light": 'FLAT',
+            "display.shading.color_type": 'MATERIAL',
+        },
+    },
+    'PREVIEW': {
+        "label": "Preview",
+        "description": "Cycles with few adaptive samples and no denoising",
+        "overhead": 0.1,
+        "seconds_per_megapixel": 3.5,
+        "settings": {
+            "render.engine": 'CYCLES',
+            "render.resolution_percentage": 100,
+            "cycles.samples": 16,
+            "cycles.use_adaptive_sampling": True,
+            "cycles.adaptive_threshold": 0.1,
+            # Denoising a CPU render costs several times the sampling.
+            "cycles.use_denoising": False,
+            "cycles.max_bounces": 4,
+            "cycles.use_auto_tile": True,
+            "cycles.tile_size": 2048,
+        },
+    },
+    'FINAL': {
+        "label": "Final",
+        "description": "Cycles with many adaptive samples and denoising",
+        "overhead": 0.4,
+        "seconds_per_megapixel": 37.0,
+        "settings": {
+            "render.engine": 'CYCLES',
+            "render.resolution_percentage": 100,
+            "cycles.samples": 256,
+            "cycles.use_adaptive_sampling": True,
+            "cycles.adaptive_threshold": 0.01,
+            "cycles.use_denoising": True,
+            "cycles.denoiser": 'OPENIMAGEDENOISE',
+            "cycles.max_bounces": 12,
+            "cycles.use_auto_tile": True,
+            "cycles.tile_size": 2048,
+        },
+    },
+}
+
+OUTLINE_TIME_FACTOR = 2.0
+
+RENDER_PRESET_ITEMS = [
+    ('NONE', "None", "Keep the render settings of the scene"),
+    *((name, preset["label"], preset["description"]) for name, preset in RENDER_PRESETS.items()),
+]
+
+# Measured over expected render time of every preset in this session.
+_time_scales = {}
+
+
+def apply_render_preset(scene, name):
+    """Set the render settings of a preset on scene; 'NONE' changes nothing."""
+    if name == 'NONE':
+        return
+    for path, value in RENDER_PRESETS[name]["settings"].items():
+        *parents, attribute = path.split(".")
+        owner = scene
+        for parent in parents:
+            owner = getattr(owner, parent)
+        if getattr(owner, attribute) != value:
+            setattr(owner, attribute, value)
+
+
+def output_megapixels(scene):
+    scale = scene.render.resolution_percentage / 100.0
+    return scene.render.resolution_x * scene.render.resolution_y * scale * scale / 1e6
+
+
+def expected_render_time(scene, name):
+    """Return the expected seconds to render one image of scene with a preset.
+
+    Returns None for 'NONE'.
+    """
+    if name == 'NONE':
+        return None
+    preset = RENDER_PRESETS[name]
+    expected = preset["overhead"] + preset["seconds_per_megapixel"] * output_megapixels(scene)
+    if scene.render.use_freestyle:
+        expected *= OUTLINE_TIME_FACTOR
+    return expected * _time_scales.get(name, 1.0)
+
+
+def record_render_time(scene, name, seconds):
+    """Adapt the estimates of a preset to a measured render time of scene."""
+    expected = expected_render_time(scene, name)
+    if not expected:
+        return
+    scale = _time_scales.get(name, 1.0) * seconds / expected
+    # A running average keeps one slow render from skewing the estimate.
+    _time_scales[name] = 0.5 * (_time_scales.get(name, scale) + scale)
+
+
+def render_preset_outline_method(name, default):
+    """Return the skeleton outline method of a preset, default if it keeps the scene's."""
+    return default if name == 'NONE' else RENDER_PRESETS[name].get("outline_method", default)
+
+
+def render_preset_engine(name):
+    """Return the render engine a preset uses, None for 'NONE'."""
+    return None if name == 'NONE' else RENDER_PRESETS[name]["settings"]["render.engine"]
+
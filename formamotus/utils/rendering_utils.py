@@ -1,4 +1,30 @@
+import contextlib
+import os
+import tempfile
+
 import bpy
+import numpy as np
+
+PASS_OUTPUT_NODE_NAME = "FormaMotus Passes"
+LINE_ART_OBJECT_NAME = "FormaMotusLineArt"
+HULL_MODIFIER_NAME = "FormaMotus Outline"
+HULL_MATERIAL_NAME = "FormaMotusOutline"
+
+OUTLINE_METHOD_ITEMS = [
+    ('FREESTYLE', "Freestyle", "Freestyle lines, single threaded and the slowest"),
+    ('LINE_ART', "Line Art", "Grease Pencil Line Art lines drawn over the render"),
+    ('INVERTED_HULL', "Inverted Hull",
+     "A slightly larger back-facing shell around every part, nearly free to render"),
+    ('NONE', "None", "No outlines"),
+]
+
+# View layer property enabling each Render Layers pass.
+PASS_PROPERTIES = {
+    "Depth": "use_pass_z",
+    "IndexOB": "use_pass_object_index",
+    "Normal": "use_pass_normal",
+    "IndexMA": "use_pass_material_index",
+}
 
 
 def enable_freestyle(line_thickness=2.0, line_color=(0, 0, 0)):
@@ -18,3 +44,298 @@ def enable_freestyle(line_thickness=2.0, line_color=(0, 0, 0)):
     lineset.select_border = True
     lineset.select_crease = True
     lineset.select_external_contour = True
+
+
+def line_art_supported():
+    """Return whether Line Art outlines can be drawn.
+
+    Blender 4.3 replaced the Grease Pencil objects and modifiers that
+    :func:`enable_line_art` builds the outlines with.
+    """
+    return "grease_pencil_modifiers" in bpy.types.Object.bl_rna.properties
+
+
+def enable_line_art(scene, line_color=(0, 0, 0), collection=None):
+    """Draw the outlines of the visible objects of scene with Grease Pencil Line Art.
+
+    The Line Art object is created on first use and shown again by later
+    calls. Its strokes are computed on all CPU cores and drawn over the
+    render by every render engine. Their width is set by
+    :func:`set_line_art_width`. With collection, the object is linked to it
+    and only the objects of collection are outlined.
+    """
+    obj = bpy.data.objects.get(LINE_ART_OBJECT_NAME)
+    if obj is None:
+        if not line_art_supported():
+            raise RuntimeError("Line Art outlines need the Grease Pencil of Blender 4.2 or older")
+        gpencil = bpy.data.grease_pencils.new(LINE_ART_OBJECT_NAME)
+        gpencil.layers.new("Lines").frames.new(scene.frame_current)
+        material = bpy.data.materials.new(LINE_ART_OBJECT_NAME)
+        bpy.data.materials.create_gpencil_data(material)
+        gpencil.materials.append(material)
+        obj = bpy.data.objects.new(LINE_ART_OBJECT_NAME, gpencil)
+        modifier = obj.grease_pencil_modifiers.new("Line Art", 'GP_LINEART')
+        modifier.source_type = 'SCENE'
+        modifier.target_layer = "Lines"
+        modifier.target_material = material
+        modifier.use_contour = True
+        modifier.use_crease = True
+        modifier.use_loose = True
+        modifier.use_material = False
+        modifier.use_edge_mark = False
+        modifier.use_intersection = False
+    target = scene.collection if collection is None else collection
+    if target.objects.get(obj.name) is None:
+        target.objects.link(obj)
+    obj.hide_render = False
+    modifier = obj.grease_pencil_modifiers[0]
+    if collection is None:
+        modifier.source_type = 'SCENE'
+    else:
+        modifier.source_type = 'COLLECTION'
+        modifier.source_collection = collection
+    modifier.target_material.grease_pencil.color = (*line_color[:3], 1.0)
+
+
+def disable_line_art():
+    obj = bpy.data.objects.get(LINE_ART_OBJECT_NAME)
+    if obj is not None:
+        obj.hide_render = True
+
+
+def get_hull_material(line_color=(0, 0, 0)):
+    """Return the material of the inverted hulls.
+
+    Cycles has no backface culling, so the shader makes the faces of the
+    hull that point away from the camera transparent. Workbench and EEVEE
+    cull them.
+    """
+    material = bpy.data.materials.get(HULL_MATERIAL_NAME)
+    if material is None:
+        material = bpy.data.materials.new(name=HULL_MATERIAL_NAME)
+        material.use_nodes = True
+        material.use_backface_culling = True
+        nodes = material.node_tree.nodes
+        nodes.clear()
+        geometry = nodes.new("ShaderNodeNewGeometry")
+        emission = nodes.new("ShaderNodeEmission")
+        emission.name = "Emission"
+        transparent = nodes.new("ShaderNodeBsdfTransparent")
+        mix = nodes.new("ShaderNodeMixShader")
+        output = nodes.new("ShaderNodeOutputMaterial")
+        links = material.node_tree.links
+        links.new(geometry.outputs["Backfacing"], mix.inputs["Fac"])
+        links.new(emission.outputs["Emission"], mix.inputs[1])
+        links.new(transparent.outputs["BSDF"], mix.inputs[2])
+        links.new(mix.outputs["Shader"], output.inputs["Surface"])
+    color = (*line_color[:3], 1.0)
+    material.node_tree.nodes["Emission"].inputs["Color"].default_value = color
+    material.diffuse_color = color
+    return material
+
+
+def enable_inverted_hull(scene, objects, line_color=(0, 0, 0)):
+    """Outline objects with an inverted hull.
+
+    Every object gets a Solidify modifier growing a shell with flipped
+    normals around it, which only shows where it sticks out behind the
+    silhouette of the object. The shell uses the last material slot of the
+    mesh, so the meshes must be closed and use a single material. The
+    width of the shell is set by :func:`set_inverted_hull_width`.
+    """
+    material = get_hull_material(line_color)
+    for mesh in {obj.data for obj in objects}:
+        if material.name not in mesh.materials:
+            mesh.materials.append(material)
+    for obj in objects:
+        modifier = obj.modifiers.get(HULL_MODIFIER_NAME)
+        if modifier is None:
+            modifier = obj.modifiers.new(HULL_MODIFIER_NAME, 'SOLIDIFY')
+            modifier.offset = 1.0
+            modifier.use_flip_normals = True
+            modifier.use_even_offset = True
+            modifier.use_rim = False
+            modifier.show_viewport = False
+        modifier.material_offset = len(obj.data.materials) - 1
+    # Workbench only culls back faces for the whole scene.
+    scene.display.shading.show_backface_culling = True
+
+
+def meters_per_pixel(scene, point):
+    """Return the size of a pixel of the render camera of scene at a world point."""
+    camera = scene.camera
+    scale = scene.render.resolution_percentage / 100.0
+    size = max(scene.render.resolution_x, scene.render.resolution_y) * scale
+    distance = np.linalg.norm(np.asarray(camera.matrix_world.translation) - point)
+    return distance * camera.data.sensor_width / (camera.data.lens * size)
+
+
+def set_line_art_width(width):
+    """Make the Line Art strokes width meters wide."""
+    obj = bpy.data.objects.get(LINE_ART_OBJECT_NAME)
+    if obj is not None:
+        # Strokes are thickness times pixel_factor thousandths of a meter
+        # wide; the thickness is an integer, the factor can be fine.
+        obj.grease_pencil_modifiers[0].thickness = 10
+        obj.data.pixel_factor = 100.0 * width
+
+
+def set_inverted_hull_width(objects, width):
+    """Make the hulls of objects width meters thick."""
+    for obj in objects:
+        modifier = obj.modifiers.get(HULL_MODIFIER_NAME)
+        if modifier is not None and modifier.thickness != width:
+            modifier.thickness = width
+
+
+def disable_inverted_hull(scene, objects):
+    hull_enabled = False
+    for obj in objects:
+        modifier = obj.modifiers.get(HULL_MODIFIER_NAME)
+        if modifier is not None:
+            # Persistent render data misses a modifier turned off for renders.
+            obj.modifiers.remove(modifier)
+            hull_enabled = True
+    if hull_enabled:
+        scene.display.shading.show_backface_culling = False
+
+
+def fast_temp_dir():
+    # A RAM backed directory keeps the round trip through a file off the disk.
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+@contextlib.contextmanager
+def _image_settings(scene, **settings):
+    image_settings = scene.render.image_settings
+    previous = {name: getattr(image_settings, name)
+                for name in ("file_format", "color_mode", "color_depth", *settings)}
+    try:
+        for name, value in settings.items():
+            setattr(image_settings, name, value)
+        yield
+    finally:
+        # file_format first, the other settings depend on it.
+        image_settings.file_format = previous.pop("file_format")
+        for name, value in previous.items():
+            setattr(image_settings, name, value)
+
+
+def read_render_result(scene=None, linear=False):
+    """Return the last render of scene as a NumPy RGBA array, top row first.
+
+    Blender gives no access to the pixels of the Render Result, and the
+    compositor does not run Viewer nodes in background mode, so the result
+    is saved uncompressed to a RAM backed temporary file and loaded back.
+
+    Parameters
+    ----------
+    scene : bpy.types.Scene, optional
+        Scene whose color management and render result are used. Defaults
+        to the current scene.
+    linear : bool
+        Return scene linear float32 RGBA with premultiplied alpha, like an
+        OpenEXR render, instead of uint8 RGBA with straight alpha holding
+        the same values as a PNG saved by Blender.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of shape (height, width, 4).
+    """
+    scene = scene or bpy.context.scene
+    render_result = bpy.data.images.get("Render Result")
+    if render_result is None:
+        raise RuntimeError("Nothing has been rendered yet")
+    if linear:
+        settings = {"file_format": 'OPEN_EXR', "color_mode": 'RGBA', "color_depth": '32',
+                    "exr_codec": 'NONE'}
+        extension = ".exr"
+    else:
+        settings = {"file_format": 'PNG', "color_mode": 'RGBA', "color_depth": '8',
+                    "compression": 0}
+        extension = ".png"
+    fd, filepath = tempfile.mkstemp(prefix="formamotus_render_", suffix=extension,
+                                    dir=fast_temp_dir())
+    os.close(fd)
+    try:
+        with _image_settings(scene, **settings):
+            render_result.save_render(filepath, scene=scene)
+        pixels = load_image_pixels(filepath)
+    finally:
+        os.remove(filepath)
+    if linear:
+        return pixels
+    return np.round(pixels * 255.0).astype(np.uint8)
+
+
+def load_image_pixels(filepath):
+    """Return the pixels of an image file as float32 RGBA, top row first.
+
+    Byte images give their stored values divided by 255, float images their
+    values without any color conversion.
+    """
+    image = bpy.data.images.load(filepath)
+    try:
+        width, height = image.size
+        pixels = np.zeros(width * height * 4, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+    finally:
+        bpy.data.images.remove(image)
+    return np.ascontiguousarray(pixels.reshape(height, width, 4)[::-1])
+
+
+def enable_pass_outputs(scene, directory, passes=("Depth", "IndexOB")):
+    """Write render passes of scene to float OpenEXR files on every render.
+
+    Adds a File Output node fed by the Render Layers node to the compositor
+    and enables the passes on the first view layer. See
+    :func:`pass_output_filepath` for where a render writes a pass.
+
+    Parameters
+    ----------
+    scene : bpy.types.Scene
+    directory : str
+        Directory of the pass files.
+    passes : tuple of str
+        Render Layers outputs to write, any of PASS_PROPERTIES.
+    """
+    view_layer = scene.view_layers[0]
+    for pass_name in passes:
+        setattr(view_layer, PASS_PROPERTIES[pass_name], True)
+    scene.use_nodes = True
+    tree = scene.node_tree
+    render_layers = next(
+        (node for node in tree.nodes if node.bl_idname == 'CompositorNodeRLayers'), None)
+    if render_layers is None:
+        render_layers = tree.nodes.new('CompositorNodeRLayers')
+    output = tree.nodes.get(PASS_OUTPUT_NODE_NAME)
+    if output is None:
+        output = tree.nodes.new('CompositorNodeOutputFile')
+        output.name = PASS_OUTPUT_NODE_NAME
+    output.base_path = directory
+    output.format.file_format = 'OPEN_EXR'
+    output.format.color_mode = 'RGB'
+    output.format.color_depth = '32'
+    output.format.exr_codec = 'NONE'
+    output.file_slots.clear()
+    for i, pass_name in enumerate(passes):
+        output.file_slots.new(f"{pass_name}_")
+        tree.links.new(render_layers.outputs[pass_name], output.inputs[i])
+
+
+def disable_pass_outputs(scene):
+    """Remove the File Output node added by :func:`enable_pass_outputs`."""
+    if scene.node_tree is not None:
+        output = scene.node_tree.nodes.get(PASS_OUTPUT_NODE_NAME)
+        if output is not None:
+            scene.node_tree.nodes.remove(output)
+
+
+def pass_output_filepath(scene, pass_name):
+    """Return the file the last render of scene wrote a pass to."""
+    output = scene.node_tree.nodes[PASS_OUTPUT_NODE_NAME]
+    return os.path.join(
+        bpy.path.abspath(output.base_path), f"{pass_name}_{scene.frame_current:04d}.exr")
@@ -0,0 +1,212 @@
+import os
+
+import bpy
+
+ROBOT_COLLECTION_NAME = "FormaMotus"
+# Child collections of the robot collection, one per part of the robot.
+PART_COLLECTION_NAMES = {
+    'JOINTS': "FormaMotus Joints",
+    'CONNECTORS': "FormaMotus Connectors",
+    'MESHES': "FormaMotus Meshes",
+}
+
+# bpy.data collections counted by datablock_counts, in report order.
+REPORTED_DATABLOCKS = (
+    "objects", "meshes", "materials", "images", "armatures", "actions",
+    "cameras", "lights", "grease_pencils", "node_groups", "collections",
+)
+
+
+def get_robot_collection(scene):
+    """Return the collection holding the objects owned by FormaMotus.
+
+    The collection is created on first use and linked to the scene
+    collection, so a reload only has to clear it and leaves the cameras,
+    lights and props of the user alone.
+    """
+    collection = bpy.data.collections.get(ROBOT_COLLECTION_NAME)
+    if collection is None:
+        collection = bpy.data.collections.new(ROBOT_COLLECTION_NAME)
+    if scene.collection.children.get(collection.name) is None:
+        scene.collection.children.link(collection)
+    return collection
+
+
+def get_part_collection(scene, part):
+    """Return the child collection of the robot collection holding part.
+
+    Parameters
+    ----------
+    scene : bpy.types.Scene
+    part : str
+        A key of PART_COLLECTION_NAMES.
+    """
+    robot_collection = get_robot_collection(scene)
+    name = PART_COLLECTION_NAMES[part]
+    collection = bpy.data.collections.get(name)
+    if collection is None:
+        collection = bpy.data.collections.new(name)
+    if robot_collection.children.get(collection.name) is None:
+        robot_collection.children.link(collection)
+    return collection
+
+
+def exclude_part_collections(scene, excluded):
+    """Exclude or include the part collections in every view layer of scene.
+
+    An excluded collection is neither drawn nor rendered, and switching it
+    costs the same whatever the number of objects it holds.
+
+    Parameters
+    ----------
+    scene : bpy.types.Scene
+    excluded : dict
+        Part name to whether to exclude its collection.
+    """
+    for part, exclude in excluded.items():
+        collection = get_part_collection(scene, part)
+        for view_layer in scene.view_layers:
+            layer_collection = find_layer_collection(view_layer.layer_collection, collection)
+            if layer_collection is not None and layer_collection.exclude != exclude:
+                layer_collection.exclude = exclude
+
+
+def find_layer_collection(layer_collection, collection):
+    """Return the layer collection of collection below layer_collection, or None."""
+    if layer_collection.collection == collection:
+        return layer_collection
+    for child in layer_collection.children:
+        found = find_layer_collection(child, collection)
+        if found is not None:
+            return found
+    return None
+
+
+def owned_datablocks(objects):
+    """Return the data, node groups, materials, images and actions used by objects.
+
+    These are the candidates for purging once the objects are removed;
+    the ones still used elsewhere are kept. They are returned as a list of
+    sets to remove in order, see :func:`remove_orphans`.
+    """
+    data = set()
+    materials = set()
+    actions = set()
+    node_groups = set()
+    for obj in objects:
+        node_groups.update(
+            m.node_group for m in obj.modifiers if m.type == 'NODES' and m.node_group is not None)
+        if obj.data is not None:
+            data.add(obj.data)
+            materials.update(m for m in getattr(obj.data, "materials", ()) if m is not None)
+        materials.update(slot.material for slot in obj.material_slots if slot.material is not None)
+        for anim in (obj.animation_data, getattr(obj.data, "animation_data", None)):
+            if anim is not None and anim.action is not None:
+                actions.add(anim.action)
+    images = set()
+    for material in materials:
+        if material.node_tree is None:
+            continue
+        for node in material.node_tree.nodes:
+            if node.type == 'TEX_IMAGE' and node.image is not None:
+                images.add(node.image)
+    # Each stage only loses its last users once the stage before is removed.
+    return [data | actions | node_groups, materials, images]
+
+
+def remove_orphans(stages):
+    """Remove the datablocks of stages no longer used, stage by stage.
+
+    Returns
+    -------
+    int
+        Number of removed datablocks.
+    """
+    removed = 0
+    for datablocks in stages:
+        orphans = [d for d in datablocks if d.users == 0 and not d.use_fake_user]
+        bpy.data.batch_remove(orphans)
+        removed += len(orphans)
+    return removed
+
+
+def remove_objects(objects):
+    """Remove objects and purge their orphaned data.
+
+    Meshes, materials, images, armatures and actions of the removed
+    objects are removed once nothing else uses them, so repeated reloads
+    do not pile up orphan datablocks.
+
+    Returns
+    -------
+    tuple of int
+        Number of removed objects and of removed datablocks.
+    """
+    objects = list(objects)
+    stages = owned_datablocks(objects)
+    bpy.data.batch_remove(objects)
+    return len(objects), remove_orphans(stages)
+
+
+def clear_robot_collection(scene):
+    """Remove the objects of the robot collection and purge their orphaned data.
+
+    See :func:`remove_objects` for the return value.
+    """
+    collection = get_robot_collection(scene)
+    removed = remove_objects(collection.all_objects)
+    for child in list(collection.children_recursive):
+        bpy.data.collections.remove(child)
+    return removed
+
+
+def clear_other_objects(scene):
+    """Remove the objects of scene outside the robot collection, like the startup cube.
+
+    See :func:`remove_objects` for the return value.
+    """
+    owned = set(get_robot_collection(scene).all_objects)
+    return remove_objects(obj for obj in scene.objects if obj not in owned)
+
+
+def process_memory():
+    """Return the resident memory of the process in bytes, or None if unknown."""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def datablock_counts():
+    """Return the number of datablocks of every REPORTED_DATABLOCKS collection."""
+    return {name: len(getattr(bpy.data, name)) for name in REPORTED_DATABLOCKS
+            if hasattr(bpy.data, name)}
+
+
+def scene_snapshot():
+    """Return the datablock counts and the process memory, see :func:`format_scene_report`."""
+    return datablock_counts(), process_memory()
+
+
+def format_scene_report(before, after):
+    """Describe the datablock counts and memory of two scene snapshots.
+
+    Only the counts that changed are listed, as ``name before->after``.
+    """
+    counts_before, memory_before = before
+    counts_after, memory_after = after
+    changes = [f"{name} {counts_before.get(name, 0)}->{count}"
+               for name, count in counts_after.items() if count != counts_before.get(name, 0)]
+    report = ", ".join(changes) if changes else "no datablock count changed"
+    if memory_before is not None and memory_after is not None:
+        mib = 1024.0 * 1024.0
+        change = (memory_after - memory_before) / mib
+        report += f"; memory {memory_before / mib:.0f}->{memory_after / mib:.0f} MiB ({change:+.0f} MiB)"
+    return report
@@ -0,0 +1,301 @@
+import zlib
+
+import numpy as np
+
+from formamotus.utils.camera_utils import camera_intrinsics
+from formamotus.utils.camera_utils import look_at_matrix
+from formamotus.utils.camera_utils import opencv_world_to_camera
+from formamotus.utils.kinematics import align_z_matrix
+
+# Linear RGBA colors, the defaults of the joint color scene properties.
+JOINT_COLORS = {
+    'revolute': (1.0, 0.0, 0.0, 1.0),
+    'prismatic': (0.0, 1.0, 0.0, 1.0),
+    'continuous': (0.0, 0.0, 1.0, 1.0),
+    'default': (0.0, 0.0, 0.0, 1.0),
+}
+CONNECTOR_COLOR = (0.0, 0.0, 0.0, 1.0)
+OUTLINE_COLOR = (0.0, 0.0, 0.0, 1.0)
+
+
+def linear_to_srgb(color):
+    """Return the 8 bit sRGB values of a linear RGB(A) color."""
+    linear = np.clip(np.asarray(color[:3], dtype=np.float64), 0.0, 1.0)
+    srgb = np.where(
+        linear <= 0.0031308, linear * 12.92, 1.055 * np.power(linear, 1.0 / 2.4) - 0.055)
+    return tuple(int(v) for v in np.round(srgb * 255.0))
+
+
+def convex_hull(points):
+    """Return the convex hull of 2D points in counterclockwise order (monotone chain)."""
+    points = np.unique(np.asarray(points, dtype=np.float64), axis=0)
+    if len(points) < 3:
+        return points
+    points = points.tolist()
+
+    def half_hull(ordered):
+        hull = []
+        for p in ordered:
+            while len(hull) >= 2 and (
+                    (hull[-1][0] - hull[-2][0]) * (p[1] - hull[-2][1])
+                    - (hull[-1][1] - hull[-2][1]) * (p[0] - hull[-2][0])) <= 0:
+                hull.pop()
+            hull.append(p)
+        return hull[:-1]
+
+    return np.array(half_hull(points) + half_hull(reversed(points)))
+
+
+class SkeletonSketch:
+    """Kinematic skeleton of a KinematicTree drawn as depth sorted 2D shapes.
+
+    These are the parts RobotVisualizerOperator builds when meshes are off:
+    a cylinder along the axis of every non-fixed joint, and a connector from
+    the link of every such joint to the closest ancestor link with a
+    non-fixed joint, or the root link. They are projected with the pinhole
+    model of a Blender camera, see
+    formamotus.utils.camera_utils.camera_intrinsics, without Blender.
+
+    Parameters
+    ----------
+    tree : formamotus.utils.kinematics.KinematicTree
+    cylinder_radius, cylinder_height, connector_radius : float
+        Sizes in meters, the defaults of the matching scene properties.
+    vertices : int
+        Points on the outline of every cylinder cap.
+    """
+
+    def __init__(self, tree, cylinder_radius=0.03, cylinder_height=0.15,
+                 connector_radius=0.009, vertices=32):
+        self.tree = tree
+        self.cylinder_radius = cylinder_radius
+        self.cylinder_height = cylinder_height
+        self.connector_radius = connector_radius
+        joint_links = []
+        joint_types = []
+        offsets = []
+        starts = []
+        # Closest link with a non-fixed joint at or above every link.
+        joint_ancestors = np.zeros(len(tree.links), dtype=np.int64)
+        for i, link in enumerate(tree.links):
+            parent = tree.parents[i]
+            start = joint_ancestors[parent] if parent >= 0 else 0
+            joint_ancestors[i] = start
+            if link.joint is not None and link.joint.type != 'fixed':
+                joint_links.append(i)
+                joint_types.append(link.joint.type)
+                offsets.append(align_z_matrix(link.joint.axis))
+                starts.append(start)
+                joint_ancestors[i] = i
+        self.joint_links = np.array(joint_links, dtype=np.int64)
+        self.joint_types = joint_types
+        self.cylinder_offsets = np.array(offsets, dtype=np.float64).reshape(-1, 4, 4)
+        self.connector_starts = np.array(starts, dtype=np.int64)
+        self.connector_ends = self.joint_links
+
+        angles = 2.0 * np.pi * np.arange(vertices) / vertices
+        ring = np.stack([np.cos(angles), np.sin(angles), np.zeros(vertices)], axis=1)
+        # (2, vertices, 3) bottom and top cap outlines of the cylinder.
+        self.cap_points = np.stack([
+            ring * cylinder_radius + (0.0, 0.0, -0.5 * cylinder_height),
+            ring * cylinder_radius + (0.0, 0.0, 0.5 * cylinder_height),
+        ])
+
+    def bounds(self, world_transforms):
+        """Return the center and the largest extent of the joints, like robot_bounds."""
+        link_indices = self.joint_links
+        if not len(link_indices):
+            link_indices = np.arange(len(world_transforms))
+        positions = world_transforms[link_indices, :3, 3]
+        min_coords = positions.min(axis=0)
+        max_coords = positions.max(axis=0)
+        return (min_coords + max_coords) / 2, np.max(max_coords - min_coords)
+
+    def default_camera(self, world_transforms):
+        """Return the camera matrix of the automatic framing of setup_camera_and_light."""
+        center, size = self.bounds(world_transforms)
+        return look_at_matrix(center + size * 2, center)
+
+    def shapes(self, world_transforms, camera_matrix, width, height, lens=35.0,
+               sensor_width=36.0, joint_colors=None, line_width=3.0):
+        """Return the shapes of the skeleton seen by a camera, farthest first.
+
+        Parameters
+        ----------
+        world_transforms : numpy.ndarray
+            (N, 4, 4) world transforms of the tree links, as returned by
+            KinematicTree.forward_kinematics.
+        camera_matrix : numpy.ndarray
+            4x4 world matrix of a Blender camera, see look_at_matrix.
+        width, height : int
+            Image size in pixels.
+        lens, sensor_width : float
+            Focal length and sensor width in millimeters.
+        joint_colors : dict, optional
+            Linear RGBA color of every joint type, see JOINT_COLORS.
+        line_width : float
+            Width of the outlines in pixels.
+
+        Returns
+        -------
+        list of dict
+            Shapes with the keys ``kind``, ``'polygon'`` (filled and
+            outlined), ``'outline'`` (closed, not filled) or ``'line'``;
+            ``points``, the (K, 2) pixel coordinates from the top left
+            corner; ``fill`` and ``stroke``, linear RGBA colors or None;
+            ``width``, the stroke width; and ``depth``, the distance along
+            the view axis.
+        """
+        joint_colors = {**JOINT_COLORS, **(joint_colors or {})}
+        intrinsics = camera_intrinsics(lens, sensor_width, width, height)
+        world_to_camera = opencv_world_to_camera(camera_matrix)
+        camera_location = np.asarray(camera_matrix)[:3, 3]
+
+        def to_camera(points):
+            return points @ world_to_camera[:3, :3].T + world_to_camera[:3, 3]
+
+        focal = intrinsics[[0, 1], [0, 1]]
+
+        def project(points):
+            return points[..., :2] / points[..., 2:3] * focal + intrinsics[:2, 2]
+
+        shapes = []
+        cylinders = world_transforms[self.joint_links] @ self.cylinder_offsets
+        rotations = cylinders[:, None, None, :3, :3]
+        cap_world = (rotations @ self.cap_points[None, :, :, :, None])[..., 0]
+        cap_world += cylinders[:, None, None, :3, 3]
+        cap_camera = to_camera(cap_world)
+        centers = to_camera(cylinders[:, :3, 3])
+        # The cap facing the camera gets its edge drawn, like a crease line.
+        axes = cylinders[:, :3, 2]
+        half_heights = 0.5 * self.cylinder_height * axes
+        facing_top = np.einsum(
+            'ij,ij->i', axes, camera_location - cylinders[:, :3, 3] - half_heights)
+        facing_bottom = np.einsum(
+            'ij,ij->i', -axes, camera_location - cylinders[:, :3, 3] + half_heights)
+        for i, joint_type in enumerate(self.joint_types):
+            if np.any(cap_camera[i, :, :, 2] <= 0.0):
+                continue
+            caps = project(cap_camera[i])
+            color = joint_colors.get(joint_type, joint_colors['default'])
+            shapes.append({
+                "kind": 'polygon', "points": convex_hull(caps.reshape(-1, 2)), "fill": color,
+                "stroke": OUTLINE_COLOR, "width": line_width, "depth": centers[i, 2],
+            })
+            for cap, facing in ((0, facing_bottom[i]), (1, facing_top[i])):
+                if facing > 0.0:
+                    shapes.append({
+                        "kind": 'outline', "points": caps[cap], "fill": None,
+                        "stroke": OUTLINE_COLOR, "width": line_width, "depth": centers[i, 2],
+                    })
+
+        starts = to_camera(world_transforms[self.connector_starts, :3, 3])
+        ends = to_camera(world_transforms[self.connector_ends, :3, 3])
+        lengths = np.linalg.norm(ends - starts, axis=1)
+        for start, end, length in zip(starts, ends, lengths):
+            if length <= 1e-6 or start[2] <= 0.0 or end[2] <= 0.0:
+                continue
+            diameter = 4.0 * self.connector_radius * intrinsics[0, 0] / (start[2] + end[2])
+            # Connectors end inside the joint cylinders, so they are drawn
+            # before the cylinder at their farther end.
+            shapes.append({
+                "kind": 'line', "points": project(np.stack([start, end])), "fill": None,
+                "stroke": CONNECTOR_COLOR, "width": diameter + line_width,
+                "depth": max(start[2], end[2]) + 1e-6,
+            })
+        shapes.sort(key=lambda shape: -shape["depth"])
+        return shapes
+
+
+def _svg_color(color):
+    return "#{:02x}{:02x}{:02x}".format(*linear_to_srgb(color))
+
+
+def _svg_points(points):
+    return " ".join(f"{x:.2f},{y:.2f}" for x, y in points)
+
+
+def skeleton_svg(shapes, width, height, background=None):
+    """Return SVG text drawing shapes as returned by SkeletonSketch.shapes.
+
+    background is a linear RGBA color; the background stays transparent
+    without it.
+    """
+    size = f'width="{width}" height="{height}" viewBox="0 0 {width} {height}"'
+    lines = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        f'<svg xmlns="http://www.w3.org/2000/svg" {size}>',
+    ]
+    if background is not None:
+        lines.append(f'<rect width="100%" height="100%" fill="{_svg_color(background)}"/>')
+    lines.append('<g stroke-linejoin="round" stroke-linecap="round">')
+    for shape in shapes:
+        stroke = f'stroke="{_svg_color(shape["stroke"])}" stroke-width="{shape["width"]:.2f}"'
+        if shape["kind"] == 'line':
+            (x1, y1), (x2, y2) = shape["points"]
+            lines.append(f'<line x1="{x1:.2f}" y1="{y1:.2f}" x2="{x2:.2f}" y2="{y2:.2f}" {stroke}/>')
+        else:
+            fill = _svg_color(shape["fill"]) if shape["fill"] is not None else "none"
+            lines.append(f'<polygon points="{_svg_points(shape["points"])}" fill="{fill}" {stroke}/>')
+    lines.append('</g>')
+    lines.append('</svg>')
+    return "\n".join(lines) + "\n"
+
+
+def _pdf_color(color, operator):
+    r, g, b = (v / 255.0 for v in linear_to_srgb(color))
+    return f"{r:.3f} {g:.3f} {b:.3f} {operator}"
+
+
+def skeleton_pdf(shapes, width, height, background=None):
+    """Return a one page PDF drawing shapes as returned by SkeletonSketch.shapes.
+
+    One pixel becomes one point. background is a linear RGBA color; the
+    page stays transparent without it.
+    """
+    ops = ["1 J 1 j"]
+    if background is not None:
+        ops.append(f"{_pdf_color(background, 'rg')} 0 0 {width} {height} re f")
+    for shape in shapes:
+        # PDF puts the origin at the bottom left corner.
+        path = [f"{x:.2f} {height - y:.2f}" for x, y in shape["points"]]
+        ops.append(f"{_pdf_color(shape['stroke'], 'RG')} {shape['width']:.2f} w")
+        ops.append(f"{path[0]} m " + " ".join(f"{p} l" for p in path[1:]))
+        if shape["kind"] == 'line':
+            ops.append("S")
+        elif shape["fill"] is None:
+            ops.append("h S")
+        else:
+            ops.append(f"{_pdf_color(shape['fill'], 'rg')} h B")
+    content = zlib.compress("\n".join(ops).encode("ascii"))
+
+    media_box = f"/MediaBox [0 0 {width} {height}]"
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        f"<< /Type /Page /Parent 2 0 R {media_box} /Contents 4 0 R /Resources << >> >>".encode(),
+        f"<< /Length {len(content)} /Filter /FlateDecode >>\nstream\n".encode("ascii")
+        + content + b"\nendstream",
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode("ascii") + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode("ascii")
+    pdf += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n".encode("ascii")
+    pdf += f"startxref\n{xref}\n%%EOF\n".encode("ascii")
+    return bytes(pdf)
+
+
+def write_skeleton(filepath, shapes, width, height, background=None):
+    """Write shapes as PDF if filepath ends with ``.pdf``, else as SVG."""
+    if filepath.lower().endswith(".pdf"):
+        with open(filepath, "wb") as f:
+            f.write(skeleton_pdf(shapes, width, height, background))
+    else:
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write(skeleton_svg(shapes, width, height, background))
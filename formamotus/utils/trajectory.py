@@ -0,0 +1,315 @@
+import csv
+import hashlib
+import itertools
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+# Column names recognized as the sample timestamps of a CSV trajectory.
+TIME_COLUMNS = ("time", "times", "timestamp", "timestamps", "stamp", "t")
+
+
+def default_trajectory_cache_dir():
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "formamotus", "trajectories")
+
+
+def _csv_columns(filepath, header_line):
+    """Return the time column, the joint columns and the names of a CSV header."""
+    header = next(csv.reader([header_line]), None)
+    if not header:
+        raise ValueError(f"{filepath} has no header row of joint names")
+    header = [name.strip() for name in header]
+    time_columns = [i for i, name in enumerate(header) if name.lower() in TIME_COLUMNS]
+    time_column = time_columns[0] if time_columns else None
+    joint_columns = [i for i in range(len(header)) if i not in time_columns]
+    return time_column, joint_columns, header
+
+
+def _read_csv_rows(filepath, lines, n_columns, max_rows=None):
+    data = np.loadtxt(
+        itertools.islice(lines, max_rows), delimiter=",", ndmin=2, dtype=np.float64)
+    if data.size and data.shape[1] != n_columns:
+        raise ValueError(
+            f"{filepath} has {data.shape[1]} columns but {n_columns} names in its header")
+    return data.reshape(-1, n_columns)
+
+
+def _load_csv_trajectory(filepath):
+    with open(filepath, newline="") as f:
+        time_column, joint_columns, header = _csv_columns(filepath, f.readline())
+        data = _read_csv_rows(filepath, (line for line in f if line.strip()), len(header))
+    times = None if time_column is None else data[:, time_column]
+    return [header[i] for i in joint_columns], times, data[:, joint_columns]
+
+
+def _load_npz_trajectory(filepath):
+    with np.load(filepath, allow_pickle=False) as data:
+        if "joint_names" not in data:
+            raise ValueError(f"{filepath} has no 'joint_names' array")
+        joint_names = [str(name) for name in data["joint_names"]]
+        for key in ("positions", "joint_positions", "q"):
+            if key in data:
+                positions = np.asarray(data[key], dtype=np.float64)
+                break
+        else:
+            raise ValueError(f"{filepath} has no 'positions' array")
+        times = None
+        for key in ("times", "timestamps", "time"):
+            if key in data:
+                times = np.asarray(data[key], dtype=np.float64).reshape(-1)
+                break
+    positions = positions.reshape(len(positions), -1)
+    if positions.shape[1] != len(joint_names):
+        raise ValueError(
+            f"{filepath} has {positions.shape[1]} joint columns but {len(joint_names)} joint names")
+    return joint_names, times, positions
+
+
+def load_trajectory(filepath):
+    """Load a recorded joint trajectory.
+
+    A CSV file has a header row naming its columns, one of which may hold the
+    timestamps (``time``, ``timestamp``, ``stamp`` or ``t``); every other
+    column is a joint. An ``.npz`` file holds a ``joint_names`` string array,
+    an (S, K) ``positions`` array and optionally an (S,) ``times`` array.
+    Joint angles are in radians and joint positions in meters.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to a ``.csv`` or ``.npz`` file.
+
+    Returns
+    -------
+    joint_names : list of str
+        Names of the K joints in the file.
+    times : numpy.ndarray or None
+        (S,) timestamps in seconds, or None if the file has none.
+    positions : numpy.ndarray
+        (S, K) joint values.
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension == ".npz":
+        joint_names, times, positions = _load_npz_trajectory(filepath)
+    elif extension in (".csv", ".txt"):
+        joint_names, times, positions = _load_csv_trajectory(filepath)
+    else:
+        raise ValueError(f"Unsupported trajectory file type: {extension}")
+    if times is not None and len(times) != len(positions):
+        raise ValueError(
+            f"{filepath} has {len(times)} timestamps for {len(positions)} samples")
+    return joint_names, times, positions
+
+
+def trajectory_joint_values(tree, joint_names, positions, default_values):
+    """Arrange trajectory columns as joint values of a KinematicTree.
+
+    Parameters
+    ----------
+    tree : formamotus.utils.kinematics.KinematicTree
+        Tree the joint values are for.
+    joint_names : list of str
+        Joint name of every column of positions.
+    positions : numpy.ndarray
+        (S, K) joint values of the trajectory.
+    default_values : numpy.ndarray
+        Values of the joints missing from the trajectory, ordered as
+        ``tree.joint_names``.
+
+    Returns
+    -------
+    joint_values : numpy.ndarray
+        (S, J) joint values ordered as ``tree.joint_names``.
+    unknown_names : list of str
+        Trajectory joints the tree does not have; their columns are ignored.
+    """
+    joint_values = np.tile(np.asarray(default_values, dtype=np.float64), (len(positions), 1))
+    unknown_names = []
+    for column, name in enumerate(joint_names):
+        j = tree.joint_position.get(name)
+        if j is None:
+            unknown_names.append(name)
+        else:
+            joint_values[:, j] = positions[:, column]
+    return joint_values, unknown_names
+
+
+def _check_times(times, previous=None):
+    if previous is not None and len(times):
+        times = np.concatenate([[previous], times])
+    if np.any(np.diff(times) <= 0):
+        raise ValueError("Trajectory timestamps must be strictly increasing")
+
+
+def _convert_csv_trajectory(filepath, entry_dir, chunk_size):
+    with open(filepath, newline="") as f:
+        time_column, joint_columns, header = _csv_columns(filepath, f.readline())
+        n_samples = sum(1 for line in f if line.strip())
+    positions = np.lib.format.open_memmap(
+        os.path.join(entry_dir, "positions.npy"), mode="w+", dtype=np.float64,
+        shape=(n_samples, len(joint_columns)))
+    times = None
+    if time_column is not None:
+        times = np.lib.format.open_memmap(
+            os.path.join(entry_dir, "times.npy"), mode="w+", dtype=np.float64,
+            shape=(n_samples,))
+    with open(filepath, newline="") as f:
+        f.readline()
+        lines = (line for line in f if line.strip())
+        begin = 0
+        while begin < n_samples:
+            data = _read_csv_rows(filepath, lines, len(header), chunk_size)
+            if len(data) == 0:
+                break
+            end = begin + len(data)
+            positions[begin:end] = data[:, joint_columns]
+            if times is not None:
+                _check_times(data[:, time_column], times[begin - 1] if begin else None)
+                times[begin:end] = data[:, time_column]
+            begin = end
+    positions.flush()
+    if times is not None:
+        times.flush()
+    return [header[i] for i in joint_columns]
+
+
+def open_trajectory(filepath, cache_dir=None, chunk_size=65536):
+    """Return a trajectory as memory-mapped arrays, converting it on first use.
+
+    The joint values and timestamps of filepath are written once to ``.npy``
+    files in cache_dir and memory-mapped from there, so only the pages that
+    are read stay in memory however long the trajectory is. CSV files are
+    converted chunk_size rows at a time. The conversion is redone when the
+    size or modification time of filepath changes.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to a ``.csv`` or ``.npz`` file, see :func:`load_trajectory`.
+    cache_dir : str, optional
+        Directory of the converted arrays. Defaults to
+        :func:`default_trajectory_cache_dir`.
+    chunk_size : int
+        Number of CSV rows parsed at once.
+
+    Returns
+    -------
+    joint_names : list of str
+        Names of the K joints in the file.
+    times : numpy.memmap or None
+        (S,) increasing timestamps in seconds, or None if the file has none.
+    positions : numpy.memmap
+        (S, K) joint values.
+    """
+    cache_dir = cache_dir or default_trajectory_cache_dir()
+    realpath = os.path.realpath(filepath)
+    stat = os.stat(realpath)
+    source = {"path": realpath, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    entry_dir = os.path.join(cache_dir, hashlib.sha1(realpath.encode()).hexdigest())
+    meta_path = os.path.join(entry_dir, "meta.json")
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        meta = None
+
+    if meta is None or meta.get("source") != source:
+        extension = os.path.splitext(filepath)[1].lower()
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp_", dir=cache_dir)
+        try:
+            if extension in (".csv", ".txt"):
+                joint_names = _convert_csv_trajectory(filepath, tmp_dir, chunk_size)
+            else:
+                joint_names, times, positions = load_trajectory(filepath)
+                if times is not None:
+                    _check_times(times)
+                    np.save(os.path.join(tmp_dir, "times.npy"), times)
+                np.save(os.path.join(tmp_dir, "positions.npy"), positions)
+                del times, positions
+            meta = {"source": source, "joint_names": joint_names}
+            # meta.json is written last; an entry without it is never loaded.
+            with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            if os.path.exists(entry_dir):
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    times_path = os.path.join(entry_dir, "times.npy")
+    times = np.load(times_path, mmap_mode="r") if os.path.exists(times_path) else None
+    positions = np.load(os.path.join(entry_dir, "positions.npy"), mmap_mode="r")
+    return list(meta["joint_names"]), times, positions
+
+
+def trajectory_sample(positions, frame, times=None, fps=None, frame_start=1):
+    """Return the trajectory joint values at a frame.
+
+    Values are linearly interpolated between the two samples around frame
+    and held at the first and last sample outside the trajectory. Only
+    those two rows of positions, and a binary search of times, are read.
+
+    Parameters
+    ----------
+    positions : numpy.ndarray
+        (S, K) joint values, possibly memory-mapped.
+    frame : float
+        Scene frame, may be fractional.
+    times, fps, frame_start
+        Placement of the samples on the timeline, see
+        :func:`trajectory_frames`.
+
+    Returns
+    -------
+    numpy.ndarray
+        (K,) joint values.
+    """
+    n_samples = len(positions)
+    if n_samples == 1:
+        return np.array(positions[0], dtype=np.float64)
+    if times is None or fps is None:
+        position = frame - frame_start
+    else:
+        t = times[0] + (frame - frame_start) / fps
+        i = int(np.clip(np.searchsorted(times, t, side="right") - 1, 0, n_samples - 2))
+        position = i + (t - times[i]) / (times[i + 1] - times[i])
+    position = min(max(position, 0.0), n_samples - 1.0)
+    i = min(int(position), n_samples - 2)
+    alpha = position - i
+    return (1.0 - alpha) * positions[i] + alpha * positions[i + 1]
+
+
+def trajectory_frames(n_samples, times=None, fps=None, frame_start=1):
+    """Return the scene frame of every trajectory sample.
+
+    Without times or fps every sample gets its own frame. Otherwise samples
+    are placed at their timestamp, relative to the first one, and may fall
+    between frames.
+
+    Parameters
+    ----------
+    n_samples : int
+        Number of samples.
+    times : numpy.ndarray, optional
+        (S,) increasing timestamps in seconds.
+    fps : float, optional
+        Scene frame rate.
+    frame_start : float
+        Frame of the first sample.
+
+    Returns
+    -------
+    numpy.ndarray
+        (S,) frames.
+    """
+    if times is None or fps is None:
+        return frame_start + np.arange(n_samples, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+    _check_times(times)
+    return frame_start + (times - times[0]) * fps
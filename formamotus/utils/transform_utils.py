@@ -0,0 +1,166 @@
+import bpy
+import numpy as np
+
+from formamotus.utils.kinematics import matrices_to_quaternions
+
+
+def set_object_transform(obj, matrix, scale=None):
+    """Set the location and quaternion rotation of an object from a 4x4 matrix.
+
+    The object's transform is relative to its parent, if it has one.
+    """
+    obj.rotation_mode = 'QUATERNION'
+    obj.location = matrix[:3, 3]
+    obj.rotation_quaternion = matrices_to_quaternions(matrix[:3, :3])[0]
+    if scale is not None:
+        obj.scale = scale
+
+
+# Writes touching fewer objects than this fraction of bpy.data.objects assign
+# them one by one; above it, round-tripping the whole collection and tagging
+# the written objects is cheaper.
+PER_OBJECT_WRITE_FRACTION = 0.1
+
+
+class ObjectTransformWriter:
+    """Write the transforms of many objects at once with foreach_set.
+
+    ``bpy.data.objects`` is read and written as a whole, which is much faster
+    than assigning location and rotation object by object once a sizable
+    part of the collection changes. Smaller writes, like a slider moving a
+    hand, assign the few objects directly and leave the rest of the
+    collection alone. Objects written in bulk are tagged for the depsgraph,
+    which foreach_set does not do, so their world matrices follow.
+
+    The position of each object in ``bpy.data.objects`` is resolved when the
+    writer is built, and a new writer is built on every reload. Adding,
+    removing or renaming objects reorders the collection, so the bulk path
+    checks the cached positions against ``session_uid`` and looks them up
+    again if needed. Blender versions without ``ID.session_uid`` always
+    assign object by object.
+
+    Parameters
+    ----------
+    objects : list of bpy.types.Object
+        Objects to write. Their rotation mode is switched to quaternions.
+    """
+
+    def __init__(self, objects):
+        self.objects = list(objects)
+        for obj in self.objects:
+            obj.rotation_mode = 'QUATERNION'
+        self._use_foreach = 'session_uid' in bpy.types.ID.bl_rna.properties
+        self._session_uids = None
+        self._indices = None
+        if self._use_foreach:
+            self._session_uids = np.array([obj.session_uid for obj in self.objects], dtype=np.int32)
+            self._resolve_indices(self._collection_session_uids())
+
+    def __len__(self):
+        return len(self.objects)
+
+    @staticmethod
+    def _collection_session_uids():
+        session_uids = np.zeros(len(bpy.data.objects), dtype=np.int32)
+        bpy.data.objects.foreach_get("session_uid", session_uids)
+        return session_uids
+
+    def _resolve_indices(self, session_uids):
+        index_of = {uid: i for i, uid in enumerate(session_uids.tolist())}
+        self._indices = np.array(
+            [index_of[uid] for uid in self._session_uids.tolist()], dtype=np.int64)
+
+    def _object_indices(self):
+        session_uids = self._collection_session_uids()
+        if (self._indices.max(initial=-1) >= len(session_uids)
+                or not np.array_equal(session_uids[self._indices], self._session_uids)):
+            self._resolve_indices(session_uids)
+        return self._indices
+
+    def _write(self, prop_name, width, indices, values):
+        array = np.zeros(len(bpy.data.objects) * width, dtype=np.float32)
+        bpy.data.objects.foreach_get(prop_name, array)
+        array = array.reshape(-1, width)
+        array[indices] = values
+        bpy.data.objects.foreach_set(prop_name, array.ravel())
+
+    def _write_objects(self, locations, quaternions, scales, subset):
+        for row, i in enumerate(subset):
+            obj = self.objects[i]
+            obj.location = locations[row]
+            obj.rotation_quaternion = quaternions[row]
+            if scales is not None:
+                obj.scale = scales[row]
+
+    def write(self, locations, quaternions, scales=None, subset=None):
+        """Set the location, rotation and optionally the scale of the objects.
+
+        Parameters
+        ----------
+        locations : numpy.ndarray
+            (N, 3) locations.
+        quaternions : numpy.ndarray
+            (N, 4) wxyz rotations.
+        scales : numpy.ndarray, optional
+            (N, 3) scales. The scale is left untouched if not given.
+        subset : numpy.ndarray, optional
+            Positions in ``objects`` the rows of the arrays belong to.
+            Defaults to all objects.
+        """
+        if subset is None:
+            subset = np.arange(len(self.objects))
+        if len(subset) == 0:
+            return
+        if (not self._use_foreach
+                or len(subset) < PER_OBJECT_WRITE_FRACTION * len(bpy.data.objects)):
+            self._write_objects(locations, quaternions, scales, subset)
+            return
+        indices = self._object_indices()[subset]
+        self._write("location", 3, indices, locations)
+        self._write("rotation_quaternion", 4, indices, quaternions)
+        if scales is not None:
+            self._write("scale", 3, indices, scales)
+        # foreach_set does not tag what it writes, unlike assignments.
+        for i in subset:
+            self.objects[i].update_tag()
+
+
+class SplitTransformWriter:
+    """Write rows of transforms through several writers, each owning some rows.
+
+    Parameters
+    ----------
+    n_rows : int
+        Total number of rows.
+    writers : list of tuple
+        ``(rows, writer)`` pairs. The i-th item of writer is placed by row
+        ``rows[i]``. The writers need the ``write`` method of
+        :class:`ObjectTransformWriter`.
+    """
+
+    def __init__(self, n_rows, writers):
+        self.writers = [writer for _, writer in writers]
+        self._owners = np.full(n_rows, -1, dtype=np.int64)
+        self._positions = np.zeros(n_rows, dtype=np.int64)
+        for i, (rows, _) in enumerate(writers):
+            self._owners[rows] = i
+            self._positions[rows] = np.arange(len(rows))
+
+    def __len__(self):
+        return len(self._owners)
+
+    def write(self, locations, quaternions, scales=None, subset=None):
+        """Pass the rows of the arrays on to the writers owning them.
+
+        See :meth:`ObjectTransformWriter.write` for the parameters.
+        """
+        if subset is None:
+            subset = np.arange(len(self))
+        subset = np.asarray(subset, dtype=np.int64)
+        for i, writer in enumerate(self.writers):
+            mine = self._owners[subset] == i
+            if not mine.any():
+                continue
+            writer.write(
+                locations[mine], quaternions[mine],
+                None if scales is None else scales[mine], self._positions[subset[mine]])
@@ -0,0 +1,72 @@
+import pytest
+from skrobot.model import RobotModel
+
+from formamotus.utils.kinematics import KinematicTree
+
+# A branching tree with every joint type, a fixed joint and a mimic joint.
+URDF = """<?xml version="1.0"?>
+<robot name="tree">
+  <link name="base"/>
+  <link name="torso"/>
+  <link name="arm"/>
+  <link name="forearm"/>
+  <link name="hand"/>
+  <link name="finger"/>
+  <link name="slider"/>
+  <link name="wheel"/>
+  <joint name="torso_joint" type="revolute">
+    <parent link="base"/><child link="torso"/>
+    <origin xyz="0 0 0.5" rpy="0 0 0.3"/><axis xyz="0 0 1"/>
+    <limit lower="-2" upper="2" effort="1" velocity="1"/>
+  </joint>
+  <joint name="arm_joint" type="revolute">
+    <parent link="torso"/><child link="arm"/>
+    <origin xyz="0.1 0 0.2" rpy="0.2 0 0"/><axis xyz="0 1 1"/>
+    <limit lower="-2" upper="2" effort="1" velocity="1"/>
+  </joint>
+  <joint name="forearm_joint" type="revolute">
+    <parent link="arm"/><child link="forearm"/>
+    <origin xyz="0 0 0.3"/><axis xyz="1 0 0"/>
+    <limit lower="-2" upper="2" effort="1" velocity="1"/>
+  </joint>
+  <joint name="hand_joint" type="fixed">
+    <parent link="forearm"/><child link="hand"/>
+    <origin xyz="0 0.05 0.25" rpy="0.1 0.2 0.3"/>
+  </joint>
+  <joint name="finger_joint" type="revolute">
+    <parent link="hand"/><child link="finger"/>
+    <origin xyz="0 0 0.05"/><axis xyz="0 1 0"/>
+    <limit lower="-2" upper="2" effort="1" velocity="1"/>
+    <mimic joint="forearm_joint" multiplier="-0.5" offset="0.1"/>
+  </joint>
+  <joint name="slider_joint" type="prismatic">
+    <parent link="torso"/><child link="slider"/>
+    <origin xyz="-0.1 0 0.1"/><axis xyz="0 0 1"/>
+    <limit lower="0" upper="0.2" effort="1" velocity="1"/>
+  </joint>
+  <joint name="wheel_joint" type="continuous">
+    <parent link="base"/><child link="wheel"/>
+    <origin xyz="0.2 0 0" rpy="1.5707963 0 0"/><axis xyz="0 0 1"/>
+  </joint>
+</robot>
+"""
+
+
+@pytest.fixture(scope="session")
+def urdf_path(tmp_path_factory):
+    urdf_path = tmp_path_factory.mktemp("urdf") / "tree.urdf"
+    urdf_path.write_text(URDF)
+    return str(urdf_path)
+
+
+@pytest.fixture(scope="module")
+def robot_model(urdf_path):
+    robot_model = RobotModel()
+    robot_model.load_urdf_file(urdf_path)
+    robot_model.init_pose()
+    return robot_model
+
+
+@pytest.fixture(scope="module")
+def tree(robot_model):
+    return KinematicTree(robot_model)
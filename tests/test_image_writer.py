@@ -0,0 +1,95 @@
+import io
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from formamotus.utils.image_writer import AsyncImageWriter
+from formamotus.utils.image_writer import encode_png
+from formamotus.utils.image_writer import write_image
+
+CHANNELS = {0: 1, 4: 2, 2: 3, 6: 4}
+
+
+def decode_png(data):
+    """Decode the PNG images encode_png writes, checking every chunk CRC."""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    chunks = {}
+    offset = 8
+    while offset < len(data):
+        (length,) = struct.unpack(">I", data[offset:offset + 4])
+        chunk = data[offset + 4:offset + 8 + length]
+        (crc,) = struct.unpack(">I", data[offset + 8 + length:offset + 12 + length])
+        assert zlib.crc32(chunk) == crc
+        chunks.setdefault(chunk[:4], b"")
+        chunks[chunk[:4]] += chunk[4:]
+        offset += 12 + length
+    assert b"IEND" in chunks
+    width, height, bit_depth, color_type, _, _, _ = struct.unpack(">IIBBBBB", chunks[b"IHDR"])
+    channels = CHANNELS[color_type]
+    raw = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8).reshape(height, -1)
+    rows = np.zeros((height, raw.shape[1] - 1), dtype=np.uint8)
+    for y in range(height):
+        assert raw[y, 0] in (0, 2)
+        rows[y] = raw[y, 1:]
+        if raw[y, 0] == 2 and y > 0:
+            rows[y] += rows[y - 1]
+    if bit_depth == 16:
+        return rows.view(">u2").reshape(height, width, channels).astype(np.uint16)
+    return rows.reshape(height, width, channels)
+
+
+def random_image(shape, dtype, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, np.iinfo(dtype).max, size=shape, endpoint=True, dtype=dtype)
+
+
+@pytest.mark.parametrize("dtype", [np.uint8, np.uint16])
+@pytest.mark.parametrize("channels", [1, 2, 3, 4])
+def test_encode_png_round_trip(dtype, channels):
+    pixels = random_image((5, 7, channels), dtype)
+    np.testing.assert_array_equal(decode_png(encode_png(pixels)), pixels)
+
+
+def test_encode_png_gray_image():
+    pixels = random_image((4, 3), np.uint8)
+    np.testing.assert_array_equal(decode_png(encode_png(pixels))[..., 0], pixels)
+
+
+@pytest.mark.parametrize("channels", [1, 3, 4])
+def test_encode_png_reads_back_with_pillow(channels):
+    image = pytest.importorskip("PIL.Image")
+    pixels = random_image((6, 9, channels), np.uint8)
+    decoded = np.asarray(image.open(io.BytesIO(encode_png(pixels, compression=9))))
+    np.testing.assert_array_equal(decoded.reshape(pixels.shape), pixels)
+
+
+@pytest.mark.parametrize("pixels", [
+    np.zeros((2, 2, 5), dtype=np.uint8),
+    np.zeros((2, 2, 2, 2), dtype=np.uint8),
+    np.zeros((2, 2, 3), dtype=np.float32),
+])
+def test_encode_png_rejects_unsupported_images(pixels):
+    with pytest.raises(ValueError):
+        encode_png(pixels)
+
+
+def test_write_image_by_extension(tmp_path):
+    pixels = random_image((4, 4, 4), np.uint8)
+    write_image(str(tmp_path / "image.png"), pixels)
+    np.testing.assert_array_equal(decode_png((tmp_path / "image.png").read_bytes()), pixels)
+    write_image(str(tmp_path / "image.npz"), pixels)
+    with np.load(tmp_path / "image.npz") as data:
+        np.testing.assert_array_equal(data["pixels"], pixels)
+
+
+def test_async_image_writer(tmp_path):
+    images = [random_image((8, 8, 4), np.uint8, seed=i) for i in range(6)]
+    with AsyncImageWriter(max_workers=2, max_pending=2) as writer:
+        futures = [writer.submit(str(tmp_path / "out" / f"{i}.png"), pixels)
+                   for i, pixels in enumerate(images)]
+    for i, (future, pixels) in enumerate(zip(futures, images)):
+        assert future.result() >= 0.0
+        decoded = decode_png((tmp_path / "out" / f"{i}.png").read_bytes())
+        np.testing.assert_array_equal(decoded, pixels)
@@ -0,0 +1,58 @@
+import bpy
+import numpy as np
+import pytest
+
+from formamotus.utils.keyframe_utils import bake_object_transforms
+from formamotus.utils.keyframe_utils import set_fcurve_keyframes
+
+
+@pytest.fixture
+def action():
+    action = bpy.data.actions.new("TestAction")
+    yield action
+    bpy.data.actions.remove(action)
+
+
+def test_set_fcurve_keyframes(action):
+    frames = np.array([1.0, 11.0, 21.0])
+    values = np.array([[0.0, 1.0], [1.0, 3.0], [3.0, 2.0]])
+    set_fcurve_keyframes(action, "location", frames, values, indices=[0, 2], group="Test")
+
+    assert sorted(fcurve.array_index for fcurve in action.fcurves) == [0, 2]
+    x = action.fcurves.find("location", index=0)
+    z = action.fcurves.find("location", index=2)
+    assert x.group.name == "Test"
+    assert [tuple(point.co) for point in x.keyframe_points] == [(1, 0), (11, 1), (21, 3)]
+    assert all(point.interpolation == 'LINEAR' for point in z.keyframe_points)
+    # Linear keys interpolate halfway between samples.
+    assert x.evaluate(6.0) == pytest.approx(0.5)
+    assert z.evaluate(16.0) == pytest.approx(2.5)
+
+
+def test_set_fcurve_keyframes_replaces_keys(action):
+    set_fcurve_keyframes(action, "location", [1.0, 2.0, 3.0], [[0.0], [1.0], [2.0]])
+    set_fcurve_keyframes(action, "location", [5.0, 6.0], [[4.0], [5.0]])
+    assert len(action.fcurves) == 1
+    assert [point.co[0] for point in action.fcurves[0].keyframe_points] == [5.0, 6.0]
+
+
+def test_bake_object_transforms():
+    objects = [bpy.data.objects.new(f"TestObject{i}", None) for i in range(2)]
+    frames = np.array([1.0, 2.0])
+    locations = np.arange(12.0).reshape(2, 2, 3)
+    quaternions = np.tile([1.0, 0.0, 0.0, 0.0], (2, 2, 1))
+    try:
+        bake_object_transforms(objects, frames, locations, quaternions)
+        for i, obj in enumerate(objects):
+            assert obj.rotation_mode == 'QUATERNION'
+            action = obj.animation_data.action
+            assert len(action.fcurves) == 7
+            for c in range(3):
+                fcurve = action.fcurves.find("location", index=c)
+                np.testing.assert_allclose(
+                    [point.co[1] for point in fcurve.keyframe_points], locations[:, i, c])
+    finally:
+        for obj in objects:
+            action = obj.animation_data.action
+            bpy.data.objects.remove(obj)
+            bpy.data.actions.remove(action)
@@ -0,0 +1,144 @@
+import numpy as np
+import pytest
+
+from formamotus.utils.kinematics import axis_angle_matrices
+from formamotus.utils.kinematics import connector_transforms
+from formamotus.utils.kinematics import matrices_to_quaternions
+from formamotus.utils.kinematics import PoseLayout
+
+
+def random_joint_values(tree, rng, n_samples=None):
+    size = (len(tree.joint_names),) if n_samples is None else (n_samples, len(tree.joint_names))
+    return tree.resolve_joint_values(rng.uniform(-1.0, 1.0, size=size))
+
+
+def skrobot_transforms(robot_model, tree, joint_values):
+    for j, link in enumerate(tree.joint_links):
+        tree.links[link].joint.joint_angle(joint_values[j])
+    transforms = np.tile(np.eye(4), (len(tree.links), 1, 1))
+    for i, link in enumerate(tree.links):
+        transforms[i, :3, :3] = link.worldrot()
+        transforms[i, :3, 3] = link.worldpos()
+    return transforms
+
+
+def test_links_in_preorder(tree):
+    assert tree.parents[0] == -1
+    assert all(tree.parents[i] < i for i in range(1, len(tree.links)))
+    assert len(tree.joint_names) == 6
+    assert tree.mimic_names == {"finger_joint"}
+
+
+def test_subtree_ranges(tree):
+    for i in range(len(tree.links)):
+        descendants = {i}
+        for k in range(i + 1, len(tree.links)):
+            if tree.parents[k] in descendants:
+                descendants.add(k)
+        assert set(range(i, tree.subtree_ends[i])) == descendants
+
+
+def test_forward_kinematics_matches_skrobot(robot_model, tree):
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        joint_values = random_joint_values(tree, rng)
+        expected = skrobot_transforms(robot_model, tree, joint_values)
+        np.testing.assert_allclose(tree.forward_kinematics(joint_values), expected, atol=1e-9)
+
+
+def test_batch_forward_kinematics(tree):
+    rng = np.random.default_rng(1)
+    joint_values = random_joint_values(tree, rng, n_samples=7)
+    batch = tree.batch_forward_kinematics(joint_values)
+    assert batch.shape == (7, len(tree.links), 4, 4)
+    for sample, transforms in zip(joint_values, batch):
+        np.testing.assert_allclose(transforms, tree.forward_kinematics(sample), atol=1e-12)
+
+
+def test_update_forward_kinematics(tree):
+    rng = np.random.default_rng(2)
+    joint_values = random_joint_values(tree, rng)
+    world_transforms = tree.forward_kinematics(joint_values)
+    for joint in range(len(tree.joint_names)):
+        joint_values = joint_values.copy()
+        joint_values[joint] += 0.3
+        joint_values = tree.resolve_joint_values(joint_values)
+        before = world_transforms.copy()
+        updated = tree.update_forward_kinematics(world_transforms, joint_values, joint)
+        np.testing.assert_allclose(
+            world_transforms, tree.forward_kinematics(joint_values), atol=1e-12)
+        # Links outside the updated subtrees are left untouched.
+        untouched = np.setdiff1d(np.arange(len(tree.links)), updated)
+        np.testing.assert_array_equal(world_transforms[untouched], before[untouched])
+
+
+def test_mimic_joint(tree):
+    leader = tree.joint_position["forearm_joint"]
+    follower = tree.joint_position["finger_joint"]
+    joint_values = np.zeros(len(tree.joint_names))
+    joint_values[leader] = 0.4
+    joint_values[follower] = 1.5
+    resolved = tree.resolve_joint_values(joint_values)
+    assert resolved[follower] == pytest.approx(0.4 * -0.5 + 0.1)
+    assert tree.driven_joints(leader) == [leader, follower]
+
+    finger = tree.link_index[next(link for link in tree.links if link.name == "finger")]
+    forearm = tree.joint_links[leader]
+    affected = tree.affected_links(leader)
+    np.testing.assert_array_equal(affected, np.arange(forearm, tree.subtree_ends[forearm]))
+    assert finger in affected
+
+
+def test_joint_limits_are_applied(tree):
+    slider = tree.joint_position["slider_joint"]
+    joint_values = np.zeros(len(tree.joint_names))
+    joint_values[slider] = 1.0
+    assert tree.resolve_joint_values(joint_values)[slider] == pytest.approx(0.2)
+
+
+def test_matrices_to_quaternions():
+    rng = np.random.default_rng(3)
+    axes = rng.normal(size=(50, 3))
+    axes /= np.linalg.norm(axes, axis=1)[:, None]
+    angles = rng.uniform(-np.pi, np.pi, size=50)
+    quaternions = matrices_to_quaternions(axis_angle_matrices(axes, angles))
+    expected = np.concatenate([
+        np.cos(angles / 2)[:, None], axes * np.sin(angles / 2)[:, None]], axis=1)
+    expected[expected[:, 0] < 0] *= -1.0
+    np.testing.assert_allclose(quaternions, expected, atol=1e-9)
+
+
+def test_connector_transforms():
+    starts = np.array([[0.0, 0.0, 0.0], [1.0, 1.0, 1.0], [0.0, 0.0, 0.0]])
+    ends = np.array([[0.0, 0.0, 2.0], [1.0, 3.0, 1.0], [0.0, 0.0, -1.0]])
+    locations, quaternions, lengths = connector_transforms(starts, ends)
+    np.testing.assert_allclose(locations, (starts + ends) / 2)
+    np.testing.assert_allclose(lengths, [2.0, 2.0, 1.0])
+    np.testing.assert_allclose(np.linalg.norm(quaternions, axis=1), 1.0)
+    # The rotated Z axis of each quaternion points along its segment, up to sign.
+    w, x, y, z = quaternions.T
+    z_axes = np.stack([2 * (x * z + w * y), 2 * (y * z - w * x), 1 - 2 * (x * x + y * y)], axis=1)
+    directions = (ends - starts) / lengths[:, None]
+    np.testing.assert_allclose(np.abs(np.sum(z_axes * directions, axis=1)), 1.0, atol=1e-9)
+
+
+def test_pose_layout(tree):
+    layout = PoseLayout(tree)
+    offset = np.eye(4)
+    offset[:3, 3] = (0.0, 0.0, 0.1)
+    hand = next(link for link in tree.links if link.name == "hand")
+    attached = layout.add_attached(hand, offset, (1.0, 2.0, 3.0))
+    connector = layout.add_connector(tree.links[0], hand)
+    layout.finalize()
+
+    joint_values = random_joint_values(tree, np.random.default_rng(4))
+    world_transforms = tree.forward_kinematics(joint_values)
+    rows, locations, _, scales = layout.object_transforms(world_transforms)
+    assert list(rows) == [attached, connector]
+    hand_transform = world_transforms[tree.link_index[hand]]
+    np.testing.assert_allclose(locations[0], (hand_transform @ offset)[:3, 3])
+    np.testing.assert_allclose(scales[0], (1.0, 2.0, 3.0))
+    assert scales[1, 2] == pytest.approx(np.linalg.norm(hand_transform[:3, 3] - world_transforms[0, :3, 3]))
+
+    batch_locations, _, _ = layout.batch_object_transforms(world_transforms[None])
+    np.testing.assert_allclose(batch_locations[0], locations)
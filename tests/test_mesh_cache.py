@@ -0,0 +1,130 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from formamotus.utils.mesh_cache import CACHE_VERSION
+from formamotus.utils.mesh_cache import GeometryCache
+
+
+def make_part(n_vertices=4, offset=0.0):
+    vertices = np.arange(n_vertices * 3, dtype=np.float32).reshape(-1, 3) + offset
+    return {
+        "vertices": vertices,
+        "faces": np.array([[0, 1, 2], [0, 2, 3]], dtype=np.int32),
+        "normals": np.zeros_like(vertices),
+        "uvs": None,
+        "material_indices": np.array([0, 1], dtype=np.int32),
+        "smooth": None,
+        "materials": [(1.0, 0.0, 0.0, 1.0), (0.0, 0.0, 1.0, 1.0)],
+        "scale": (1.0, 2.0, 3.0),
+    }
+
+
+def write_file(path, content=b"solid test\nendsolid test\n"):
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_key_is_stable(tmp_path):
+    mesh_filepath = write_file(tmp_path / "a.stl")
+    key = GeometryCache(str(tmp_path / "cache")).key(mesh_filepath)
+    assert key == GeometryCache(str(tmp_path / "other")).key(mesh_filepath)
+    # The key addresses the contents, not the path.
+    assert key == GeometryCache().key(write_file(tmp_path / "b.stl"))
+
+
+def test_key_changes_with_contents_and_format(tmp_path):
+    cache = GeometryCache(str(tmp_path / "cache"))
+    key = cache.key(write_file(tmp_path / "a.stl"))
+    assert key != cache.key(write_file(tmp_path / "b.stl", b"other"))
+    assert key != cache.key(write_file(tmp_path / "a.obj"))
+
+
+def test_key_origin_only_for_baked_formats(tmp_path):
+    cache = GeometryCache(str(tmp_path / "cache"))
+    origin = np.eye(4)
+    origin[:3, 3] = (0.1, 0.2, 0.3)
+
+    stl = write_file(tmp_path / "a.stl")
+    assert cache.key(stl) == cache.key(stl, origin) == cache.key(stl, np.eye(4))
+
+    dae = write_file(tmp_path / "a.dae")
+    assert cache.key(dae) != cache.key(dae, origin)
+    assert cache.key(dae, origin) == cache.key(dae, origin.copy())
+    assert cache.key(dae, origin) != cache.key(dae, np.eye(4))
+
+
+def test_store_and_load(tmp_path):
+    cache = GeometryCache(str(tmp_path))
+    part = make_part()
+    cache.store("entry", [part])
+    parts = cache.load("entry")
+    assert len(parts) == 1
+    for name in ("vertices", "faces", "normals", "material_indices"):
+        np.testing.assert_array_equal(parts[0][name], part[name])
+    assert "uvs" not in parts[0]
+    assert parts[0]["materials"] == part["materials"]
+    assert parts[0]["scale"] == part["scale"]
+    assert cache.load("missing") is None
+
+
+def set_access_time(cache, key, mtime):
+    os.utime(os.path.join(cache.entry_dir(key), "meta.json"), (mtime, mtime))
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = GeometryCache(str(tmp_path))
+    for i, key in enumerate(("a", "b", "c")):
+        cache.store(key, [make_part(offset=i)])
+        set_access_time(cache, key, 1000.0 + i)
+    entry_size = cache.size_bytes() // 3
+
+    # Loading "a" makes "b" the least recently used entry.
+    assert cache.load("a") is not None
+    cache.max_size_bytes = 2 * entry_size
+    cache.evict()
+    assert cache.load("b") is None
+    assert cache.load("a") is not None
+    assert cache.load("c") is not None
+
+
+def test_store_keeps_new_entry_over_cap(tmp_path):
+    cache = GeometryCache(str(tmp_path), max_size_bytes=1)
+    cache.store("a", [make_part()])
+    cache.store("b", [make_part()])
+    assert cache.load("a") is None
+    assert cache.load("b") is not None
+
+
+@pytest.mark.parametrize("corrupt", ["meta", "version", "array"])
+def test_corrupt_entry_is_a_miss(tmp_path, corrupt):
+    cache = GeometryCache(str(tmp_path))
+    cache.store("entry", [make_part()])
+    entry_dir = cache.entry_dir("entry")
+    meta_path = os.path.join(entry_dir, "meta.json")
+    if corrupt == "meta":
+        with open(meta_path, "w") as f:
+            f.write("{not json")
+    elif corrupt == "version":
+        with open(meta_path, "w") as f:
+            json.dump({"version": CACHE_VERSION + 1, "parts": []}, f)
+    else:
+        os.remove(os.path.join(entry_dir, "part0_faces.npy"))
+    assert cache.load("entry") is None
+
+
+def test_clear(tmp_path):
+    cache_dir = tmp_path / "cache"
+    cache = GeometryCache(str(cache_dir))
+    cache.store("entry", [make_part()])
+    (cache_dir / ".tmp_interrupted").mkdir()
+    # Files that are not cache entries are left alone.
+    write_file(cache_dir / "robot.urdf", b"<robot/>")
+    (cache_dir / "meshes").mkdir()
+    write_file(cache_dir / "meshes" / "base.stl")
+    assert cache.clear() > 0
+    assert cache.entries() == []
+    assert sorted(os.listdir(cache_dir)) == ["meshes", "robot.urdf"]
+    assert (cache_dir / "meshes" / "base.stl").is_file()
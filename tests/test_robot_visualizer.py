@@ -0,0 +1,78 @@
+import bpy
+from mathutils import Matrix
+import numpy as np
+import pytest
+
+from formamotus import robot_visualizer
+from formamotus.utils import transform_utils
+from formamotus.utils.scene_utils import get_robot_collection
+
+
+@pytest.fixture(scope="module")
+def scene(urdf_path):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        # The default URDF path of the scene property is downloaded otherwise.
+        monkeypatch.setattr(robot_visualizer, "fetch_urdfpath", lambda: urdf_path)
+        robot_visualizer.register()
+    scene = bpy.context.scene
+    scene.formamotus_urdf_filepath = urdf_path
+    scene.formamotus_use_mesh = False
+    assert bpy.ops.robot_viz.visualize_robot() == {'FINISHED'}
+    yield scene
+    robot_visualizer.unregister()
+
+
+def assert_world_matrices_follow(scene):
+    """Check that every robot object is drawn where its transform puts it."""
+    bpy.context.view_layer.update()
+    objects = [obj for obj in get_robot_collection(scene).all_objects if obj.parent is None]
+    assert objects
+    for obj in objects:
+        expected = Matrix.LocRotScale(obj.location, obj.rotation_quaternion, obj.scale)
+        np.testing.assert_allclose(obj.matrix_world, expected, atol=1e-5, err_msg=obj.name)
+        evaluated = obj.evaluated_get(bpy.context.evaluated_depsgraph_get())
+        np.testing.assert_allclose(evaluated.matrix_world, expected, atol=1e-5, err_msg=obj.name)
+
+
+def test_apply_pose_moves_objects(scene, tree):
+    rng = np.random.default_rng(0)
+    for _ in range(3):
+        before = {obj.name: obj.matrix_world.copy() for obj in get_robot_collection(scene).all_objects}
+        robot_visualizer.apply_pose(rng.uniform(-1.0, 1.0, size=len(tree.joint_names)))
+        assert_world_matrices_follow(scene)
+        moved = [obj.name for obj in get_robot_collection(scene).all_objects
+                 if obj.matrix_world != before[obj.name]]
+        assert moved
+
+
+@pytest.mark.parametrize("fraction", [0.0, 1.0], ids=["bulk", "per_object"])
+@pytest.mark.parametrize("joint_name", ["torso_joint", "forearm_joint", "slider_joint"])
+def test_joint_slider_moves_subtree(scene, monkeypatch, fraction, joint_name):
+    monkeypatch.setattr(transform_utils, "PER_OBJECT_WRITE_FRACTION", fraction)
+    robot_visualizer.apply_pose(np.zeros(len(robot_visualizer._joint_values)))
+    robot_visualizer.queue_joint_value(joint_name, 0.15)
+    assert_world_matrices_follow(scene)
+    moved = {obj.name: obj.matrix_world.copy() for obj in get_robot_collection(scene).all_objects}
+
+    # The subtree update ends where a full forward kinematics pass does.
+    robot_visualizer.apply_pose(robot_visualizer._joint_values)
+    bpy.context.view_layer.update()
+    for obj in get_robot_collection(scene).all_objects:
+        np.testing.assert_allclose(obj.matrix_world, moved[obj.name], atol=1e-5, err_msg=obj.name)
+
+
+def test_render_views_follow_pose(scene):
+    scene.formamotus_outline_method = 'NONE'
+    scene.render.engine = 'CYCLES'
+    scene.cycles.samples = 1
+    scene.cycles.use_denoising = False
+    scene.render.resolution_x, scene.render.resolution_y = 32, 24
+    scene.render.resolution_percentage = 100
+    scene.render.use_persistent_data = False
+    views = [((2.0, 2.0, 2.0), (0.0, 0.0, 0.5))]
+    robot_visualizer.apply_pose(np.zeros(len(robot_visualizer._joint_values)))
+    before = robot_visualizer.render_views(bpy.context, views)
+    assert not scene.render.use_persistent_data
+    robot_visualizer.apply_pose(np.full(len(robot_visualizer._joint_values), 0.8))
+    after = robot_visualizer.render_views(bpy.context, views)
+    assert np.any(before != after)
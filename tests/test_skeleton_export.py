@@ -0,0 +1,123 @@
+import re
+import xml.etree.ElementTree as ET
+import zlib
+
+import numpy as np
+import pytest
+
+from formamotus.utils.camera_utils import look_at_matrix
+from formamotus.utils.skeleton_export import convex_hull
+from formamotus.utils.skeleton_export import linear_to_srgb
+from formamotus.utils.skeleton_export import skeleton_pdf
+from formamotus.utils.skeleton_export import skeleton_svg
+from formamotus.utils.skeleton_export import SkeletonSketch
+from formamotus.utils.skeleton_export import write_skeleton
+
+SVG = "{http://www.w3.org/2000/svg}"
+WIDTH, HEIGHT = 320, 240
+
+
+@pytest.fixture(scope="module")
+def sketch(tree):
+    return SkeletonSketch(tree)
+
+
+@pytest.fixture(scope="module")
+def world_transforms(tree):
+    return tree.forward_kinematics(np.zeros(len(tree.joint_names)))
+
+
+@pytest.fixture(scope="module")
+def shapes(sketch, world_transforms):
+    return sketch.shapes(world_transforms, sketch.default_camera(world_transforms), WIDTH, HEIGHT)
+
+
+def link_names(tree, indices):
+    return [tree.links[i].name for i in indices]
+
+
+def test_linear_to_srgb():
+    assert linear_to_srgb((0.0, 1.0, 2.0, 0.5)) == (0, 255, 255)
+    assert linear_to_srgb((0.5, 0.001, 0.2)) == (188, 3, 124)
+
+
+def test_convex_hull():
+    points = [(0, 0), (2, 0), (2, 2), (0, 2), (1, 1), (1, 0), (0, 0)]
+    hull = convex_hull(points)
+    np.testing.assert_array_equal(hull, [(0, 0), (2, 0), (2, 2), (0, 2)])
+    assert len(convex_hull([(0, 0), (1, 1)])) == 2
+
+
+def test_skeleton_parts(tree, sketch):
+    assert link_names(tree, sketch.joint_links) == [
+        "torso", "arm", "forearm", "finger", "slider", "wheel"]
+    assert sketch.joint_types == [
+        "revolute", "revolute", "revolute", "revolute", "prismatic", "continuous"]
+    # The finger connector skips the fixed hand and starts at the forearm.
+    assert link_names(tree, sketch.connector_starts) == [
+        "base", "torso", "arm", "forearm", "torso", "base"]
+    # Every cylinder offset turns Z onto the joint axis.
+    axes = np.array([(0, 0, 1), (0, 1, 1), (1, 0, 0), (0, 1, 0), (0, 0, 1), (0, 0, 1)])
+    axes = axes / np.linalg.norm(axes, axis=1)[:, None]
+    np.testing.assert_allclose(sketch.cylinder_offsets[:, :3, 2], axes, atol=1e-12)
+
+
+def test_shapes(shapes):
+    kinds = [shape["kind"] for shape in shapes]
+    assert kinds.count('polygon') == 6
+    assert kinds.count('line') == 6
+    depths = [shape["depth"] for shape in shapes]
+    assert depths == sorted(depths, reverse=True)
+    # The automatic framing keeps the skeleton in the image.
+    points = np.concatenate([shape["points"] for shape in shapes])
+    assert np.all((points >= 0) & (points <= (WIDTH, HEIGHT)))
+
+
+def test_shapes_behind_camera(sketch, world_transforms):
+    center, size = sketch.bounds(world_transforms)
+    camera_matrix = look_at_matrix(center + size * 2, center + size * 4)
+    assert sketch.shapes(world_transforms, camera_matrix, WIDTH, HEIGHT) == []
+
+
+def test_skeleton_svg(shapes):
+    root = ET.fromstring(skeleton_svg(shapes, WIDTH, HEIGHT, background=(1.0, 1.0, 1.0, 1.0)))
+    assert root.get("width") == str(WIDTH)
+    assert root.find(f"{SVG}rect").get("fill") == "#ffffff"
+    group = root.find(f"{SVG}g")
+    assert [element.tag[len(SVG):] for element in group] == [
+        'line' if shape["kind"] == 'line' else 'polygon' for shape in shapes]
+    fills = {element.get("fill") for element in group.iter(f"{SVG}polygon")}
+    assert {"#ff0000", "#00ff00", "#0000ff"} <= fills
+    transparent = ET.fromstring(skeleton_svg(shapes, WIDTH, HEIGHT))
+    assert transparent.find(f"{SVG}rect") is None
+
+
+def test_skeleton_pdf(shapes):
+    pdf = skeleton_pdf(shapes, WIDTH, HEIGHT, background=(1.0, 1.0, 1.0, 1.0))
+    assert pdf.startswith(b"%PDF-1.4\n")
+    assert pdf.endswith(b"%%EOF\n")
+    # The cross-reference table points at every object.
+    xref = int(re.search(rb"startxref\n(\d+)\n", pdf).group(1))
+    assert pdf[xref:].startswith(b"xref\n0 5\n")
+    offsets = [int(offset) for offset in re.findall(rb"(\d{10}) 00000 n", pdf)]
+    for number, offset in enumerate(offsets, start=1):
+        assert pdf[offset:].startswith(f"{number} 0 obj\n".encode())
+    assert f"/MediaBox [0 0 {WIDTH} {HEIGHT}]".encode() in pdf
+
+    length = int(re.search(rb"/Length (\d+)", pdf).group(1))
+    start = pdf.index(b"stream\n") + len(b"stream\n")
+    content = zlib.decompress(pdf[start:start + length]).decode("ascii")
+    assert content.count(" h B") == 6
+    assert content.count("\nS") == 6
+    assert f"1.000 1.000 1.000 rg 0 0 {WIDTH} {HEIGHT} re f" in content
+
+
+def test_write_skeleton(tmp_path, shapes):
+    svg_path = str(tmp_path / "skeleton.svg")
+    pdf_path = str(tmp_path / "skeleton.PDF")
+    write_skeleton(svg_path, shapes, WIDTH, HEIGHT)
+    write_skeleton(pdf_path, shapes, WIDTH, HEIGHT)
+    with open(svg_path, encoding="utf-8") as f:
+        assert f.read() == skeleton_svg(shapes, WIDTH, HEIGHT)
+    with open(pdf_path, "rb") as f:
+        assert f.read() == skeleton_pdf(shapes, WIDTH, HEIGHT)
@@ -0,0 +1,151 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from formamotus.utils.trajectory import load_trajectory
+from formamotus.utils.trajectory import open_trajectory
+from formamotus.utils.trajectory import trajectory_frames
+from formamotus.utils.trajectory import trajectory_joint_values
+from formamotus.utils.trajectory import trajectory_sample
+
+
+def write_csv(path, text):
+    path.write_text(text)
+    return str(path)
+
+
+def test_load_csv_with_time_column(tmp_path):
+    rows = ["a, timestamp ,b", "0.1,0.0,1.0", "", "0.2,0.5,2.0", "0.3,1.0,3.0"]
+    filepath = write_csv(tmp_path / "traj.csv", "\n".join(rows) + "\n")
+    joint_names, times, positions = load_trajectory(filepath)
+    assert joint_names == ["a", "b"]
+    np.testing.assert_allclose(times, [0.0, 0.5, 1.0])
+    np.testing.assert_allclose(positions, [[0.1, 1.0], [0.2, 2.0], [0.3, 3.0]])
+
+
+def test_load_csv_without_time_column(tmp_path):
+    filepath = write_csv(tmp_path / "traj.csv", "a,b\n1,2\n")
+    joint_names, times, positions = load_trajectory(filepath)
+    assert joint_names == ["a", "b"]
+    assert times is None
+    assert positions.shape == (1, 2)
+
+
+def test_load_csv_column_mismatch(tmp_path):
+    filepath = write_csv(tmp_path / "traj.csv", "a,b\n1,2,3\n")
+    with pytest.raises(ValueError, match="columns"):
+        load_trajectory(filepath)
+
+
+def test_load_npz(tmp_path):
+    filepath = str(tmp_path / "traj.npz")
+    np.savez(filepath, joint_names=np.array(["a", "b", "c"]),
+             positions=np.arange(6.0).reshape(2, 3), times=np.array([0.0, 0.1]))
+    joint_names, times, positions = load_trajectory(filepath)
+    assert joint_names == ["a", "b", "c"]
+    np.testing.assert_allclose(times, [0.0, 0.1])
+    np.testing.assert_allclose(positions, np.arange(6.0).reshape(2, 3))
+
+
+def test_load_npz_errors(tmp_path):
+    filepath = str(tmp_path / "traj.npz")
+    np.savez(filepath, positions=np.zeros((2, 1)))
+    with pytest.raises(ValueError, match="joint_names"):
+        load_trajectory(filepath)
+    np.savez(filepath, joint_names=np.array(["a"]), positions=np.zeros((2, 1)),
+             times=np.zeros(3))
+    with pytest.raises(ValueError, match="timestamps"):
+        load_trajectory(filepath)
+
+
+def test_unsupported_extension(tmp_path):
+    with pytest.raises(ValueError, match="Unsupported"):
+        load_trajectory(write_csv(tmp_path / "traj.json", "{}"))
+
+
+def test_trajectory_joint_values():
+    tree = SimpleNamespace(joint_position={"a": 0, "b": 1, "c": 2})
+    positions = np.array([[1.0, 2.0], [3.0, 4.0]])
+    joint_values, unknown_names = trajectory_joint_values(
+        tree, ["c", "x"], positions, [0.5, 0.6, 0.7])
+    np.testing.assert_allclose(joint_values, [[0.5, 0.6, 1.0], [0.5, 0.6, 3.0]])
+    assert unknown_names == ["x"]
+
+
+def test_trajectory_frames():
+    np.testing.assert_allclose(trajectory_frames(3, frame_start=10), [10, 11, 12])
+    np.testing.assert_allclose(
+        trajectory_frames(3, times=[2.0, 2.5, 3.5], fps=24, frame_start=1), [1, 13, 37])
+    with pytest.raises(ValueError, match="increasing"):
+        trajectory_frames(3, times=[0.0, 1.0, 1.0], fps=24)
+
+
+def test_open_trajectory_matches_load(tmp_path):
+    rows = ["t,a,b"] + [f"{0.1 * i},{i},{-i}" for i in range(10)]
+    filepath = write_csv(tmp_path / "traj.csv", "\n".join(rows) + "\n")
+    cache_dir = str(tmp_path / "cache")
+    # A small chunk size converts the file in several chunks.
+    joint_names, times, positions = open_trajectory(filepath, cache_dir, chunk_size=3)
+    assert isinstance(positions, np.memmap)
+    expected = load_trajectory(filepath)
+    assert joint_names == expected[0]
+    np.testing.assert_allclose(times, expected[1])
+    np.testing.assert_allclose(positions, expected[2])
+
+
+def test_open_trajectory_reconverts_changed_file(tmp_path):
+    filepath = write_csv(tmp_path / "traj.csv", "a\n1\n2\n")
+    cache_dir = str(tmp_path / "cache")
+    _, times, positions = open_trajectory(filepath, cache_dir)
+    assert times is None
+    np.testing.assert_allclose(positions, [[1.0], [2.0]])
+    del positions
+
+    write_csv(tmp_path / "traj.csv", "a,b\n1,2\n3,4\n5,6\n")
+    stat = os.stat(filepath)
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    joint_names, _, positions = open_trajectory(filepath, cache_dir)
+    assert joint_names == ["a", "b"]
+    assert positions.shape == (3, 2)
+
+
+def test_open_trajectory_npz(tmp_path):
+    filepath = str(tmp_path / "traj.npz")
+    np.savez(filepath, joint_names=np.array(["a"]), positions=np.ones((4, 1)),
+             times=np.arange(4.0))
+    joint_names, times, positions = open_trajectory(filepath, str(tmp_path / "cache"))
+    assert joint_names == ["a"]
+    np.testing.assert_allclose(times, np.arange(4.0))
+    np.testing.assert_allclose(positions, np.ones((4, 1)))
+
+
+def test_open_trajectory_rejects_unordered_times(tmp_path):
+    rows = ["t,a", "0.0,1", "0.2,1", "0.1,1", "0.3,1"]
+    filepath = write_csv(tmp_path / "traj.csv", "\n".join(rows) + "\n")
+    cache_dir = tmp_path / "cache"
+    with pytest.raises(ValueError, match="increasing"):
+        open_trajectory(filepath, str(cache_dir), chunk_size=2)
+    # The failed conversion leaves no entry behind.
+    assert not [name for name in os.listdir(cache_dir) if not name.startswith(".")]
+
+
+def test_trajectory_sample_per_frame():
+    positions = np.array([[0.0, 10.0], [1.0, 20.0], [3.0, 40.0]])
+    np.testing.assert_allclose(trajectory_sample(positions, 1), [0.0, 10.0])
+    np.testing.assert_allclose(trajectory_sample(positions, 2.5), [2.0, 30.0])
+    np.testing.assert_allclose(trajectory_sample(positions, 3), [3.0, 40.0])
+    # Samples are held outside the trajectory.
+    np.testing.assert_allclose(trajectory_sample(positions, -5), [0.0, 10.0])
+    np.testing.assert_allclose(trajectory_sample(positions, 50), [3.0, 40.0])
+    np.testing.assert_allclose(trajectory_sample(positions[:1], 7), [0.0, 10.0])
+
+
+def test_trajectory_sample_with_times():
+    positions = np.array([[0.0], [1.0], [3.0]])
+    times = np.array([5.0, 6.0, 8.0])
+    # At 10 fps frame 1 is t=5 s, frame 16 is t=6.5 s and frame 21 is t=7 s.
+    assert trajectory_sample(positions, 16, times, fps=10) == pytest.approx([1.5])
+    assert trajectory_sample(positions, 21, times, fps=10) == pytest.approx([2.0])
+    assert trajectory_sample(positions, 100, times, fps=10) == pytest.approx([3.0])
@@ -0,0 +1,39 @@
+import bpy
+import numpy as np
+import pytest
+
+from formamotus.utils.transform_utils import ObjectTransformWriter
+
+
+@pytest.fixture
+def objects():
+    objects = [bpy.data.objects.new(f"TestObject{i}", None) for i in range(4)]
+    for obj in objects:
+        bpy.context.scene.collection.objects.link(obj)
+    bpy.context.view_layer.update()
+    yield objects
+    for obj in objects:
+        bpy.data.objects.remove(obj)
+
+
+def test_write_updates_world_matrices(objects):
+    writer = ObjectTransformWriter(objects)
+    quaternions = np.tile([np.cos(0.25), 0.0, 0.0, np.sin(0.25)], (len(objects), 1))
+    scales = np.full((len(objects), 3), 2.0)
+    for step in range(3):
+        locations = np.arange(12.0).reshape(-1, 3) + step
+        writer.write(locations, quaternions, scales)
+        bpy.context.view_layer.update()
+        for obj, location in zip(objects, locations):
+            matrix_world = np.array(obj.matrix_world)
+            np.testing.assert_allclose(matrix_world[:3, 3], location, atol=1e-6)
+            np.testing.assert_allclose(np.linalg.norm(matrix_world[:3, :3], axis=0), 2.0, atol=1e-6)
+
+
+def test_write_subset(objects):
+    writer = ObjectTransformWriter(objects)
+    quaternions = np.tile([1.0, 0.0, 0.0, 0.0], (2, 1))
+    writer.write(np.ones((2, 3)), quaternions, subset=np.array([3, 1]))
+    bpy.context.view_layer.update()
+    assert [tuple(obj.matrix_world.translation) for obj in objects] == [
+        (0.0, 0.0, 0.0), (1.0, 1.0, 1.0), (0.0, 0.0, 0.0), (1.0, 1.0, 1.0)]